@@ -1,12 +1,31 @@
-from .bids import canonicalize_bid
-from .board_record import BidMetadata, BoardRecord, Commentary, Contract, DealRecord
-from .deal import Card, Deal, PlayerHand
+from .auction import AuctionState
+from .auction_index import AuctionIndex, AuctionNode, open_auction_index
+from .bids import LEGAL_BIDS, bid_code, canonicalize_bid, decode_auction, encode_auction
+from .board_record import BidMetadata, BoardRecord, Commentary, Contract, DealRecord, LazyBoardRecord
+from .columnar import ColumnarReader, ColumnarWriter, read_columnar, write_columnar
+from .corpus import CorpusFileResult, parse_corpus
+from .deal import BitboardDeal, BitboardHand, Card, Deal, PlayerHand
+from .deal_array import DealArray
+from .deal_store import DealStore, DealStoreWriter
 from .deal_enums import BiddingSuit, Direction, Rank, Suit
-from .deal_utils import deserialize_deal, from_acbl_dict, from_lin_deal, from_pbn_deal, serialize_deal
+from .deal_utils import (
+    deserialize_deal,
+    deserialize_deals,
+    from_acbl_dict,
+    from_lin_deal,
+    from_pbn_deal,
+    serialize_deal,
+    serialize_deals,
+    to_pbn_deal,
+)
+from .dedup import dedup_deal_records, external_dedup, merge_deal_records
 from .double_dummy import DoubleDummyScore
-from .lin import build_lin_str, build_lin_url, parse_multi_lin, parse_single_lin
-from .pbn import parse_pbn
-from .play_utils import calculate_score, trick_evaluator
+from .export import DealRecordExporter, export_deal_records
+from .lin import build_lin_str, build_lin_url, iter_lin_records, iter_multi_lin, parse_multi_lin, parse_single_lin
+from .pbn import build_pbn_str, iter_pbn, parse_pbn
+from .play_utils import TrickReplay, calculate_score, replay_tricks, trick_evaluator, trick_winner
+from .query import BoardFilter, CorpusIndex, open_corpus_index
+from .record_shards import ShardedRecordReader, ShardedRecordWriter, read_records, write_records
 from .schemas import (
     BidMetadataSchema,
     BoardRecordSchema,
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+from bridgebots.bids import DOUBLE_CODE, LEGAL_BIDS, PASS_CODE, REDOUBLE_CODE, bid_code
+from bridgebots.board_record import Contract
+from bridgebots.deal_enums import BiddingSuit, Direction
+
+"""
+Track the state of an auction one bid at a time. Bids are handled as bid codes (indices into LEGAL_BIDS) and legal next
+bids are exposed as a 38 bit mask with bit i set if LEGAL_BIDS[i] may be bid next
+"""
+
+_DIRECTIONS = tuple(Direction)
+_STRAINS = tuple(BiddingSuit)
+_CONTRACT_BIDS_MASK = (1 << DOUBLE_CODE) - 2
+# PASS plus every contract bid above each bid code. Index 0 (PASS) is used when no contract has been bid
+_HIGHER_BIDS_MASKS = [1 | (_CONTRACT_BIDS_MASK & ~((2 << code) - 1)) for code in range(DOUBLE_CODE)]
+
+
+class AuctionState:
+    """
+    The state of an auction in progress. Each bid updates the state in constant time
+    """
+
+    __slots__ = ("dealer", "_bid_count", "_contract_code", "_contract_side", "_doubled", "_passes", "_first_bidders")
+
+    def __init__(self, dealer: Direction):
+        self.dealer = dealer
+        self._bid_count = 0
+        self._contract_code = PASS_CODE
+        self._contract_side = 0
+        self._doubled = 0
+        self._passes = 0
+        # The first Direction of each partnership (0=NS, 1=EW) to bid each strain, indexed by side * 5 + strain
+        self._first_bidders: List[Optional[Direction]] = [None] * 10
+
+    @staticmethod
+    def from_bidding_record(dealer: Direction, bidding_record: Iterable[str]) -> AuctionState:
+        """
+        :raises ValueError: if any bid is unknown or illegal
+        """
+        auction_state = AuctionState(dealer)
+        for bid in bidding_record:
+            auction_state.add_bid(bid)
+        return auction_state
+
+    def __len__(self) -> int:
+        return self._bid_count
+
+    @property
+    def next_bidder(self) -> Direction:
+        return _DIRECTIONS[(self.dealer.value + self._bid_count) & 3]
+
+    @property
+    def finished(self) -> bool:
+        """:return: True after four opening passes or three passes following a bid"""
+        return self._passes >= 4 or (self._contract_code != PASS_CODE and self._passes >= 3)
+
+    @property
+    def legal_bid_mask(self) -> int:
+        """:return: A 38 bit mask of the bid codes which may be bid next. 0 once the auction is finished"""
+        if self.finished:
+            return 0
+        mask = _HIGHER_BIDS_MASKS[self._contract_code]
+        if self._contract_code != PASS_CODE:
+            opponents_contract = (self.dealer.value + self._bid_count) & 1 != self._contract_side
+            if self._doubled == 0 and opponents_contract:
+                mask |= 1 << DOUBLE_CODE
+            elif self._doubled == 1 and not opponents_contract:
+                mask |= 1 << REDOUBLE_CODE
+        return mask
+
+    def legal_bids(self) -> List[str]:
+        mask = self.legal_bid_mask
+        return [bid for code, bid in enumerate(LEGAL_BIDS) if mask >> code & 1]
+
+    def is_legal(self, bid: str) -> bool:
+        code = bid_code(bid)
+        return code is not None and bool(self.legal_bid_mask >> code & 1)
+
+    @property
+    def contract(self) -> Contract:
+        """:return: The contract so far. A passed out Contract if no contract has been bid"""
+        if self._contract_code == PASS_CODE:
+            return Contract(0, None, 0)
+        level, strain = divmod(self._contract_code - 1, 5)
+        return Contract(level + 1, _STRAINS[strain], self._doubled)
+
+    @property
+    def declarer(self) -> Optional[Direction]:
+        """:return: The first player of the side holding the contract to bid its strain. None if no contract was bid"""
+        if self._contract_code == PASS_CODE:
+            return None
+        return self._first_bidders[self._contract_side * 5 + (self._contract_code - 1) % 5]
+
+    def add_bid_code(self, code: int):
+        """
+        :param code: The index of the bid in LEGAL_BIDS
+        :raises ValueError: if the bid is not legal in the current state
+        """
+        if not 0 <= code < len(LEGAL_BIDS) or not self.legal_bid_mask >> code & 1:
+            bid = LEGAL_BIDS[code] if 0 <= code < len(LEGAL_BIDS) else code
+            raise ValueError(f"Illegal bid {bid} by {self.next_bidder.name} after {self._bid_count} bids")
+        bidder = (self.dealer.value + self._bid_count) & 3
+        self._bid_count += 1
+        if code == PASS_CODE:
+            self._passes += 1
+            return
+        self._passes = 0
+        if code == DOUBLE_CODE:
+            self._doubled = 1
+        elif code == REDOUBLE_CODE:
+            self._doubled = 2
+        else:
+            self._contract_code = code
+            self._contract_side = bidder & 1
+            self._doubled = 0
+            first_bidder_index = self._contract_side * 5 + (code - 1) % 5
+            if self._first_bidders[first_bidder_index] is None:
+                self._first_bidders[first_bidder_index] = _DIRECTIONS[bidder]
+
+    def add_bid(self, bid: str):
+        """
+        :param bid: A bid in any LIN or PBN spelling
+        :raises ValueError: if the bid is unknown or not legal in the current state
+        """
+        code = bid_code(bid)
+        if code is None:
+            raise ValueError(f"Unknown bid {bid}")
+        self.add_bid_code(code)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import logging
+import pickle
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from bridgebots.bids import LEGAL_BIDS, PASS_CODE, encode_auction
+from bridgebots.board_record import BoardRecord
+from bridgebots.deal_store import DealStore
+
+"""
+A prefix index over the auctions of a corpus. Each auction is encoded as one bid code per bid (see bids.encode_auction)
+and the encoded auctions are sorted, so the boards whose auction begins with a prefix form one contiguous range found by
+binary search. The sorted auctions are held in a single bytes object with an array of offsets rather than as one object
+per board. Board ids number the boards of a DealStore in store order, matching query.CorpusIndex.
+"""
+
+INDEX_FILE = "auction_index.pickle"
+OPENING_BID_INDEX_FILE = "auction_index_from_opening_bid.pickle"
+_INDEX_VERSION = 1
+
+# Greater than every bid code, so prefix + _AFTER_ALL_BIDS sorts after every auction beginning with prefix
+_AFTER_ALL_BIDS = bytes([len(LEGAL_BIDS)])
+
+AuctionPrefix = Union[str, Sequence[str]]
+
+
+def parse_auction_prefix(prefix: AuctionPrefix) -> bytes:
+    """
+    :param prefix: A sequence of bids, or a string of bids separated by "-" with optional parentheses around
+    opponents' bids, e.g. "1NT-(2H)-X"
+    :return: The bid codes of the prefix
+    :raises ValueError: if any bid is unknown
+    """
+    if isinstance(prefix, str):
+        prefix = [bid.strip().strip("()") for bid in prefix.split("-")] if prefix else []
+    return encode_auction(prefix)
+
+
+@dataclass(frozen=True)
+class AuctionNode:
+    """
+    Statistics for the auctions beginning with a prefix. Continuations count the boards by the next bid after the
+    prefix. Auctions which end with the prefix are counted in completed instead
+    """
+
+    prefix: List[str]
+    count: int
+    completed: int
+    continuations: Dict[str, int]
+
+    def frequencies(self) -> Dict[str, float]:
+        """:return: The share of continuing auctions which make each next bid. Empty if no auction continues"""
+        continuing = self.count - self.completed
+        return {bid: bid_count / continuing for bid, bid_count in self.continuations.items()} if continuing else {}
+
+
+class AuctionIndex:
+    """
+    Sorted auctions of a corpus supporting prefix lookups. Build with from_board_records or build
+    """
+
+    def __init__(self, auctions: bytes, offsets: array, board_ids: array, from_opening_bid: bool):
+        """
+        :param auctions: The sorted encoded auctions, concatenated
+        :param offsets: The start of each auction in auctions, followed by len(auctions)
+        :param board_ids: The board id of each sorted auction
+        :param from_opening_bid: Auctions are indexed from the opening bid, without the passes before it
+        """
+        self.auctions = auctions
+        self.offsets = offsets
+        self.board_id_array = board_ids
+        self.from_opening_bid = from_opening_bid
+
+    @staticmethod
+    def from_board_records(board_records: Iterable[BoardRecord], from_opening_bid: bool = False) -> AuctionIndex:
+        """
+        Board ids are assigned in iteration order. Boards whose auction contains an unknown bid are not indexed but
+        still use a board id
+        :param from_opening_bid: Index auctions from the opening bid, so that a prefix such as "1NT-(2H)-X" matches in
+        any seat. Passed out auctions are indexed as the empty auction
+        """
+        encoded_auctions = []
+        for board_id, board_record in enumerate(board_records):
+            try:
+                encoded_auction = encode_auction(board_record.bidding_record)
+            except ValueError:
+                continue
+            if from_opening_bid:
+                encoded_auction = encoded_auction.lstrip(bytes([PASS_CODE]))
+            encoded_auctions.append((encoded_auction, board_id))
+        encoded_auctions.sort()
+        offsets = array("I", [0])
+        for encoded_auction, _ in encoded_auctions:
+            offsets.append(offsets[-1] + len(encoded_auction))
+        auctions = b"".join(encoded_auction for encoded_auction, _ in encoded_auctions)
+        board_ids = array("I", (board_id for _, board_id in encoded_auctions))
+        return AuctionIndex(auctions, offsets, board_ids, from_opening_bid)
+
+    @staticmethod
+    def build(deal_store: DealStore, from_opening_bid: bool = False) -> AuctionIndex:
+        """Index every board of a DealStore. Board ids match query.CorpusIndex"""
+        board_records = (
+            board_record for index in range(len(deal_store)) for board_record in deal_store.board_records(index)
+        )
+        return AuctionIndex.from_board_records(board_records, from_opening_bid)
+
+    def save(self, index_path: Path, deal_store: Optional[DealStore] = None):
+        """
+        :param deal_store: The store this index was built from. Its deal count and file sizes and modification times are
+        saved in the index header so that open_auction_index can detect changes to the store
+        """
+        header = _index_header(len(self), self.from_opening_bid, deal_store)
+        with open(index_path, "wb") as index_file:
+            pickle.dump(header, index_file, pickle.HIGHEST_PROTOCOL)
+            index_data = (self.auctions, self.offsets, self.board_id_array, self.from_opening_bid)
+            pickle.dump(index_data, index_file, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(index_path: Path) -> AuctionIndex:
+        """
+        :raises ValueError: if the index was saved in an unsupported format or is incomplete
+        """
+        with open(index_path, "rb") as index_file:
+            header = pickle.load(index_file)
+            if not isinstance(header, dict) or header.get("version") != _INDEX_VERSION:
+                raise ValueError(f"Unsupported auction index format in {index_path}")
+            auction_index = AuctionIndex(*pickle.load(index_file))
+        if (len(auction_index), auction_index.from_opening_bid) != (header["boards"], header["from_opening_bid"]):
+            raise ValueError(f"{index_path} does not match its header")
+        return auction_index
+
+    def __len__(self) -> int:
+        return len(self.board_id_array)
+
+    def _auction(self, position: int) -> bytes:
+        return self.auctions[self.offsets[position] : self.offsets[position + 1]]
+
+    def _bisect_left(self, target: bytes, low: int = 0, high: Optional[int] = None) -> int:
+        """:return: The first sorted position whose auction is not less than target"""
+        high = len(self) if high is None else high
+        while low < high:
+            middle = (low + high) // 2
+            if self._auction(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _prefix_range(self, encoded_prefix: bytes) -> range:
+        start = self._bisect_left(encoded_prefix)
+        return range(start, self._bisect_left(encoded_prefix + _AFTER_ALL_BIDS, start))
+
+    def count(self, prefix: AuctionPrefix) -> int:
+        """:return: The number of boards whose auction begins with prefix"""
+        return len(self._prefix_range(parse_auction_prefix(prefix)))
+
+    def board_ids(self, prefix: AuctionPrefix, limit: Optional[int] = None) -> List[int]:
+        """
+        :return: The ids of boards whose auction begins with prefix in ascending order, at most limit of them. See
+        query.BoardFilter.board_ids to combine a prefix with other filters
+        """
+        prefix_range = self._prefix_range(parse_auction_prefix(prefix))
+        board_ids = sorted(self.board_id_array[prefix_range.start : prefix_range.stop])
+        return board_ids if limit is None else board_ids[:limit]
+
+    def node(self, prefix: AuctionPrefix) -> AuctionNode:
+        """:return: The number of auctions beginning with prefix, and how many of them continue with each bid"""
+        encoded_prefix = parse_auction_prefix(prefix)
+        prefix_range = self._prefix_range(encoded_prefix)
+        # An auction equal to the prefix sorts before every longer auction beginning with it
+        position = self._bisect_left(encoded_prefix + bytes([PASS_CODE]), prefix_range.start, prefix_range.stop)
+        completed = position - prefix_range.start
+        continuations = {}
+        while position < prefix_range.stop:
+            code = self.auctions[self.offsets[position] + len(encoded_prefix)]
+            end = self._bisect_left(encoded_prefix + bytes([code + 1]), position, prefix_range.stop)
+            continuations[LEGAL_BIDS[code]] = end - position
+            position = end
+        decoded_prefix = [LEGAL_BIDS[code] for code in encoded_prefix]
+        return AuctionNode(decoded_prefix, len(prefix_range), completed, continuations)
+
+
+def _index_header(indexed_count: int, from_opening_bid: bool, deal_store: Optional[DealStore]) -> Dict:
+    deal_count, store_files = (len(deal_store), deal_store.file_stats()) if deal_store is not None else (None, None)
+    return {
+        "version": _INDEX_VERSION,
+        "boards": indexed_count,
+        "from_opening_bid": from_opening_bid,
+        "deals": deal_count,
+        "store_files": store_files,
+    }
+
+
+def _is_current(index_path: Path, deal_store: DealStore, from_opening_bid: bool) -> bool:
+    """:return: True if the index at index_path was saved from the store in its current state"""
+    try:
+        with open(index_path, "rb") as index_file:
+            header = pickle.load(index_file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return False
+    if not isinstance(header, dict) or "boards" not in header:
+        return False
+    return header == _index_header(header["boards"], from_opening_bid, deal_store)
+
+
+def open_auction_index(deal_store: DealStore, from_opening_bid: bool = False) -> AuctionIndex:
+    """
+    Load the auction index saved in a DealStore directory. Like query.open_corpus_index, the index is built and saved
+    first if it does not exist, or rebuilt if the store has changed since it was saved, so its board ids always match
+    those of the store's CorpusIndex
+    """
+    index_path = deal_store.store_path / (OPENING_BID_INDEX_FILE if from_opening_bid else INDEX_FILE)
+    if _is_current(index_path, deal_store, from_opening_bid):
+        try:
+            return AuctionIndex.load(index_path)
+        except (ValueError, EOFError, pickle.UnpicklingError) as e:
+            logging.warning(f"Rebuilding unreadable auction index {index_path}: {e!r}")
+    elif index_path.exists():
+        logging.info(f"Rebuilding auction index {index_path} after the store changed")
+    auction_index = AuctionIndex.build(deal_store, from_opening_bid)
+    auction_index.save(index_path, deal_store)
+    return auction_index
@@ -1,4 +1,5 @@
-from typing import Optional
+from itertools import product
+from typing import Dict, Iterable, List, Optional
 
 LEGAL_BIDS = [
     "PASS",
@@ -41,17 +42,91 @@ LEGAL_BIDS = [
     "XX",
 ]
 
-_LEGAL_BIDS_SET = set(LEGAL_BIDS)
+"""
+Bids are canonicalized to the strings in LEGAL_BIDS. A bid code is the index of a bid in LEGAL_BIDS, so an auction can
+be stored as one byte per bid
+"""
 
+PASS_CODE = 0
+DOUBLE_CODE = LEGAL_BIDS.index("X")
+REDOUBLE_CODE = LEGAL_BIDS.index("XX")
 
-def canonicalize_bid(bid: str) -> Optional[str]:
+_ALTERNATE_SPELLINGS = {"P": "PASS", "D": "X", "DBL": "X", "R": "XX", "REDBL": "XX"}
+
+
+def _normalize_bid(bid: str) -> str:
     bid = bid.upper().strip("!")
     if bid.endswith("N"):
         bid = bid + "T"
-    if bid in ["DBL", "D"]:
-        bid = "X"
-    elif bid in ["REDBL", "R"]:
-        bid = "XX"
-    elif bid == "P":
-        bid = "PASS"
-    return bid if bid in _LEGAL_BIDS_SET else None
+    return _ALTERNATE_SPELLINGS.get(bid, bid)
+
+
+def _case_variants(spelling: str) -> List[str]:
+    return ["".join(chars) for chars in product(*[{char.lower(), char.upper()} for char in spelling])]
+
+
+def _build_bid_codes() -> Dict[str, int]:
+    """
+    :return: A map from every spelling of a bid used by LIN and PBN files (any letter case, with or without an alert
+    "!") to its bid code
+    """
+    spellings = {bid: [bid] for bid in LEGAL_BIDS}
+    for bid in LEGAL_BIDS:
+        if bid.endswith("NT"):
+            spellings[bid].append(bid[:-1])
+    for alternate, bid in _ALTERNATE_SPELLINGS.items():
+        spellings[bid].append(alternate)
+    bid_codes = {}
+    for code, bid in enumerate(LEGAL_BIDS):
+        for spelling in spellings[bid]:
+            for variant in _case_variants(spelling):
+                bid_codes[variant] = code
+                bid_codes[variant + "!"] = code
+    return bid_codes
+
+
+_BID_CODES = _build_bid_codes()
+
+
+def bid_code(bid: str) -> Optional[int]:
+    """
+    :param bid: A bid in any LIN or PBN spelling such as "1n", "d", "Pass" or "2S!"
+    :return: The index of the bid in LEGAL_BIDS, or None if it is not a legal bid
+    """
+    code = _BID_CODES.get(bid)
+    if code is None:
+        code = _BID_CODES.get(_normalize_bid(bid))
+    return code
+
+
+def canonicalize_bid(bid: str) -> Optional[str]:
+    code = bid_code(bid)
+    return LEGAL_BIDS[code] if code is not None else None
+
+
+def encode_auction(bidding_record: Iterable[str]) -> bytes:
+    """
+    :param bidding_record: Bids in any LIN or PBN spelling
+    :return: One bid code per bid
+    """
+    codes = bytearray()
+    for bid in bidding_record:
+        code = bid_code(bid)
+        if code is None:
+            raise ValueError(f"Invalid bid {bid}")
+        codes.append(code)
+    return bytes(codes)
+
+
+def decode_auction(codes: Iterable[int]) -> List[str]:
+    """
+    :param codes: Bid codes such as the output of encode_auction or a numpy array of them
+    :return: The canonical bidding record
+    :raises ValueError: if any code is not the index of a bid in LEGAL_BIDS
+    """
+    bidding_record = []
+    for code in codes:
+        if not 0 <= code < len(LEGAL_BIDS):
+            raise ValueError(f"Invalid bid code {code}")
+        bidding_record.append(LEGAL_BIDS[code])
+    return bidding_record
@@ -0,0 +1,76 @@
+from typing import Dict, Iterable, List, Tuple
+
+from bridgebots.deal_enums import Rank, Suit
+
+"""
+Bitboard primitives for representing a holding as a single 52 bit int. Card (suit, rank) is stored in bit
+suit.value * 13 + (rank - 2), so each suit occupies a contiguous 13 bit window with clubs in the lowest bits and the
+integer order of the bits matches the natural ordering of Cards.
+"""
+
+SUIT_BITS = 13
+SUIT_MASK = (1 << SUIT_BITS) - 1
+FULL_DECK = (1 << 52) - 1
+
+_RANKS = sorted(Rank)
+_RANKS_DESCENDING = list(reversed(_RANKS))
+_SUITS_DESCENDING = list(reversed(Suit))
+
+# A mask selecting the same rank in every suit. Used to compute point counts with a popcount per honor
+_ALL_SUITS = sum(1 << (suit.value * SUIT_BITS) for suit in Suit)
+_RANK_MASKS = {rank: _ALL_SUITS << (rank.value[0] - 2) for rank in Rank}
+_HCP_MASKS = (
+    (4, _RANK_MASKS[Rank.ACE]),
+    (3, _RANK_MASKS[Rank.KING]),
+    (2, _RANK_MASKS[Rank.QUEEN]),
+    (1, _RANK_MASKS[Rank.JACK]),
+)
+
+
+def card_bit(suit: Suit, rank: Rank) -> int:
+    """:return: The single bit representing a card"""
+    return 1 << (suit.value * SUIT_BITS + rank.value[0] - 2)
+
+
+def popcount(bits: int) -> int:
+    """:return: The number of set bits. int.bit_count is unavailable before python 3.10"""
+    return bin(bits).count("1")
+
+
+def suit_holding(bits: int, suit: Suit) -> int:
+    """:return: The 13 bit holding for a single suit, with the two in the lowest bit"""
+    return (bits >> (suit.value * SUIT_BITS)) & SUIT_MASK
+
+
+def from_suits(suits: Dict[Suit, Iterable[Rank]]) -> int:
+    """:return: The bitboard for a holding represented as a mapping from Suit to Ranks"""
+    bits = 0
+    for suit, ranks in suits.items():
+        for rank in ranks:
+            bits |= card_bit(suit, rank)
+    return bits
+
+
+def to_suits(bits: int) -> Dict[Suit, List[Rank]]:
+    """:return: A mapping from Suit to the held Ranks in descending order, in descending suit order"""
+    suits = {}
+    for suit in _SUITS_DESCENDING:
+        holding = suit_holding(bits, suit)
+        suits[suit] = [rank for rank in _RANKS_DESCENDING if holding >> (rank.value[0] - 2) & 1]
+    return suits
+
+
+def count_hcp(bits: int) -> int:
+    """:return: Goren High Card Points for a bitboard"""
+    return sum(points * popcount(bits & mask) for points, mask in _HCP_MASKS)
+
+
+def calculate_shape(bits: int, sort=False) -> Tuple[int, ...]:
+    """
+    :return: The hand-shape of a bitboard. If sort=False, return in descending suit order. If sort=True, return in
+    descending shape order
+    """
+    shape = tuple(popcount(suit_holding(bits, suit)) for suit in _SUITS_DESCENDING)
+    if sort:
+        return tuple(sorted(shape, reverse=True))
+    return shape
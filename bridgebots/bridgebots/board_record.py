@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import InitVar, dataclass
-from typing import Dict, List, Optional
+from dataclasses import MISSING, InitVar, dataclass, fields
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
 from bridgebots.deal import Card, Deal
 from bridgebots.deal_enums import BiddingSuit, Direction
@@ -49,7 +50,7 @@ class Contract:
     def from_str(contract: str) -> Contract:
         working_contract = contract
         try:
-            if working_contract == "PASS":
+            if working_contract.upper() == "PASS":
                 return Contract(0, None, 0)
             doubled = working_contract.count("X")
             if doubled > 0:
@@ -122,6 +123,76 @@ class BoardRecord:
         )
 
 
+class _DeferredField:
+    """
+    A non-data descriptor which computes a LazyBoardRecord field with its loader on first access and stores the result
+    in the instance dict, so later accesses are plain attribute lookups
+    """
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, board_record: Optional[LazyBoardRecord], owner=None):
+        if board_record is None:
+            return self
+        value = board_record._loaders[self.name](board_record)
+        board_record.__dict__[self.name] = value
+        return value
+
+
+def _deferred_score(declarer_vulnerable: bool, board_record: BoardRecord) -> int:
+    contract = board_record.contract
+    return calculate_score(contract.level, contract.suit, contract.doubled, board_record.tricks, declarer_vulnerable)
+
+
+class LazyBoardRecord(BoardRecord):
+    """
+    A BoardRecord whose play_record, tricks, commentary, and score may be decoded on first access rather than when the
+    board is parsed. Each deferred field has a loader which is called with the record. Loaders should be picklable
+    (e.g. a functools.partial of a module level function) so the record can be pickled without decoding it. Errors in
+    deferred fields are raised when the field is first accessed.
+    """
+
+    play_record = _DeferredField()
+    tricks = _DeferredField()
+    commentary = _DeferredField()
+    score = _DeferredField()
+
+    def __init__(
+        self,
+        loaders: Optional[Dict[str, Callable[[BoardRecord], Any]]] = None,
+        declarer_vulnerable: Optional[bool] = None,
+        **field_values,
+    ):
+        loaders = dict(loaders or {})
+        if field_values.get("score") is None and "score" not in loaders:
+            if declarer_vulnerable is None:
+                raise ValueError("score and declarer_vulnerable may not both be None")
+            field_values.pop("score", None)
+            loaders["score"] = partial(_deferred_score, declarer_vulnerable)
+        missing = []
+        for f in fields(BoardRecord):
+            if f.name in field_values or f.name in loaders:
+                continue
+            if f.default is MISSING:
+                missing.append(f.name)
+            else:
+                field_values[f.name] = f.default
+        if missing:
+            raise TypeError(f"Missing values or loaders for fields: {missing}")
+        for name, value in field_values.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "_loaders", loaders)
+
+    def __eq__(self, other) -> bool:
+        # The dataclass __eq__ requires identical classes. Compare equal to an eager BoardRecord with the same values
+        if not isinstance(other, BoardRecord):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(BoardRecord))
+
+    __hash__ = BoardRecord.__hash__
+
+
 @dataclass(frozen=True)
 class DealRecord:
     """
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from bridgebots.bids import decode_auction, encode_auction
+from bridgebots.board_record import BidMetadata, BoardRecord, Commentary, Contract, DealRecord
+from bridgebots.deal import Card
+from bridgebots.deal_array import DealArray
+from bridgebots.deal_enums import BiddingSuit, Direction
+from bridgebots.deal_utils import serialize_deals
+
+"""
+A columnar file format for DealRecords. Each BoardRecord is one row. Rows are written in row groups and each column of a
+row group is stored as a separately zlib compressed block, so readers can load only the columns and row groups they
+need. A file is laid out as:
+    magic
+    column blocks of row group 0, column blocks of row group 1, ...
+    footer: JSON describing the columns and the offset and length of every block
+    footer length (little-endian uint64)
+    magic
+Fixed width columns are little-endian arrays. Variable width columns are an int32 length per row (-1 for None) followed
+by the concatenated values.
+"""
+
+MAGIC = b"BBCOLv01"
+_FOOTER_LENGTH = struct.Struct("<Q")
+_DEFAULT_ROW_GROUP_SIZE = 1 << 16
+_NO_DIRECTION = 255
+_DIRECTIONS = tuple(Direction)
+_STRAINS = tuple(BiddingSuit)
+_NAME_COLUMNS = {
+    Direction.NORTH: "north_name",
+    Direction.EAST: "east_name",
+    Direction.SOUTH: "south_name",
+    Direction.WEST: "west_name",
+}
+
+# Column name to type. deal is a 14 byte serialize_deal record. Numeric types are array typecodes. bytes and str columns
+# are variable width. json columns hold JSON encoded str values
+COLUMN_TYPES = {
+    "deal_id": "I",
+    "deal": "deal",
+    "auction": "bytes",
+    "play": "bytes",
+    "contract": "B",
+    "doubled": "B",
+    "declarer": "B",
+    "tricks": "b",
+    "score": "i",
+    "north_name": "str",
+    "east_name": "str",
+    "south_name": "str",
+    "west_name": "str",
+    "has_names": "B",
+    "event": "str",
+    "date": "str",
+    "scoring": "str",
+    "board_name": "str",
+    "raw_auction": "json",
+    "bidding_metadata": "json",
+    "commentary": "json",
+}
+COLUMNS = list(COLUMN_TYPES)
+
+
+def _contract_code(contract: Contract) -> int:
+    """:return: The bid code of the contract bid (see bids.bid_code). 0 if the board was passed out"""
+    if contract.level == 0:
+        return 0
+    return (contract.level - 1) * 5 + contract.suit.value[0] + 1
+
+
+def _decode_contract(contract_code: int, doubled: int) -> Contract:
+    if contract_code == 0:
+        return Contract(0, None, 0)
+    level, strain = divmod(contract_code - 1, 5)
+    return Contract(level + 1, _STRAINS[strain], doubled)
+
+
+def _encode_numeric(typecode: str, values: List[int]) -> bytes:
+    column_array = array(typecode, values)
+    if sys.byteorder == "big":
+        column_array.byteswap()
+    return column_array.tobytes()
+
+
+def _decode_numeric(typecode: str, block: bytes) -> array:
+    column_array = array(typecode)
+    column_array.frombytes(block)
+    if sys.byteorder == "big":
+        column_array.byteswap()
+    return column_array
+
+
+def _encode_variable(values: List[Optional[bytes]]) -> bytes:
+    lengths = [-1 if value is None else len(value) for value in values]
+    return _encode_numeric("i", lengths) + b"".join(value for value in values if value is not None)
+
+
+def _decode_variable(block: bytes, row_count: int) -> List[Optional[bytes]]:
+    lengths = _decode_numeric("i", block[: row_count * 4])
+    position = row_count * 4
+    values = []
+    for length in lengths:
+        if length < 0:
+            values.append(None)
+        else:
+            values.append(block[position : position + length])
+            position += length
+    return values
+
+
+def _encode_column(column_type: str, values: List[Any]) -> bytes:
+    if column_type == "deal":
+        return b"".join(values)
+    if column_type == "bytes":
+        return _encode_variable(values)
+    if column_type == "str":
+        return _encode_variable([None if value is None else value.encode("utf-8") for value in values])
+    if column_type == "json":
+        return _encode_variable([None if value is None else json.dumps(value).encode("utf-8") for value in values])
+    return _encode_numeric(column_type, values)
+
+
+def _decode_column(column_type: str, block: bytes, row_count: int) -> Sequence:
+    if column_type == "deal":
+        return DealArray.from_serialized(block)
+    if column_type == "bytes":
+        return _decode_variable(block, row_count)
+    if column_type == "str":
+        return [None if value is None else value.decode("utf-8") for value in _decode_variable(block, row_count)]
+    if column_type == "json":
+        return [None if value is None else json.loads(value) for value in _decode_variable(block, row_count)]
+    return _decode_numeric(column_type, block)
+
+
+def _board_row(deal_id: int, serialized_deal: bytes, board_record: BoardRecord) -> Dict[str, Any]:
+    names = board_record.names or {}
+    row = {
+        "deal_id": deal_id,
+        "deal": serialized_deal,
+        "auction": encode_auction(board_record.bidding_record),
+        "play": bytes(card.index for card in board_record.play_record),
+        "contract": _contract_code(board_record.contract),
+        "doubled": board_record.contract.doubled,
+        "declarer": board_record.declarer.value if board_record.declarer is not None else _NO_DIRECTION,
+        "tricks": board_record.tricks,
+        "score": board_record.score,
+        "event": board_record.event,
+        "date": board_record.date,
+        "scoring": board_record.scoring,
+        "board_name": board_record.board_name,
+        "raw_auction": board_record.raw_bidding_record,
+        "bidding_metadata": None,
+        "commentary": None,
+    }
+    for direction, name_column in _NAME_COLUMNS.items():
+        row[name_column] = names.get(direction)
+    # Distinguishes a record without names from one whose names are all missing
+    row["has_names"] = int(board_record.names is not None)
+    if board_record.bidding_metadata is not None:
+        row["bidding_metadata"] = [
+            [metadata.bid_index, metadata.bid, metadata.alerted, metadata.explanation]
+            for metadata in board_record.bidding_metadata
+        ]
+    if isinstance(board_record.commentary, str):  # PBN commentary is a single string
+        row["commentary"] = board_record.commentary
+    elif board_record.commentary is not None:
+        row["commentary"] = [
+            [commentary.bid_index, commentary.play_index, commentary.comment] for commentary in board_record.commentary
+        ]
+    return row
+
+
+class ColumnarWriter:
+    """
+    Write DealRecords to a columnar file. DealRecords without any BoardRecords have no rows and are not stored. Use as a
+    context manager, or call close() when finished
+    """
+
+    def __init__(self, file_path: Path, row_group_size: int = _DEFAULT_ROW_GROUP_SIZE):
+        """
+        :param row_group_size: Number of BoardRecords per row group
+        """
+        self.file_path = file_path
+        self.row_group_size = row_group_size
+        self._file = open(file_path, "wb")
+        self._file.write(MAGIC)
+        self._row_groups: List[Dict] = []
+        self._pending_columns: Dict[str, List] = {column: [] for column in COLUMNS}
+        self._pending_rows = 0
+        self.count = 0
+
+    def write(self, deal_record: DealRecord):
+        serialized_deal = serialize_deals([deal_record.deal])
+        for board_record in deal_record.board_records:
+            for column, value in _board_row(self.count, serialized_deal, board_record).items():
+                self._pending_columns[column].append(value)
+            self._pending_rows += 1
+            if self._pending_rows == self.row_group_size:
+                self._flush_row_group()
+        self.count += 1
+
+    def write_all(self, deal_records: Iterable[DealRecord]):
+        for deal_record in deal_records:
+            self.write(deal_record)
+
+    def _flush_row_group(self):
+        if self._pending_rows == 0:
+            return
+        blocks = {}
+        for column, column_type in COLUMN_TYPES.items():
+            block = zlib.compress(_encode_column(column_type, self._pending_columns[column]))
+            blocks[column] = [self._file.tell(), len(block)]
+            self._file.write(block)
+        self._row_groups.append({"rows": self._pending_rows, "blocks": blocks})
+        self._pending_columns = {column: [] for column in COLUMNS}
+        self._pending_rows = 0
+
+    def close(self):
+        self._flush_row_group()
+        footer = json.dumps({"columns": COLUMN_TYPES, "row_groups": self._row_groups}).encode("utf-8")
+        self._file.write(footer + _FOOTER_LENGTH.pack(len(footer)) + MAGIC)
+        self._file.close()
+
+    def __enter__(self) -> ColumnarWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _build_board_record(row: Dict[str, Any]) -> BoardRecord:
+    names = None
+    if row["has_names"]:
+        names = {direction: row[name_column] for direction, name_column in _NAME_COLUMNS.items()}
+    declarer = None if row["declarer"] == _NO_DIRECTION else _DIRECTIONS[row["declarer"]]
+    bidding_metadata = row["bidding_metadata"]
+    if bidding_metadata is not None:
+        bidding_metadata = [BidMetadata(*metadata) for metadata in bidding_metadata]
+    commentary = row["commentary"]
+    if isinstance(commentary, list):
+        commentary = [Commentary(*comment) for comment in commentary]
+    return BoardRecord(
+        bidding_record=decode_auction(row["auction"]),
+        raw_bidding_record=row["raw_auction"],
+        play_record=[Card.from_index(card_index) for card_index in row["play"]],
+        declarer=declarer,
+        contract=_decode_contract(row["contract"], row["doubled"]),
+        tricks=row["tricks"],
+        scoring=row["scoring"],
+        names=names,
+        date=row["date"],
+        event=row["event"],
+        bidding_metadata=bidding_metadata,
+        commentary=commentary,
+        score=row["score"],
+        board_name=row["board_name"],
+    )
+
+
+class ColumnarReader:
+    """
+    Read a file written by ColumnarWriter. Only the blocks of the requested columns and row groups are read
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        self._file.seek(-(_FOOTER_LENGTH.size + len(MAGIC)), 2)
+        tail = self._file.read()
+        if tail[_FOOTER_LENGTH.size :] != MAGIC:
+            raise ValueError(f"{file_path} is not a columnar DealRecord file")
+        (footer_length,) = _FOOTER_LENGTH.unpack(tail[: _FOOTER_LENGTH.size])
+        self._file.seek(-(footer_length + len(tail)), 2)
+        footer = json.loads(self._file.read(footer_length))
+        self.column_types: Dict[str, str] = footer["columns"]
+        self._row_groups: List[Dict] = footer["row_groups"]
+
+    def __len__(self) -> int:
+        """:return: The number of rows (BoardRecords)"""
+        return sum(row_group["rows"] for row_group in self._row_groups)
+
+    @property
+    def row_group_count(self) -> int:
+        return len(self._row_groups)
+
+    def read_row_group(self, row_group: int, columns: Optional[Iterable[str]] = None) -> Dict[str, Sequence]:
+        """
+        :param columns: Columns to read. Defaults to every column
+        :return: A mapping from column name to the column's values in the row group. deal columns are DealArrays,
+        numeric columns are arrays, and other columns are lists
+        """
+        row_group_metadata = self._row_groups[row_group]
+        column_values = {}
+        for column in columns or self.column_types:
+            if column not in self.column_types:
+                raise KeyError(f"Unknown column {column}. Expected one of {list(self.column_types)}")
+            offset, length = row_group_metadata["blocks"][column]
+            self._file.seek(offset)
+            block = zlib.decompress(self._file.read(length))
+            column_values[column] = _decode_column(self.column_types[column], block, row_group_metadata["rows"])
+        return column_values
+
+    def iter_row_groups(self, columns: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Sequence]]:
+        columns = list(columns) if columns else None
+        for row_group in range(len(self._row_groups)):
+            yield self.read_row_group(row_group, columns)
+
+    def read_columns(self, columns: Optional[Iterable[str]] = None) -> Dict[str, List]:
+        """
+        :return: A mapping from column name to a list of the column's values for every row. deal values are Deals
+        """
+        columns = list(columns or self.column_types)
+        column_values = {column: [] for column in columns}
+        for row_group_values in self.iter_row_groups(columns):
+            for column, values in row_group_values.items():
+                column_values[column].extend(values)
+        return column_values
+
+    def __iter__(self) -> Iterator[DealRecord]:
+        """
+        Rebuild the DealRecords in the order they were written. Reads every column
+        """
+        current_deal_id = None
+        current_record = None
+        for row_group_values in self.iter_row_groups():
+            deal_array = row_group_values["deal"]
+            for index in range(len(deal_array)):
+                row = {column: values[index] for column, values in row_group_values.items()}
+                board_record = _build_board_record(row)
+                if row["deal_id"] != current_deal_id:
+                    if current_record:
+                        yield current_record
+                    current_deal_id = row["deal_id"]
+                    current_record = DealRecord(deal_array[index], [])
+                current_record.board_records.append(board_record)
+        if current_record:
+            yield current_record
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> ColumnarReader:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def write_columnar(deal_records: Iterable[DealRecord], file_path: Path, row_group_size: int = _DEFAULT_ROW_GROUP_SIZE):
+    with ColumnarWriter(file_path, row_group_size) as writer:
+        writer.write_all(deal_records)
+
+
+def read_columnar(file_path: Path) -> List[DealRecord]:
+    with ColumnarReader(file_path) as reader:
+        return list(reader)
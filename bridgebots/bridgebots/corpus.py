@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from bridgebots.board_record import DealRecord
+from bridgebots.lin import parse_multi_lin
+from bridgebots.pbn import parse_pbn
+
+"""
+Parse a corpus of LIN or PBN files in parallel. Each file is parsed in a worker process and results are returned in the
+order of the input paths.
+"""
+
+_PARSERS = {"lin": parse_multi_lin, "pbn": parse_pbn}
+
+
+@dataclass(frozen=True)
+class CorpusFileResult:
+    """
+    The outcome of parsing a single corpus file. If the file could not be parsed, deal_records is empty and error holds
+    a description of the failure
+    """
+
+    path: Path
+    deal_records: List[DealRecord]
+    size: int
+    error: Optional[str] = None
+
+
+def _parse_file(path: Path, input_format: str, lazy: bool) -> CorpusFileResult:
+    try:
+        size = os.path.getsize(path)
+    except OSError as e:
+        return CorpusFileResult(path, [], 0, repr(e))
+    try:
+        return CorpusFileResult(path, _PARSERS[input_format](path, lazy), size)
+    # UnicodeError is a ValueError and is reported like any other malformed file
+    except (OSError, ValueError, KeyError, IndexError, AssertionError) as e:
+        return CorpusFileResult(path, [], size, repr(e))
+
+
+def _parse_files(paths: List[Path], input_format: str, workers: int, lazy: bool) -> Iterator[CorpusFileResult]:
+    if workers == 1:
+        for path in paths:
+            yield _parse_file(path, input_format, lazy)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map yields in submission order, so results are deterministic regardless of which worker finishes first
+        yield from executor.map(_parse_file, paths, [input_format] * len(paths), [lazy] * len(paths))
+
+
+def parse_corpus(
+    paths: Iterable[Path], input_format: str, workers: Optional[int] = None, lazy: bool = False
+) -> Iterator[CorpusFileResult]:
+    """
+    Parse many LIN or PBN files using a pool of worker processes. A file which fails to parse produces a result with an
+    error instead of stopping the corpus. Throughput is logged once all files are parsed.
+    :param paths: LIN or PBN files to parse
+    :param input_format: "lin" for multi-board LIN files or "pbn"
+    :param workers: Number of worker processes. Defaults to the number of CPUs. 1 parses in the calling process
+    :param lazy: If True, board play records are decoded on first access. See LazyBoardRecord
+    :return: An iterator of CorpusFileResults in the same order as paths
+    """
+    if input_format not in _PARSERS:
+        raise ValueError(f"Unknown input format {input_format}. Expected one of {list(_PARSERS)}")
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    board_count = 0
+    byte_count = 0
+    error_count = 0
+    for result in _parse_files(paths, input_format, workers, lazy):
+        board_count += sum(len(deal_record.board_records) for deal_record in result.deal_records)
+        byte_count += result.size
+        if result.error:
+            error_count += 1
+            logging.warning(f"Failed to parse {result.path}: {result.error}")
+        yield result
+    elapsed = max(time.perf_counter() - start_time, 1e-9)
+    logging.info(
+        f"Parsed {len(paths)} files ({error_count} failed) with {board_count} boards in {elapsed:.2f}s using {workers} "
+        f"workers: {len(paths) / elapsed:.1f} files/s, {board_count / elapsed:.0f} boards/s, "
+        f"{byte_count / elapsed / 1e6:.2f} MB/s"
+    )
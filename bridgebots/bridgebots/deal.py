@@ -1,57 +1,123 @@
 from __future__ import annotations
 
 from functools import total_ordering
-from typing import Dict, Iterable, List
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Tuple
 
+from bridgebots import bitboard
 from bridgebots.deal_enums import Direction, Rank, Suit
 
 """
 Classes to represent each component of a bridge deal
 """
 
+_SERIALIZED_DEAL_SIZE = 14
+_FINGERPRINT_SIZE = 16
+
 
 @total_ordering
 class Card:
     """
-    A single card in a hand or deal of bridge
+    A single card in a hand or deal of bridge. Constructing a Card, parsing one with from_str or unpickling one returns
+    a shared instance for that suit and rank. Cards unpickled from pickles written before Cards were interned are
+    separate instances, so compare Cards with == rather than is. Each card has an index from 0 (C2) to 51 (SA) which
+    matches the natural card ordering and the bitboard layout.
     """
 
-    def __init__(self, suit: Suit, rank: Rank):
+    __slots__ = ("suit", "rank", "index", "_str")
+
+    def __new__(cls, suit: Suit = None, rank: Rank = None) -> Card:
+        if suit is None:  # Unpickling a Card which was pickled before Cards were interned. See __setstate__
+            return object.__new__(cls)
+        return _CARDS[suit.value * 13 + rank.value[0] - 2]
+
+    def _initialize(self, suit: Suit, rank: Rank):
         self.suit = suit
         self.rank = rank
+        self.index = suit.value * 13 + rank.value[0] - 2
+        self._str = suit.name[0] + rank.value[1]
+
+    def __reduce__(self):
+        return Card, (self.suit, self.rank)
+
+    def __setstate__(self, state):
+        # Legacy pickles store the instance __dict__, possibly paired with an empty slots dict
+        if isinstance(state, tuple):
+            state = state[0] or state[1]
+        self._initialize(state["suit"], state["rank"])
 
     def __eq__(self, other) -> bool:
-        return self.rank == other.rank and self.suit == other.suit
+        return self is other or (isinstance(other, Card) and self.index == other.index)
 
     def __hash__(self) -> int:
-        return hash((self.suit, self.rank))
+        return self.index
 
     def __lt__(self, other) -> bool:
-        return (self.suit, self.rank) < (other.suit, other.rank)
+        return self.index < other.index
 
-    def __str__(self) -> bool:
-        return self.suit.name[0] + self.rank.value[1]
+    def __str__(self) -> str:
+        return self._str
 
     def __repr__(self) -> str:
-        return self.suit.name[0] + self.rank.value[1]
+        return self._str
 
     @classmethod
     def from_str(cls, card_str) -> Card:
-        return Card(Suit.from_str(card_str[0]), Rank.from_str(card_str[1]))
+        card = _CARDS_BY_STR.get(card_str)
+        if card is None:
+            card = Card(Suit.from_str(card_str[0]), Rank.from_str(card_str[1]))
+        return card
+
+    @staticmethod
+    def from_index(index: int) -> Card:
+        return _CARDS[index]
+
+
+def _build_cards() -> List[Card]:
+    cards = []
+    for suit in sorted(Suit):
+        for rank in sorted(Rank):
+            card = object.__new__(Card)
+            card._initialize(suit, rank)
+            cards.append(card)
+    return cards
+
+
+_CARDS: List[Card] = _build_cards()
+_CARDS_BY_STR: Dict[str, Card] = {
+    suit_str + rank_str: card
+    for card in _CARDS
+    for suit_str in (card.suit.abbreviation(), card.suit.abbreviation().lower())
+    for rank_str in (card.rank.abbreviation(), card.rank.abbreviation().lower())
+}
 
 
 class PlayerHand:
     """
-    A single player's 13 cards in a bridge deal
+    A single player's 13 cards in a bridge deal. A hand is backed by its suits, its bitboard, or both. Hands built from
+    a compact source (e.g. from_bitboard) only expand the suits and cards lists the first time they are accessed.
     """
 
+    __slots__ = ("_suits", "_cards", "_bits")
+
     def __init__(self, suits: Dict[Suit, List[Rank]]):
-        self.suits = suits
-        assert 13 == sum([len(ranks) for suit, ranks in self.suits.items()])
-        self.cards = []
-        for suit in reversed(Suit):
-            for rank in self.suits[suit]:
-                self.cards.append(Card(suit, rank))
+        assert 13 == sum([len(ranks) for suit, ranks in suits.items()])
+        self._suits = suits
+        self._cards = None
+        self._bits = None
+
+    @staticmethod
+    def from_bitboard(bits: int) -> PlayerHand:
+        """
+        :param bits: 52 bit holding. See the bitboard module
+        :return: PlayerHand whose suits and cards are expanded lazily
+        """
+        assert 13 == bitboard.popcount(bits)
+        hand = PlayerHand.__new__(PlayerHand)
+        hand._suits = None
+        hand._cards = None
+        hand._bits = bits
+        return hand
 
     @staticmethod
     def from_string_lists(spades: List[str], hearts: List[str], diamonds: List[str], clubs: List[str]) -> PlayerHand:
@@ -70,13 +136,50 @@ class PlayerHand:
 
     @staticmethod
     def from_cards(cards: Iterable[Card]) -> PlayerHand:
-        suits = {
-            Suit.CLUBS: sorted([card.rank for card in cards if card.suit == Suit.CLUBS], reverse=True),
-            Suit.DIAMONDS: sorted([card.rank for card in cards if card.suit == Suit.DIAMONDS], reverse=True),
-            Suit.HEARTS: sorted([card.rank for card in cards if card.suit == Suit.HEARTS], reverse=True),
-            Suit.SPADES: sorted([card.rank for card in cards if card.suit == Suit.SPADES], reverse=True),
-        }
-        return PlayerHand(suits)
+        bits = 0
+        for card in cards:
+            bits |= 1 << card.index
+        return PlayerHand.from_bitboard(bits)
+
+    @property
+    def suits(self) -> Dict[Suit, List[Rank]]:
+        if self._suits is None:
+            self._suits = bitboard.to_suits(self._bits)
+        return self._suits
+
+    @property
+    def cards(self) -> List[Card]:
+        """:return: Cards in descending suit order, and in descending rank order within each suit"""
+        if self._cards is None:
+            if self._suits is None:
+                bits = self._bits
+                self._cards = [_CARDS[index] for index in range(51, -1, -1) if bits >> index & 1]
+            else:
+                self._cards = [Card(suit, rank) for suit in reversed(Suit) for rank in self._suits[suit]]
+        return self._cards
+
+    @property
+    def bits(self) -> int:
+        """:return: The 52 bit holding for this hand. See the bitboard module"""
+        if self._bits is None:
+            self._bits = bitboard.from_suits(self._suits)
+        return self._bits
+
+    def __contains__(self, card: Card) -> bool:
+        return bool(self.bits >> card.index & 1)
+
+    def __getstate__(self):
+        # Pickle only the compact holding. Lists are rebuilt lazily after unpickling
+        return {"_bits": self.bits}
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):  # Default pickle state for slotted classes is a (dict, slots dict) pair
+            state = state[1]
+        if "suits" in state:  # Pickled before hands were lazy
+            state = {"_bits": bitboard.from_suits(state["suits"])}
+        self._suits = None
+        self._cards = None
+        self._bits = state["_bits"]
 
     def __repr__(self):
         suit_arrays = [[], [], [], []]
@@ -86,10 +189,13 @@ class PlayerHand:
         return f"PlayerHand({repr_str})"
 
     def __eq__(self, other) -> bool:
-        return self.suits == other.suits
+        return isinstance(other, PlayerHand) and self.bits == other.bits
 
     def __hash__(self) -> int:
-        return hash(set(self.cards))
+        return hash(self.bits)
+
+    def to_bitboard(self) -> BitboardHand:
+        return BitboardHand(self.bits)
 
 
 class Deal:
@@ -102,7 +208,26 @@ class Deal:
         self.ns_vulnerable = ns_vulnerable
         self.ew_vulnerable = ew_vulnerable
         self.hands = hands
-        self.player_cards = {direction: self.hands[direction].cards for direction in self.hands}
+        self._player_cards = None
+        self._fingerprints = {}
+
+    @property
+    def player_cards(self) -> Dict[Direction, List[Card]]:
+        if self._player_cards is None:
+            self._player_cards = {direction: self.hands[direction].cards for direction in self.hands}
+        return self._player_cards
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_player_cards"] = None
+        state["_fingerprints"] = {}
+        return state
+
+    def __setstate__(self, state):
+        state.pop("player_cards", None)  # Pickled before player_cards was lazy
+        state["_player_cards"] = None
+        state["_fingerprints"] = {}
+        self.__dict__.update(state)
 
     def __repr__(self):
         return (
@@ -124,8 +249,8 @@ class Deal:
         )
 
     def __hash__(self) -> int:
-        card_sets = [(direction, frozenset(self.hands[direction].cards)) for direction in self.hands]
-        return hash((self.dealer, self.ns_vulnerable, self.ew_vulnerable, frozenset(card_sets)))
+        hand_bits = frozenset((direction, hand.bits) for direction, hand in self.hands.items())
+        return hash((self.dealer, self.ns_vulnerable, self.ew_vulnerable, hand_bits))
 
     @staticmethod
     def from_cards(
@@ -136,3 +261,145 @@ class Deal:
 
     def is_vulnerable(self, direction: Direction):
         return self.ns_vulnerable if direction in [Direction.NORTH, Direction.SOUTH] else self.ew_vulnerable
+
+    def to_bitboard(self) -> BitboardDeal:
+        return BitboardDeal.from_deal(self)
+
+    def fingerprint(self, canonical: bool = False, ignore_dealer_vulnerability: bool = False) -> bytes:
+        """
+        A 16 byte fingerprint which is stable across processes and runs, unlike hash(). Cached per set of options.
+        See BitboardDeal.fingerprint
+        """
+        key = (canonical, ignore_dealer_vulnerability)
+        if key not in self._fingerprints:
+            self._fingerprints[key] = self.to_bitboard().fingerprint(canonical, ignore_dealer_vulnerability)
+        return self._fingerprints[key]
+
+
+class BitboardHand:
+    """
+    A compact representation of a player's hand as a single 52 bit int. See the bitboard module for the bit layout.
+    Point counts, shape, and membership tests are computed with bit operations instead of walking a list of Cards.
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int):
+        self.bits = bits
+
+    @staticmethod
+    def from_player_hand(player_hand: PlayerHand) -> BitboardHand:
+        return player_hand.to_bitboard()
+
+    def to_player_hand(self) -> PlayerHand:
+        return PlayerHand.from_bitboard(self.bits)
+
+    @property
+    def suits(self) -> Dict[Suit, List[Rank]]:
+        return bitboard.to_suits(self.bits)
+
+    @property
+    def cards(self) -> List[Card]:
+        """:return: Cards in the same order as PlayerHand.cards"""
+        return [_CARDS[index] for index in range(51, -1, -1) if self.bits >> index & 1]
+
+    def count_hcp(self) -> int:
+        return bitboard.count_hcp(self.bits)
+
+    def calculate_shape(self, sort=False) -> Tuple[int, ...]:
+        return bitboard.calculate_shape(self.bits, sort)
+
+    def __contains__(self, card: Card) -> bool:
+        return bool(self.bits >> card.index & 1)
+
+    def __len__(self) -> int:
+        return bitboard.popcount(self.bits)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, BitboardHand) and self.bits == other.bits
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __repr__(self) -> str:
+        return f"BitboardHand({self.to_player_hand()!r})"
+
+
+class BitboardDeal:
+    """
+    A compact representation of a Deal which stores one 52 bit int per Direction. Hands are indexed by Direction.value
+    """
+
+    __slots__ = ("dealer", "ns_vulnerable", "ew_vulnerable", "hands")
+
+    def __init__(self, dealer: Direction, ns_vulnerable: bool, ew_vulnerable: bool, hands: Tuple[int, int, int, int]):
+        self.dealer = dealer
+        self.ns_vulnerable = ns_vulnerable
+        self.ew_vulnerable = ew_vulnerable
+        self.hands = hands
+
+    @staticmethod
+    def from_deal(deal: Deal) -> BitboardDeal:
+        hands = tuple(deal.hands[direction].bits for direction in Direction)
+        return BitboardDeal(deal.dealer, deal.ns_vulnerable, deal.ew_vulnerable, hands)
+
+    def to_deal(self) -> Deal:
+        hands = {direction: self.hand(direction).to_player_hand() for direction in Direction}
+        return Deal(self.dealer, self.ns_vulnerable, self.ew_vulnerable, hands)
+
+    def hand(self, direction: Direction) -> BitboardHand:
+        return BitboardHand(self.hands[direction.value])
+
+    def serialize(self) -> bytes:
+        """
+        :return: The same 14 byte record as serialize_deal. Reading the reversed binary digits of a hand as a base 4
+        number moves card i to base 4 digit 51 - i, so each hand is spread into the owner digits with one int parse
+        """
+        owners = 0
+        for owner, bits in enumerate(self.hands):
+            if owner:
+                owners += owner * int(format(bits, "052b")[::-1], 4)
+        vulnerability = self.ns_vulnerable << 1 | self.ew_vulnerable
+        return (owners << 4 | self.dealer.value << 2 | vulnerability).to_bytes(_SERIALIZED_DEAL_SIZE, byteorder="big")
+
+    def rotate(self, seats: int) -> BitboardDeal:
+        """
+        :return: This deal with every hand, the dealer, and the vulnerability moved clockwise by the number of seats
+        """
+        hands = tuple(self.hands[(value - seats) % 4] for value in range(4))
+        dealer = self.dealer.offset(seats)
+        if seats % 2:
+            return BitboardDeal(dealer, self.ew_vulnerable, self.ns_vulnerable, hands)
+        return BitboardDeal(dealer, self.ns_vulnerable, self.ew_vulnerable, hands)
+
+    def fingerprint(self, canonical: bool = False, ignore_dealer_vulnerability: bool = False) -> bytes:
+        """
+        A 128 bit blake2b digest of the serialized deal.
+        :param canonical: Treat the four seat rotations of a deal as equal by fingerprinting the smallest serialized
+        rotation
+        :param ignore_dealer_vulnerability: Treat deals which differ only by dealer or vulnerability as equal
+        :return: 16 byte fingerprint
+        """
+        deals = [self.rotate(seats) for seats in range(4)] if canonical else [self]
+        if ignore_dealer_vulnerability:
+            deals = [BitboardDeal(Direction.NORTH, False, False, deal.hands) for deal in deals]
+        serialized = min(deal.serialize() for deal in deals)
+        return blake2b(serialized, digest_size=_FINGERPRINT_SIZE).digest()
+
+    def is_vulnerable(self, direction: Direction):
+        return self.ns_vulnerable if direction in [Direction.NORTH, Direction.SOUTH] else self.ew_vulnerable
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, BitboardDeal)
+            and self.dealer == other.dealer
+            and self.ns_vulnerable == other.ns_vulnerable
+            and self.ew_vulnerable == other.ew_vulnerable
+            and self.hands == other.hands
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.dealer, self.ns_vulnerable, self.ew_vulnerable, self.hands))
+
+    def __repr__(self) -> str:
+        return f"BitboardDeal({self.to_deal()!r})"
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from bridgebots.deal import BitboardDeal, Deal
+from bridgebots.deal_enums import Direction
+
+"""
+Columnar batches of deals
+"""
+
+_CARD_COUNT = 52
+_SERIALIZED_DEAL_SIZE = 14
+# Translation tables which map an owner byte to an ascii binary digit, 1 if the card is held by the given Direction
+_OWNER_BINARY_DIGITS = [
+    bytes(ord("1") if owner == direction.value else ord("0") for owner in range(256)) for direction in Direction
+]
+# Translation tables which map an owner byte to 1 if the card is held by the given Direction, else 0
+_OWNER_FLAGS = [bytes(1 if owner == direction.value else 0 for owner in range(256)) for direction in Direction]
+_DIRECTIONS = sorted(Direction)
+
+# Each serialized deal is 112 bits, or 56 base-4 digits: 2 leading zero digits, the owner of each card in Card.index
+# order, the dealer, and the vulnerability flags
+_DIGITS_PER_DEAL = 56
+_OWNERS_START = 2
+_DEALER_DIGIT = 54
+_VULNERABILITY_DIGIT = 55
+# Convert in bounded chunks so the intermediate digit strings stay small
+_CHUNK_DEALS = 1 << 15
+_ASCII_BIT_TO_BYTE = bytes.maketrans(b"01", b"\x00\x01")
+_DIGIT_TO_ASCII = bytes.maketrans(b"\x00\x01\x02\x03", b"0123")
+
+
+def _unpack_digits(serialized_deals) -> bytes:
+    """
+    Expand concatenated 14 byte deal records into 56 base-4 digits per deal, one byte per digit. The bits of each pair
+    are split into two strings whose bytes are 0 or 1, so combining them as (high << 1) | low never carries between
+    bytes and the whole chunk is converted with a few big int operations.
+    """
+    digit_chunks = []
+    chunk_size = _CHUNK_DEALS * _SERIALIZED_DEAL_SIZE
+    for offset in range(0, len(serialized_deals), chunk_size):
+        chunk = serialized_deals[offset : offset + chunk_size]
+        bit_str = format(int.from_bytes(chunk, byteorder="big"), f"0{len(chunk) * 8}b").encode("ascii")
+        high = int.from_bytes(bit_str[0::2].translate(_ASCII_BIT_TO_BYTE), byteorder="big")
+        low = int.from_bytes(bit_str[1::2].translate(_ASCII_BIT_TO_BYTE), byteorder="big")
+        digit_chunks.append(((high << 1) | low).to_bytes(len(chunk) * 4, byteorder="big"))
+    return b"".join(digit_chunks)
+
+
+def _pack_digits(digits) -> bytes:
+    """Inverse of _unpack_digits. Parsing the digits as a single base-4 number packs them two bits at a time."""
+    record_chunks = []
+    chunk_size = _CHUNK_DEALS * _DIGITS_PER_DEAL
+    for offset in range(0, len(digits), chunk_size):
+        chunk = bytes(digits[offset : offset + chunk_size])
+        packed = int(chunk.translate(_DIGIT_TO_ASCII), 4) if chunk else 0
+        record_chunks.append(packed.to_bytes(len(chunk) // 4, byteorder="big"))
+    return b"".join(record_chunks)
+
+
+class DealArray:
+    """
+    A structure-of-arrays batch of deals.
+    owners: 52 bytes per deal. Each byte is the Direction.value of the player holding the card with that Card.index
+    dealers: 1 byte per deal holding the dealer's Direction.value
+    vulnerability: 1 byte per deal. Bit 1 is set if NS are vulnerable and bit 0 is set if EW are vulnerable. These are
+    the same flags as the final bits of serialize_deal.
+
+    Columns are bytes-like, so numpy users can view them without a copy, e.g.
+    numpy.frombuffer(deal_array.owners, dtype=numpy.uint8).reshape(-1, 52)
+    """
+
+    __slots__ = ("owners", "dealers", "vulnerability")
+
+    def __init__(self, owners: Union[bytes, bytearray, memoryview], dealers, vulnerability):
+        if len(owners) != len(dealers) * _CARD_COUNT or len(dealers) != len(vulnerability):
+            raise ValueError(
+                f"Mismatched column lengths owners:{len(owners)} dealers:{len(dealers)} "
+                f"vulnerability:{len(vulnerability)}"
+            )
+        self.owners = owners
+        self.dealers = dealers
+        self.vulnerability = vulnerability
+
+    def __len__(self) -> int:
+        return len(self.dealers)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Deal, DealArray]:
+        """
+        An int returns a single Deal. A contiguous slice returns a DealArray of memoryviews into this array's columns
+        without copying. Strided slices copy.
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                stop = max(start, stop)
+                return DealArray(
+                    memoryview(self.owners)[start * _CARD_COUNT : stop * _CARD_COUNT],
+                    memoryview(self.dealers)[start:stop],
+                    memoryview(self.vulnerability)[start:stop],
+                )
+            indices = range(start, stop, step)
+            owners = b"".join(self.owner_row(i) for i in indices)
+            return DealArray(owners, bytes(self.dealers[key]), bytes(self.vulnerability[key]))
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(f"DealArray index out of range: {key}")
+        return self.bitboard_deal(key).to_deal()
+
+    def __iter__(self) -> Iterator[Deal]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def owner_row(self, index: int) -> bytes:
+        """:return: The 52 owner bytes of a single deal"""
+        return bytes(self.owners[index * _CARD_COUNT : (index + 1) * _CARD_COUNT])
+
+    def one_hot(self, index: int, direction: Direction) -> bytes:
+        """:return: 52 bytes in Card.index order, 1 if the card is held by direction else 0"""
+        return self.owner_row(index).translate(_OWNER_FLAGS[direction.value])
+
+    def bitboards(self, index: int) -> Tuple[int, int, int, int]:
+        """:return: One 52 bit holding per Direction for a single deal. See the bitboard module"""
+        # Reverse the row so that the card with index 0 becomes the least significant binary digit
+        reversed_row = self.owner_row(index)[::-1]
+        return tuple(int(reversed_row.translate(digits), 2) for digits in _OWNER_BINARY_DIGITS)
+
+    def bitboard_deal(self, index: int) -> BitboardDeal:
+        vulnerability = self.vulnerability[index]
+        return BitboardDeal(
+            _DIRECTIONS[self.dealers[index]], bool(vulnerability & 2), bool(vulnerability & 1), self.bitboards(index)
+        )
+
+    @staticmethod
+    def from_deals(deals: Iterable[Deal]) -> DealArray:
+        owners = bytearray()
+        dealers = bytearray()
+        vulnerability = bytearray()
+        for deal in deals:
+            # Spread each hand's bits into one byte per card, scaled by the owner. Every card has exactly one owner so
+            # adding the spread rows never carries between bytes
+            row = 0
+            for direction, hand in deal.hands.items():
+                if direction.value:
+                    flags = format(hand.bits, "052b").encode("ascii").translate(_ASCII_BIT_TO_BYTE)
+                    row += int.from_bytes(flags, byteorder="big") * direction.value
+            owners += row.to_bytes(_CARD_COUNT, byteorder="little")
+            dealers.append(deal.dealer.value)
+            vulnerability.append(deal.ns_vulnerable << 1 | deal.ew_vulnerable)
+        return DealArray(owners, dealers, vulnerability)
+
+    def to_deals(self) -> List[Deal]:
+        return list(self)
+
+    @staticmethod
+    def from_serialized(serialized_deals: Union[bytes, bytearray, memoryview]) -> DealArray:
+        """
+        :param serialized_deals: Concatenated 14 byte records produced by serialize_deal
+        """
+        if len(serialized_deals) % _SERIALIZED_DEAL_SIZE != 0:
+            raise ValueError(f"Serialized deals must be a multiple of {_SERIALIZED_DEAL_SIZE} bytes")
+        digits = _unpack_digits(serialized_deals)
+        owners = b"".join(
+            digits[offset + _OWNERS_START : offset + _DEALER_DIGIT]
+            for offset in range(0, len(digits), _DIGITS_PER_DEAL)
+        )
+        if any(digits[0::_DIGITS_PER_DEAL]) or any(digits[1::_DIGITS_PER_DEAL]):
+            raise ValueError("Invalid serialized deal: leading bits must be zero")
+        return DealArray(
+            owners, digits[_DEALER_DIGIT::_DIGITS_PER_DEAL], digits[_VULNERABILITY_DIGIT::_DIGITS_PER_DEAL]
+        )
+
+    def to_serialized(self) -> bytes:
+        """:return: Concatenated 14 byte records in the serialize_deal format"""
+        deal_count = len(self)
+        digits = bytearray(deal_count * _DIGITS_PER_DEAL)
+        for i in range(deal_count):
+            offset = i * _DIGITS_PER_DEAL
+            digits[offset + _OWNERS_START : offset + _DEALER_DIGIT] = self.owners[
+                i * _CARD_COUNT : (i + 1) * _CARD_COUNT
+            ]
+        digits[_DEALER_DIGIT::_DIGITS_PER_DEAL] = self.dealers
+        digits[_VULNERABILITY_DIGIT::_DIGITS_PER_DEAL] = self.vulnerability
+        return _pack_digits(digits)
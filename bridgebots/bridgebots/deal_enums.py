@@ -19,7 +19,7 @@ class Direction(Enum):
 
     @classmethod
     def from_str(cls, direction_str) -> Direction:
-        return Direction(cls.__from_str_map__[direction_str.upper()])
+        return _lookup(_DIRECTIONS_BY_STR, direction_str)
 
     def __lt__(self, other) -> bool:
         return self.value < other.value
@@ -28,16 +28,16 @@ class Direction(Enum):
         return self.name
 
     def next(self) -> Direction:
-        return self.offset(1)
+        return self._rotations[1]
 
     def partner(self) -> Direction:
-        return self.offset(2)
+        return self._rotations[2]
 
     def previous(self) -> Direction:
-        return self.offset(3)
+        return self._rotations[3]
 
     def offset(self, offset: int) -> Direction:
-        return Direction((self.value + offset) % 4)
+        return self._rotations[offset % 4]
 
     def abbreviation(self) -> str:
         return self.name[0]
@@ -54,7 +54,7 @@ class Suit(Enum):
 
     @classmethod
     def from_str(cls, suit_str: str) -> Suit:
-        return Suit(cls.__from_str_map__[suit_str.upper()])
+        return _lookup(_SUITS_BY_STR, suit_str)
 
     def __lt__(self, other) -> bool:
         return self.value < other.value
@@ -92,7 +92,7 @@ class BiddingSuit(Enum):
 
     @classmethod
     def from_str(cls, bidding_suit_str: str) -> BiddingSuit:
-        return BiddingSuit(cls.__from_str_map__[bidding_suit_str.upper()])
+        return _lookup(_BIDDING_SUITS_BY_STR, bidding_suit_str)
 
 
 @total_ordering
@@ -130,7 +130,7 @@ class Rank(Enum):
 
     @classmethod
     def from_str(cls, rank_str: str) -> Rank:
-        return Rank(cls.__from_str_map__[rank_str.upper()])
+        return _lookup(_RANKS_BY_STR, rank_str)
 
     def __lt__(self, other) -> bool:
         return self.value < other.value
@@ -140,3 +140,30 @@ class Rank(Enum):
 
     def abbreviation(self) -> str:
         return self.value[1]
+
+
+def _build_lookup(enum_class) -> dict:
+    """:return: A mapping from the upper and lower case spellings in __from_str_map__ directly to enum members"""
+    lookup = {}
+    for enum_str, value in enum_class.__from_str_map__.items():
+        lookup[enum_str] = lookup[enum_str.lower()] = enum_class(value)
+    return lookup
+
+
+def _lookup(lookup: dict, enum_str: str):
+    """Spellings not in the table (e.g. mixed case) fall back to the upper case entry, which raises KeyError if invalid"""
+    member = lookup.get(enum_str)
+    if member is None:
+        return lookup[enum_str.upper()]
+    return member
+
+
+_DIRECTIONS_BY_STR = _build_lookup(Direction)
+_SUITS_BY_STR = _build_lookup(Suit)
+_BIDDING_SUITS_BY_STR = _build_lookup(BiddingSuit)
+_RANKS_BY_STR = _build_lookup(Rank)
+
+# Precompute each Direction's rotations so next/partner/previous/offset are a single indexed lookup
+for _direction in Direction:
+    _direction._rotations = tuple(Direction((_direction.value + offset) % 4) for offset in range(4))
+del _direction
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import mmap
+import pickle
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from bridgebots.board_record import BoardRecord, DealRecord
+from bridgebots.deal import Deal
+from bridgebots.deal_array import DealArray
+from bridgebots.deal_utils import deserialize_deal, serialize_deals
+
+"""
+An on-disk store of DealRecords which supports random access without loading the whole corpus. A store is a directory
+containing:
+    deals.bin: one 14 byte serialize_deal record per deal
+    boards.bin: the pickled list of BoardRecords for each deal, concatenated
+    board_offsets.bin: little-endian uint64 offsets into boards.bin. Entry i is the start of deal i's board records and
+    the final entry is the end of the last deal's board records
+Files are opened with mmap, so reading deal N or iterating over a range only touches the pages that are needed.
+"""
+
+DEALS_FILE = "deals.bin"
+BOARDS_FILE = "boards.bin"
+BOARD_OFFSETS_FILE = "board_offsets.bin"
+_SERIALIZED_DEAL_SIZE = 14
+_OFFSET = struct.Struct("<Q")
+_WRITE_BATCH_SIZE = 1024
+_READ_BATCH_SIZE = 1024
+
+
+def encode_board_records(board_records: List[BoardRecord]) -> bytes:
+    return pickle.dumps(board_records, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_board_records(encoded_board_records: bytes) -> List[BoardRecord]:
+    return pickle.loads(encoded_board_records)
+
+
+class DealStoreWriter:
+    """
+    Append DealRecords to a new store. Use as a context manager, or call close() when finished
+    """
+
+    def __init__(self, store_path: Path):
+        store_path.mkdir(parents=True, exist_ok=True)
+        self.store_path = store_path
+        self._deals_file = open(store_path / DEALS_FILE, "wb")
+        self._boards_file = open(store_path / BOARDS_FILE, "wb")
+        self._offsets_file = open(store_path / BOARD_OFFSETS_FILE, "wb")
+        self._offsets_file.write(_OFFSET.pack(0))
+        self._board_offset = 0
+        self._pending_deals: List[Deal] = []
+        self.count = 0
+
+    def write(self, deal_record: DealRecord):
+        encoded_board_records = encode_board_records(deal_record.board_records)
+        self._boards_file.write(encoded_board_records)
+        self._board_offset += len(encoded_board_records)
+        self._offsets_file.write(_OFFSET.pack(self._board_offset))
+        self._pending_deals.append(deal_record.deal)
+        if len(self._pending_deals) >= _WRITE_BATCH_SIZE:
+            self._flush_deals()
+        self.count += 1
+
+    def write_all(self, deal_records: Iterable[DealRecord]):
+        for deal_record in deal_records:
+            self.write(deal_record)
+
+    def _flush_deals(self):
+        self._deals_file.write(serialize_deals(self._pending_deals))
+        self._pending_deals = []
+
+    def close(self):
+        self._flush_deals()
+        for file in [self._deals_file, self._boards_file, self._offsets_file]:
+            file.close()
+
+    def __enter__(self) -> DealStoreWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _map_file(file_path: Path) -> Optional[mmap.mmap]:
+    """mmap cannot map empty files, so represent them as None"""
+    with open(file_path, "rb") as file:
+        if file_path.stat().st_size == 0:
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class DealStore:
+    """
+    Read-only random access to a store written by DealStoreWriter
+    """
+
+    def __init__(self, store_path: Path):
+        self.store_path = store_path
+        self._deals = _map_file(store_path / DEALS_FILE)
+        self._boards = _map_file(store_path / BOARDS_FILE)
+        self._offsets = _map_file(store_path / BOARD_OFFSETS_FILE)
+        deal_bytes = len(self._deals) if self._deals else 0
+        if deal_bytes % _SERIALIZED_DEAL_SIZE != 0:
+            raise ValueError(f"Corrupt deal store {store_path}: {DEALS_FILE} has {deal_bytes} bytes")
+        self._count = deal_bytes // _SERIALIZED_DEAL_SIZE
+        if self._offsets is None or len(self._offsets) != (self._count + 1) * _OFFSET.size:
+            raise ValueError(f"Corrupt deal store {store_path}: {BOARD_OFFSETS_FILE} does not match {DEALS_FILE}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def file_stats(self) -> List[Tuple[str, int, int]]:
+        """
+        :return: The name, size and modification time in nanoseconds of each store file. Indexes saved with the store
+        record these to detect when it has been rewritten
+        """
+        stats = []
+        for file_name in (DEALS_FILE, BOARDS_FILE, BOARD_OFFSETS_FILE):
+            file_stat = (self.store_path / file_name).stat()
+            stats.append((file_name, file_stat.st_size, file_stat.st_mtime_ns))
+        return stats
+
+    def _check_index(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(f"DealStore index out of range: {index}")
+        return index
+
+    def serialized_deal(self, index: int) -> bytes:
+        index = self._check_index(index)
+        return self._deals[index * _SERIALIZED_DEAL_SIZE : (index + 1) * _SERIALIZED_DEAL_SIZE]
+
+    def deal(self, index: int) -> Deal:
+        return deserialize_deal(self.serialized_deal(index))
+
+    def deal_array(self, start: int = 0, stop: Optional[int] = None) -> DealArray:
+        """:return: The deals in [start, stop) as a DealArray"""
+        start, stop, _ = slice(start, stop).indices(self._count)
+        if start >= stop:
+            return DealArray.from_serialized(b"")
+        return DealArray.from_serialized(
+            memoryview(self._deals)[start * _SERIALIZED_DEAL_SIZE : stop * _SERIALIZED_DEAL_SIZE]
+        )
+
+    def board_records(self, index: int) -> List[BoardRecord]:
+        index = self._check_index(index)
+        (start,) = _OFFSET.unpack_from(self._offsets, index * _OFFSET.size)
+        (end,) = _OFFSET.unpack_from(self._offsets, (index + 1) * _OFFSET.size)
+        return decode_board_records(self._boards[start:end])
+
+    def __getitem__(self, index: int) -> DealRecord:
+        return DealRecord(self.deal(index), self.board_records(index))
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[DealRecord]:
+        """Deals are decoded in fixed size batches, so memory use does not grow with the size of the range"""
+        start, stop, _ = slice(start, stop).indices(self._count)
+        for batch_start in range(start, stop, _READ_BATCH_SIZE):
+            batch_stop = min(batch_start + _READ_BATCH_SIZE, stop)
+            for index, deal in enumerate(self.deal_array(batch_start, batch_stop), batch_start):
+                yield DealRecord(deal, self.board_records(index))
+
+    def __iter__(self) -> Iterator[DealRecord]:
+        return self.iter_range()
+
+    def close(self):
+        for mapped_file in [self._deals, self._boards, self._offsets]:
+            if mapped_file is not None:
+                mapped_file.close()
+
+    def __enter__(self) -> DealStore:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,7 +1,8 @@
-from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple, Union
 
+from bridgebots.bitboard import FULL_DECK, SUIT_BITS, SUIT_MASK
 from bridgebots.deal import Card, Deal, PlayerHand
+from bridgebots.deal_array import DealArray
 from bridgebots.deal_enums import Direction, Rank, Suit
 
 """
@@ -9,11 +10,20 @@ Utilities for converting bridge data to/from a bridgebots representation
 """
 _NS_VULNERABLE_STRINGS = {"Both", "N-S", "All", "NS", "b", "n"}
 _EW_VULNERABLE_STRINGS = {"Both", "E-W", "All", "EW", "b", "e"}
-_REVERSE_SORTED_CARDS = sorted([Card(suit, rank) for suit in Suit for rank in Rank], reverse=True)
 _LIN_DEALER_TO_DIRECTION = {"1": Direction.SOUTH, "2": Direction.WEST, "3": Direction.NORTH, "4": Direction.EAST}
 _HOLDING_SUIT_IDENTIFIERS = ["S", "H", "D", "C"]
-_DECK_SET = frozenset({Card(suit, rank) for rank in Rank for suit in Suit})
+# Bit offset of each suit and rank character within a bitboard. See the bitboard module
+_SUIT_SHIFTS = {suit.abbreviation(): suit.value * SUIT_BITS for suit in Suit}
+_RANK_OFFSETS = {rank.abbreviation(): rank.value[0] - 2 for rank in Rank}
+_RANK_OFFSETS.update({rank_str.lower(): offset for rank_str, offset in _RANK_OFFSETS.items()})
+_SUITS_DESCENDING = sorted(Suit, reverse=True)
 _RANK_HCP = {Rank.ACE: 4, Rank.KING: 3, Rank.QUEEN: 2, Rank.JACK: 1}
+_SERIALIZED_DEAL_SIZE = 14
+# The rank characters of every 13 bit suit holding, highest rank first
+_SUIT_HOLDING_STRS = [
+    "".join(rank.abbreviation() for rank in reversed(Rank) if suit_bits >> (rank.value[0] - 2) & 1)
+    for suit_bits in range(1 << SUIT_BITS)
+]
 
 
 def serialize_deal(deal: Deal) -> bytes:
@@ -23,21 +33,7 @@ def serialize_deal(deal: Deal) -> bytes:
     :param deal: Deal to serialize
     :return: Compressed byte representation of the deal
     """
-    card_tuples: List[Tuple[Card, Direction]] = []
-    for direction, cards in deal.player_cards.items():
-        for card in cards:
-            card_tuples.append((card, direction))
-
-    sorted_tuples = sorted(card_tuples, key=lambda ct: ct[0])
-
-    binary_deal = 0
-    for card, direction in sorted_tuples:
-        binary_deal = (binary_deal << 2) | direction.value
-
-    binary_deal = (binary_deal << 2) | deal.dealer.value
-    binary_deal = (binary_deal << 1) | deal.ns_vulnerable
-    binary_deal = (binary_deal << 1) | deal.ew_vulnerable
-    return binary_deal.to_bytes(14, byteorder="big")
+    return serialize_deals([deal])
 
 
 def deserialize_deal(binary_deal_bytes: bytes) -> Deal:
@@ -46,25 +42,25 @@ def deserialize_deal(binary_deal_bytes: bytes) -> Deal:
     :param binary_deal_bytes: compressed byte representation of a deal
     :return: Deal object corresponding to the binary data
     """
-    binary_deal = int.from_bytes(binary_deal_bytes, byteorder="big")
-    ew_vulnerable = bool(binary_deal & 1)
-    ns_vulnerable = bool(binary_deal & 2)
-    binary_deal = binary_deal >> 2
-    dealer = Direction(binary_deal & 3)
-    binary_deal = binary_deal >> 2
-    hands = defaultdict(lambda: defaultdict(list))
-    for card in _REVERSE_SORTED_CARDS:
-        card_direction = Direction(binary_deal & 3)
-        hands[card_direction][card.suit].append(card.rank)
-        binary_deal = binary_deal >> 2
-
-    deal_hands = {
-        Direction.NORTH: PlayerHand(hands[Direction.NORTH]),
-        Direction.SOUTH: PlayerHand(hands[Direction.SOUTH]),
-        Direction.EAST: PlayerHand(hands[Direction.EAST]),
-        Direction.WEST: PlayerHand(hands[Direction.WEST]),
-    }
-    return Deal(dealer, ns_vulnerable, ew_vulnerable, deal_hands)
+    if len(binary_deal_bytes) != _SERIALIZED_DEAL_SIZE:
+        raise ValueError(f"Serialized deals are {_SERIALIZED_DEAL_SIZE} bytes: {binary_deal_bytes}")
+    return deserialize_deals(binary_deal_bytes)[0]
+
+
+def serialize_deals(deals: Iterable[Deal]) -> bytes:
+    """
+    Serialize many deals in one call
+    :return: Concatenated 14 byte records, each identical to the output of serialize_deal
+    """
+    return DealArray.from_deals(deals).to_serialized()
+
+
+def deserialize_deals(binary_deals: Union[bytes, bytearray, memoryview]) -> List[Deal]:
+    """
+    :param binary_deals: Concatenated 14 byte records produced by serialize_deal or serialize_deals
+    :return: The Deals in record order
+    """
+    return DealArray.from_serialized(binary_deals).to_deals()
 
 
 def from_acbl_dict(acbl_dict: Dict[str, str]) -> Deal:
@@ -107,13 +103,60 @@ def from_pbn_deal(dealer_str: str, vulnerability_str: str, deal_str: str) -> Dea
     deal_str = deal_str[2:]
     player_hands = {}
     for player_str in deal_str.split():
-        suit_lists = [list(suit) for suit in player_str.split(".")]
-        player_hands[hands_direction] = PlayerHand.from_string_lists(*suit_lists)
+        player_hands[hands_direction] = PlayerHand.from_bitboard(_pbn_holding_bits(player_str))
         hands_direction = hands_direction.next()
 
     return Deal(dealer, ns_vulnerable, ew_vulnerable, player_hands)
 
 
+def _holding_suit_strs(bits: int) -> List[str]:
+    """:return: The rank characters of each suit of a bitboard holding, spades first"""
+    return [_SUIT_HOLDING_STRS[bits >> (suit.value * SUIT_BITS) & SUIT_MASK] for suit in _SUITS_DESCENDING]
+
+
+def to_pbn_deal(deal: Deal) -> str:
+    """
+    Convert a bridgebots Deal to the value of a PBN 'Deal' key. Hands are listed clockwise starting with the dealer
+    :return: a PBN deal string like N:AK4.QJ2.T9876.32 ...
+    """
+    hand_strs = []
+    direction = deal.dealer
+    for _ in range(4):
+        hand_strs.append(".".join(_holding_suit_strs(deal.hands[direction].bits)))
+        direction = direction.next()
+    return f"{deal.dealer.abbreviation()}:{' '.join(hand_strs)}"
+
+
+def _lin_holding_str(bits: int) -> str:
+    """:return: A LIN holding like SAJ983H9D98732C75 for a bitboard holding"""
+    return "".join(
+        suit_identifier + suit_str
+        for suit_identifier, suit_str in zip(_HOLDING_SUIT_IDENTIFIERS, _holding_suit_strs(bits))
+    )
+
+
+def _pbn_holding_bits(player_str: str) -> int:
+    """:return: The bitboard for a PBN holding like AK4.QJ2.T9876.32"""
+    bits = 0
+    for suit, ranks in zip(_SUITS_DESCENDING, player_str.split(".")):
+        shift = suit.value * SUIT_BITS
+        for rank_str in ranks:
+            bits |= 1 << (shift + _RANK_OFFSETS[rank_str])
+    return bits
+
+
+def _lin_holding_bits(holding: str) -> int:
+    """:return: The bitboard for a LIN holding like SAKQ952HK65DQ6CKT"""
+    bits = 0
+    shift = _SUIT_SHIFTS["S"]
+    for c in holding.replace("10", "T"):
+        if c in _SUIT_SHIFTS:
+            shift = _SUIT_SHIFTS[c]
+        else:
+            bits |= 1 << (shift + _RANK_OFFSETS[c])
+    return bits
+
+
 def parse_lin_holding(holding: str) -> List[List[str]]:
     """
     :param holding: A LIN style holding like SAKQ952HK65DQ6CKT
@@ -147,20 +190,19 @@ def from_lin_deal(lin_dealer_str: str, vulnerability_str: str, holdings_str: str
     """
     dealer = _LIN_DEALER_TO_DIRECTION[lin_dealer_str]
     holdings = holdings_str.strip(",").split(",")
-    # Convert a holding string like SA63HJ8642DK53CKJ into a PlayerHand
-    players_suit_holdings = [parse_lin_holding(holding) for holding in holdings]
+    # Convert a holding string like SA63HJ8642DK53CKJ into a PlayerHand. Suits and cards are expanded on first access
     player_hands = {}
+    held_bits = 0
     current_direction = Direction.SOUTH
-    for suit_holdings in players_suit_holdings:
-        suit_holdings_lists = [list(suit_holding) for suit_holding in suit_holdings]
-        player_hands[current_direction] = PlayerHand.from_string_lists(*suit_holdings_lists)
+    for holding in holdings:
+        bits = _lin_holding_bits(holding)
+        held_bits |= bits
+        player_hands[current_direction] = PlayerHand.from_bitboard(bits)
         current_direction = current_direction.next()
 
     # Some LIN files only include 3 hands. In that case infer the 4th hand
     if len(player_hands) == 3:
-        held_cards = {card for player_hand in player_hands.values() for card in player_hand.cards}
-        remaining_cards = _DECK_SET - held_cards
-        player_hands[current_direction] = PlayerHand.from_cards(remaining_cards)
+        player_hands[current_direction] = PlayerHand.from_bitboard(FULL_DECK ^ held_bits)
 
     ns_vulnerable = vulnerability_str in _NS_VULNERABLE_STRINGS
     ew_vulnerable = vulnerability_str in _EW_VULNERABLE_STRINGS
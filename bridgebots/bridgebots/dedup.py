@@ -0,0 +1,128 @@
+import logging
+import pickle
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+from bridgebots.board_record import DealRecord
+
+try:
+    import resource
+except ImportError:  # resource is unavailable on Windows
+    resource = None
+
+"""
+Deduplicate a corpus which does not fit in memory. Items are first partitioned by a hash of their key into bucket files
+on disk, then each bucket is loaded on its own and merged. Memory use is bounded by the size of the largest bucket
+rather than the size of the corpus.
+"""
+
+T = TypeVar("T")
+
+_DEFAULT_BUCKET_COUNT = 64
+_BUFFER_SIZE = 1 << 16
+# File descriptors left for the rest of the process while every bucket file is open
+_RESERVED_FILE_DESCRIPTORS = 64
+
+
+def _keep_first(existing: T, duplicate: T) -> T:
+    return existing
+
+
+def _check_bucket_count(bucket_count: int):
+    """:raises ValueError: if bucket_count is not positive or would exceed the open file limit of the process"""
+    if bucket_count < 1:
+        raise ValueError(f"Invalid bucket count {bucket_count}")
+    if resource is None:
+        return
+    soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft_limit != resource.RLIM_INFINITY and bucket_count + _RESERVED_FILE_DESCRIPTORS > soft_limit:
+        raise ValueError(
+            f"Bucket count {bucket_count} needs more open files than the limit of {soft_limit}. Use at most "
+            f"{max(soft_limit - _RESERVED_FILE_DESCRIPTORS, 1)} buckets or raise the limit (ulimit -n)"
+        )
+
+
+def external_dedup(
+    items: Iterable[T],
+    key: Callable[[T], bytes],
+    merge: Callable[[T, T], T] = _keep_first,
+    work_dir: Optional[Path] = None,
+    bucket_count: int = _DEFAULT_BUCKET_COUNT,
+) -> Iterator[T]:
+    """
+    Deduplicate items using bucket files on disk. The whole input is partitioned before the first item is yielded.
+    Output order is deterministic: buckets in order, and items within a bucket in the order their key was first seen
+    :param items: Picklable items
+    :param key: Returns the dedup key of an item, such as a Deal fingerprint
+    :param merge: Combines an item with a later duplicate. Defaults to keeping the first item
+    :param work_dir: Directory for the temporary bucket files. Defaults to the system temporary directory
+    :param bucket_count: Number of bucket files, which are all open while partitioning. Memory use is roughly corpus
+    size / bucket_count
+    :return: An iterator of the unique (merged) items
+    :raises ValueError: if bucket_count is invalid or would exceed the open file limit. Raised when called
+    """
+    _check_bucket_count(bucket_count)
+    return _dedup_buckets(items, key, merge, work_dir, bucket_count)
+
+
+def _dedup_buckets(
+    items: Iterable[T],
+    key: Callable[[T], bytes],
+    merge: Callable[[T, T], T],
+    work_dir: Optional[Path],
+    bucket_count: int,
+) -> Iterator[T]:
+    with tempfile.TemporaryDirectory(dir=work_dir, prefix="bridgebots_dedup_") as temp_dir:
+        bucket_paths = [Path(temp_dir) / f"bucket_{bucket:05d}.pickle" for bucket in range(bucket_count)]
+        bucket_files = [open(bucket_path, "wb", buffering=_BUFFER_SIZE) for bucket_path in bucket_paths]
+        item_count = 0
+        try:
+            for item in items:
+                item_key = key(item)
+                pickle.dump(
+                    (item_key, item), bucket_files[zlib.crc32(item_key) % bucket_count], pickle.HIGHEST_PROTOCOL
+                )
+                item_count += 1
+        finally:
+            for bucket_file in bucket_files:
+                bucket_file.close()
+
+        unique_count = 0
+        for bucket_path in bucket_paths:
+            merged_items: Dict[bytes, T] = {}
+            with open(bucket_path, "rb", buffering=_BUFFER_SIZE) as bucket_file:
+                while True:
+                    try:
+                        item_key, item = pickle.load(bucket_file)
+                    except EOFError:
+                        break
+                    existing = merged_items.get(item_key)
+                    merged_items[item_key] = item if existing is None else merge(existing, item)
+            bucket_path.unlink()
+            unique_count += len(merged_items)
+            yield from merged_items.values()
+        logging.info(f"Deduplicated {item_count} items to {unique_count} unique items using {bucket_count} buckets")
+
+
+def _deal_record_key(deal_record: DealRecord) -> bytes:
+    return deal_record.deal.fingerprint()
+
+
+def merge_deal_records(deal_record: DealRecord, duplicate: DealRecord) -> DealRecord:
+    """
+    :return: A DealRecord with the board records of both records. Equal board records are only included once
+    """
+    return DealRecord(deal_record.deal, list(dict.fromkeys(deal_record.board_records + duplicate.board_records)))
+
+
+def dedup_deal_records(
+    deal_records: Iterable[DealRecord], work_dir: Optional[Path] = None, bucket_count: int = _DEFAULT_BUCKET_COUNT
+) -> Iterator[DealRecord]:
+    """
+    Merge the board records of every DealRecord with the same deal (by Deal.fingerprint) in bounded memory. See
+    external_dedup
+    :return: An iterator with one DealRecord per unique deal
+    """
+    return external_dedup(deal_records, _deal_record_key, merge_deal_records, work_dir, bucket_count)
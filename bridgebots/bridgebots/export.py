@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+from typing import Iterable, List, Optional, TextIO
+
+from bridgebots.board_record import DealRecord
+from bridgebots.lin import LinType, build_lin_str
+from bridgebots.pbn import build_pbn_str
+
+"""
+Write DealRecords to multi-board LIN or PBN files through a single buffered handle per output file, optionally gzip
+compressed and split into shards of a fixed number of boards
+"""
+
+_EXPORT_FORMATS = ("lin", "pbn")
+_BUFFER_SIZE = 1 << 20
+_COMPRESS_LEVEL = 6
+_PBN_HEADER = "% PBN 2.1\n% EXPORT\n"
+
+
+def _shard_path(output_path: Path, shard: int) -> Path:
+    """:return: output_path with the shard number before its extensions, e.g. boards-00001.lin.gz"""
+    name, dot, extensions = output_path.name.partition(".")
+    return output_path.with_name(f"{name}-{shard:05d}{dot}{extensions}")
+
+
+class DealRecordExporter:
+    """
+    Export DealRecords as multi-board LIN or PBN. Each BoardRecord is written as one board. Use as a context manager, or
+    call close() when finished
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        output_format: str = "lin",
+        compress: bool = False,
+        boards_per_shard: Optional[int] = None,
+        append: bool = False,
+        title: str = "bridgebots export",
+        include_names: bool = True,
+    ):
+        """
+        :param output_path: File to write. When sharding, shard numbers are inserted before the file extension
+        :param output_format: "lin" or "pbn"
+        :param compress: Write gzip compressed files
+        :param boards_per_shard: Start a new file after this many boards. None writes a single file
+        :param append: Append to output_path instead of replacing it. Not supported with sharding
+        :param title: Event title written to the header of LIN files
+        :param include_names: Include player names in LIN boards. PBN boards always include player names
+        """
+        if output_format not in _EXPORT_FORMATS:
+            raise ValueError(f"Unknown output format {output_format}. Expected one of {list(_EXPORT_FORMATS)}")
+        if boards_per_shard is not None and (boards_per_shard < 1 or append):
+            raise ValueError(f"Invalid sharding of {boards_per_shard} boards per shard with append={append}")
+        self.output_path = output_path
+        self.output_format = output_format
+        self.compress = compress
+        self.boards_per_shard = boards_per_shard
+        self.append = append
+        self.title = title
+        self.include_names = include_names
+        self.paths: List[Path] = []
+        self.count = 0
+        self._file: Optional[TextIO] = None
+        self._boards_in_file = 0
+
+    def _open_next_file(self):
+        if self._file:
+            self._file.close()
+        path = self.output_path if self.boards_per_shard is None else _shard_path(self.output_path, len(self.paths))
+        write_header = not (self.append and path.exists() and path.stat().st_size > 0)
+        mode = "a" if self.append else "w"
+        if self.compress:
+            self._file = gzip.open(path, mode + "t", compresslevel=_COMPRESS_LEVEL, encoding="utf-8")
+        else:
+            self._file = open(path, mode, buffering=_BUFFER_SIZE, encoding="utf-8")
+        if write_header:
+            self._file.write(f"vg|{self.title}|pg||\n" if self.output_format == "lin" else _PBN_HEADER)
+        self.paths.append(path)
+        self._boards_in_file = 0
+
+    def write(self, deal_record: DealRecord):
+        deal = deal_record.deal
+        for board_record in deal_record.board_records:
+            if self._file is None or self._boards_in_file == self.boards_per_shard:
+                self._open_next_file()
+            if self.output_format == "lin":
+                self._file.write(build_lin_str(deal, board_record, LinType.MULTI, self.include_names) + "\n")
+            else:
+                self._file.write(build_pbn_str(deal, board_record) + "\n\n")
+            self._boards_in_file += 1
+            self.count += 1
+
+    def write_all(self, deal_records: Iterable[DealRecord]):
+        for deal_record in deal_records:
+            self.write(deal_record)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> DealRecordExporter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def export_deal_records(
+    deal_records: Iterable[DealRecord],
+    output_path: Path,
+    output_format: str = "lin",
+    compress: bool = False,
+    boards_per_shard: Optional[int] = None,
+) -> List[Path]:
+    """
+    Stream DealRecords to multi-board LIN or PBN files. See DealRecordExporter
+    :return: The paths of the written files
+    """
+    with DealRecordExporter(output_path, output_format, compress, boards_per_shard) as exporter:
+        exporter.write_all(deal_records)
+    return exporter.paths
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Tuple
+
+from bridgebots import bitboard
+from bridgebots.deal_array import DealArray
+from bridgebots.deal_enums import Direction, Rank, Suit
+
+"""
+Batch hand evaluation. Every metric is computed per suit from a 13 bit suit holding (see the bitboard module) using
+lookup tables with one entry per possible holding, so evaluating a hand costs a handful of table lookups regardless of
+the metric.
+"""
+
+_HOLDINGS = range(1 << bitboard.SUIT_BITS)
+_SUITS_DESCENDING = sorted(Suit, reverse=True)
+_SUIT_SHIFTS = [suit.value * bitboard.SUIT_BITS for suit in _SUITS_DESCENDING]
+
+
+def _has(holding: int, rank: Rank) -> bool:
+    return bool(holding >> (rank.value[0] - 2) & 1)
+
+
+def _losers(holding: int, length: int) -> int:
+    """Losing Trick Count: only the top min(length, 3) cards are considered and each missing A, K, or Q is a loser"""
+    counted = min(length, 3)
+    top_honors = [Rank.ACE, Rank.KING, Rank.QUEEN][:counted]
+    return counted - sum(_has(holding, rank) for rank in top_honors)
+
+
+def _quick_tricks(holding: int, length: int) -> int:
+    """:return: Quick tricks counted in half tricks. AK=2, AQ=1.5, A=1, KQ=1, Kx=0.5"""
+    ace, king, queen = _has(holding, Rank.ACE), _has(holding, Rank.KING), _has(holding, Rank.QUEEN)
+    if ace and king:
+        return 4
+    if ace and queen:
+        return 3
+    if ace or (king and queen):
+        return 2
+    if king and length >= 2:
+        return 1
+    return 0
+
+
+def _suit_quality(holding: int, length: int) -> int:
+    """Suit Quality Test: the suit length plus the number of A, K, Q, J, and T held"""
+    return length + sum(_has(holding, rank) for rank in [Rank.ACE, Rank.KING, Rank.QUEEN, Rank.JACK, Rank.TEN])
+
+
+_LENGTH = bytes(bitboard.popcount(holding) for holding in _HOLDINGS)
+_HCP = bytes(bitboard.count_hcp(holding) for holding in _HOLDINGS)
+_CONTROLS = bytes(2 * _has(holding, Rank.ACE) + _has(holding, Rank.KING) for holding in _HOLDINGS)
+_LOSERS = bytes(_losers(holding, _LENGTH[holding]) for holding in _HOLDINGS)
+_QUICK_TRICKS = bytes(_quick_tricks(holding, _LENGTH[holding]) for holding in _HOLDINGS)
+_SUIT_QUALITY = bytes(_suit_quality(holding, _LENGTH[holding]) for holding in _HOLDINGS)
+
+
+@dataclass(frozen=True)
+class HandEvaluation:
+    """
+    Evaluation of a single hand. Per-suit values are in descending suit order (Spades, Hearts, Diamonds, Clubs) to
+    match calculate_shape. Quick tricks are counted in half tricks.
+    """
+
+    hcp: int
+    controls: int
+    losers: int
+    quick_tricks: int
+    suit_lengths: Tuple[int, int, int, int]
+    sorted_shape: Tuple[int, int, int, int]
+    suit_quality: Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class HandEvaluations:
+    """
+    Columnar evaluations for every seat of a DealArray. Scalar columns hold 4 bytes per deal in Direction.value order.
+    Per-suit columns hold 16 bytes per deal: 4 per Direction, each in descending suit order.
+    """
+
+    hcp: bytes
+    controls: bytes
+    losers: bytes
+    quick_tricks: bytes
+    suit_lengths: bytes
+    sorted_shape: bytes
+    suit_quality: bytes
+
+    def __len__(self) -> int:
+        return len(self.hcp) // 4
+
+    def hand(self, deal_index: int, direction: Direction) -> HandEvaluation:
+        seat_index = deal_index * 4 + direction.value
+        suit_slice = slice(seat_index * 4, seat_index * 4 + 4)
+        return HandEvaluation(
+            hcp=self.hcp[seat_index],
+            controls=self.controls[seat_index],
+            losers=self.losers[seat_index],
+            quick_tricks=self.quick_tricks[seat_index],
+            suit_lengths=tuple(self.suit_lengths[suit_slice]),
+            sorted_shape=tuple(self.sorted_shape[suit_slice]),
+            suit_quality=tuple(self.suit_quality[suit_slice]),
+        )
+
+
+def evaluate_hand(bits: int) -> HandEvaluation:
+    """:param bits: a bitboard holding"""
+    holdings = [bits >> shift & bitboard.SUIT_MASK for shift in _SUIT_SHIFTS]
+    suit_lengths = tuple(_LENGTH[holding] for holding in holdings)
+    return HandEvaluation(
+        hcp=sum(_HCP[holding] for holding in holdings),
+        controls=sum(_CONTROLS[holding] for holding in holdings),
+        losers=sum(_LOSERS[holding] for holding in holdings),
+        quick_tricks=sum(_QUICK_TRICKS[holding] for holding in holdings),
+        suit_lengths=suit_lengths,
+        sorted_shape=tuple(sorted(suit_lengths, reverse=True)),
+        suit_quality=tuple(_SUIT_QUALITY[holding] for holding in holdings),
+    )
+
+
+def evaluate_hands(deal_array: DealArray) -> HandEvaluations:
+    """
+    Evaluate every seat of every deal in a single pass
+    """
+    hcp = bytearray()
+    controls = bytearray()
+    losers = bytearray()
+    quick_tricks = bytearray()
+    suit_lengths = bytearray()
+    sorted_shape = bytearray()
+    suit_quality = bytearray()
+    spades_shift, hearts_shift, diamonds_shift, clubs_shift = _SUIT_SHIFTS
+    suit_mask = bitboard.SUIT_MASK
+    for deal_index in range(len(deal_array)):
+        for bits in deal_array.bitboards(deal_index):
+            spades = bits >> spades_shift & suit_mask
+            hearts = bits >> hearts_shift & suit_mask
+            diamonds = bits >> diamonds_shift & suit_mask
+            clubs = bits >> clubs_shift & suit_mask
+            hcp.append(_HCP[spades] + _HCP[hearts] + _HCP[diamonds] + _HCP[clubs])
+            controls.append(_CONTROLS[spades] + _CONTROLS[hearts] + _CONTROLS[diamonds] + _CONTROLS[clubs])
+            losers.append(_LOSERS[spades] + _LOSERS[hearts] + _LOSERS[diamonds] + _LOSERS[clubs])
+            quick_tricks.append(
+                _QUICK_TRICKS[spades] + _QUICK_TRICKS[hearts] + _QUICK_TRICKS[diamonds] + _QUICK_TRICKS[clubs]
+            )
+            lengths = (_LENGTH[spades], _LENGTH[hearts], _LENGTH[diamonds], _LENGTH[clubs])
+            suit_lengths += bytes(lengths)
+            sorted_shape += bytes(sorted(lengths, reverse=True))
+            suit_quality += bytes(
+                (_SUIT_QUALITY[spades], _SUIT_QUALITY[hearts], _SUIT_QUALITY[diamonds], _SUIT_QUALITY[clubs])
+            )
+    return HandEvaluations(
+        hcp=bytes(hcp),
+        controls=bytes(controls),
+        losers=bytes(losers),
+        quick_tricks=bytes(quick_tricks),
+        suit_lengths=bytes(suit_lengths),
+        sorted_shape=bytes(sorted_shape),
+        suit_quality=bytes(suit_quality),
+    )
@@ -3,19 +3,33 @@ import re
 import urllib.parse
 from collections import defaultdict
 from enum import Enum
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
 from urllib import parse
 
-from bridgebots.bids import canonicalize_bid
-from bridgebots.board_record import BidMetadata, BoardRecord, Commentary, Contract, DealRecord
+from bridgebots.auction import AuctionState
+from bridgebots.bids import LEGAL_BIDS, canonicalize_bid
+from bridgebots.board_record import BidMetadata, BoardRecord, Commentary, Contract, DealRecord, LazyBoardRecord
 from bridgebots.deal import Card, Deal, PlayerHand
 from bridgebots.deal_enums import BiddingSuit, Direction, Suit
-from bridgebots.deal_utils import _EW_VULNERABLE_STRINGS, _NS_VULNERABLE_STRINGS, from_lin_deal, parse_lin_holding
-from bridgebots.play_utils import trick_evaluator
+from bridgebots.deal_utils import (
+    _EW_VULNERABLE_STRINGS,
+    _NS_VULNERABLE_STRINGS,
+    _lin_holding_str,
+    from_lin_deal,
+    parse_lin_holding,
+)
+from bridgebots.play_utils import replay_tricks
 
 _BID_TRANSLATION = {"PASS": "p", "DBL": "d", "RDBL": "r"}
 _PASS_OUT_AUCTION = ["PASS"] * 4
+# LIN spellings of canonical bids
+_LIN_BIDS = {bid: _BID_TRANSLATION.get(bid, bid).replace("NT", "N") for bid in LEGAL_BIDS}
+_LIN_DIRECTION_ORDER = [Direction.SOUTH, Direction.WEST, Direction.NORTH, Direction.EAST]
+# Keyed by (ns_vulnerable, ew_vulnerable)
+_LIN_VULNERABILITY_STRS = {(True, True): "b", (False, True): "e", (True, False): "n", (False, False): "o"}
+_NON_WHITESPACE = re.compile(r"\S")
 
 
 def _parse_lin_nodes(lin_str: str) -> Dict:
@@ -26,8 +40,16 @@ def _parse_lin_nodes(lin_str: str) -> Dict:
     :return: A dictionary containing parsed LIN nodes
     """
     lin_dict = defaultdict(list)
-    while not (lin_str.isspace() or lin_str == ""):
-        key, value, lin_str = lin_str.split("|", maxsplit=2)
+    # Scan with indexes rather than re-splitting the remainder of the string for every node
+    position = 0
+    while _NON_WHITESPACE.search(lin_str, position):
+        key_end = lin_str.find("|", position)
+        value_end = lin_str.find("|", key_end + 1) if key_end != -1 else -1
+        if value_end == -1:
+            raise ValueError(f"Malformed LIN node: {lin_str[position:]}")
+        key = lin_str[position:key_end]
+        value = lin_str[key_end + 1 : value_end]
+        position = value_end + 1
         if key == "an":  # Bid explanation node
             lin_dict[key].append((len(lin_dict["mb"]) - 1, value))  # Track which bid this announcement applies to
         elif key == "nt":  # Commentary node
@@ -57,9 +79,28 @@ def _parse_deal(lin_dict: dict) -> Deal:
         raise ValueError(f"Invalid dealer, vulnerability, or holding: {lin_dict}") from e
 
 
-def _parse_bidding_record(raw_bidding_record: List[str], lin_dict: Dict) -> Tuple[List[str], List[BidMetadata], str]:
+def _scan_contract(bidding_record: List[str]) -> str:
+    """
+    Read the contract of an auction assumed to end with three passes, without checking that its bids are legal
+    """
+    contract = bidding_record[-4]
+    if contract in ["X", "XX"]:
+        # Loop backwards until we find the first contractual bid
+        for i in range(len(bidding_record) - 5, -1, -1):
+            if bidding_record[i] not in ["X", "PASS"]:
+                contract = bidding_record[i] + contract
+                break
+    return contract
+
+
+def _parse_bidding_record(
+    raw_bidding_record: List[str], lin_dict: Dict, strict: bool = False
+) -> Tuple[List[str], List[BidMetadata], str]:
     """
     Convert LIN bids to their bridgebots representation. Create BiddingMetadata to capture alerts and bid explanations.
+    :param strict: Raise a ValueError if the auction contains an illegal bid or does not end with three passes.
+    Otherwise the contract of an illegal auction is read from its final bids, and an unfinished auction has the
+    contract reached so far
     :return: A pair of the parsed bidding record and the list of BiddingMetadata associated with the auction
     """
     bidding_record = []
@@ -76,14 +117,18 @@ def _parse_bidding_record(raw_bidding_record: List[str], lin_dict: Dict) -> Tupl
 
     if len(bidding_record) < 4:
         raise ValueError("auctions must have 4+ bids")
-    contract = bidding_record[-4]
-    if contract in ["X", "XX"]:
-        # Loop backwards until we find the first contractual bid
-        for i in range(len(bidding_record) - 5, -1, -1):
-            if bidding_record[i] not in ["X", "PASS"]:
-                contract = bidding_record[i] + contract
-                break
-    return bidding_record, bidding_metadata, contract
+    # The dealer only affects the auction's declarer. LIN declarers are determined from the opening lead instead
+    auction_state = AuctionState(Direction.NORTH)
+    try:
+        for bid in bidding_record:
+            auction_state.add_bid(bid)
+    except ValueError:
+        if strict:
+            raise
+        return bidding_record, bidding_metadata, _scan_contract(bidding_record)
+    if strict and not auction_state.finished:
+        raise ValueError(f"auction did not end with three passes: {bidding_record}")
+    return bidding_record, bidding_metadata, str(auction_state.contract)
 
 
 def _determine_declarer(play_record: List[Card], bidding_record: List[str], deal: Deal) -> Direction:
@@ -98,7 +143,7 @@ def _determine_declarer(play_record: List[Card], bidding_record: List[str], deal
         raise ValueError(f"Missing play record")
 
     first_card = play_record[0]
-    leader = next(direction for direction in Direction if first_card in deal.player_cards[direction])
+    leader = next(direction for direction in Direction if first_card in deal.hands[direction])
     return leader.previous()
 
 
@@ -122,17 +167,8 @@ def _parse_tricks(
         raise ValueError(f"Not enough cards played: {len(play_record)}")
 
     trump_suit = BiddingSuit.from_str(contract[1:2])
-    tricks = [play_record[i : i + 4] for i in range(0, 52, 4)]
-    lead_direction = declarer.next()
-    offense_directions = [declarer, declarer.partner()]
-    offense_tricks = 0
-    for trick in tricks:
-        evaluator = trick_evaluator(trump_suit, trick[0].suit)
-        winning_index, winning_card = max(enumerate(trick), key=lambda c: evaluator(c[1]))
-        lead_direction = Direction((lead_direction.value + winning_index) % 4)
-        if lead_direction in offense_directions:
-            offense_tricks += 1
-    return offense_tricks
+    trick_replay = replay_tricks([card.index for card in play_record], trump_suit, declarer.next())
+    return trick_replay.tricks_taken(declarer)
 
 
 def _parse_player_names(lin_dict: Dict) -> Dict[Direction, str]:
@@ -166,17 +202,90 @@ def _parse_board_name(lin_dict: Dict) -> Optional[str]:
     return None
 
 
-def _parse_board_record(lin_dict: Dict, deal: Deal) -> BoardRecord:
+class _DeferredLinNodes:
+    """
+    The complete node dict of a board whose play section has not been tokenized. Shared by the loaders of a
+    LazyBoardRecord, so the board string is tokenized at most once no matter which deferred field is accessed first
+    """
+
+    def __init__(self, lin_str: str, first_card_str: str):
+        self.lin_str = lin_str
+        self.first_card_str = first_card_str
+        self._lin_dict = None
+
+    @property
+    def lin_dict(self) -> Dict:
+        if self._lin_dict is None:
+            self._lin_dict = _parse_lin_nodes(self.lin_str)
+        return self._lin_dict
+
+
+def _parse_board_nodes(lin_str: str, lazy: bool) -> Tuple[Dict, Optional[_DeferredLinNodes]]:
+    """
+    :param lazy: If True, only tokenize the nodes before the first played card
+    :return: The node dict, and the deferred nodes of the board if its play section was skipped
+    """
+    play_start = lin_str.find("|pc|") + 1
+    if lazy and play_start > 0:
+        try:
+            lin_dict = _parse_lin_nodes(lin_str[:play_start])
+            first_card_end = lin_str.find("|", play_start + 3)
+            return lin_dict, _DeferredLinNodes(lin_str, lin_str[play_start + 3 : first_card_end])
+        except ValueError:
+            pass  # "pc" was the value of a node rather than a key. Tokenize the whole board
+    return _parse_lin_nodes(lin_str), None
+
+
+def _deferred_play_record(lin_nodes: _DeferredLinNodes, board_record: BoardRecord) -> List[Card]:
+    return [Card.from_str(cs) for cs in lin_nodes.lin_dict["pc"]]
+
+
+def _deferred_tricks(lin_nodes: _DeferredLinNodes, contract: str, board_record: BoardRecord) -> int:
+    return _parse_tricks(lin_nodes.lin_dict, board_record.declarer, contract, board_record.play_record)
+
+
+def _deferred_commentary(lin_nodes: _DeferredLinNodes, board_record: BoardRecord) -> Optional[List[Commentary]]:
+    return lin_nodes.lin_dict.get("nt")
+
+
+def _parse_board_record(
+    lin_dict: Dict, deal: Deal, deferred_nodes: Optional[_DeferredLinNodes] = None, strict: bool = False
+) -> BoardRecord:
     """
     Construct a BoardRecord object from the parsed lin_dict and deal
+    :param deferred_nodes: If provided, return a LazyBoardRecord which decodes the play record, tricks, commentary, and
+    score from the deferred nodes on first access
+    :param strict: Reject illegal and unfinished auctions. See _parse_bidding_record
     """
     player_names = _parse_player_names(lin_dict)
     raw_bidding_record = lin_dict["mb"]
-    bidding_record, bidding_metadata, contract = _parse_bidding_record(raw_bidding_record, lin_dict)
+    bidding_record, bidding_metadata, contract = _parse_bidding_record(raw_bidding_record, lin_dict, strict)
+    board_name = _parse_board_name(lin_dict)
+    if deferred_nodes:
+        # Only the opening lead is needed to determine the declarer
+        declarer = _determine_declarer([Card.from_str(deferred_nodes.first_card_str)], bidding_record, deal)
+        return LazyBoardRecord(
+            loaders={
+                "play_record": partial(_deferred_play_record, deferred_nodes),
+                "tricks": partial(_deferred_tricks, deferred_nodes, contract),
+                "commentary": partial(_deferred_commentary, deferred_nodes),
+            },
+            bidding_record=bidding_record,
+            raw_bidding_record=raw_bidding_record,
+            declarer=declarer,
+            contract=Contract.from_str(contract),
+            declarer_vulnerable=deal.is_vulnerable(declarer),
+            scoring=None,
+            names=player_names,
+            date=None,
+            event=None,
+            bidding_metadata=bidding_metadata,
+            board_name=board_name,
+        )
+
     play_record = [Card.from_str(cs) for cs in lin_dict["pc"]]
     declarer = _determine_declarer(play_record, bidding_record, deal)
     tricks = _parse_tricks(lin_dict, declarer, contract, play_record)
-    board_name = _parse_board_name(lin_dict)
 
     return BoardRecord(
         bidding_record=bidding_record,
@@ -206,19 +315,17 @@ def _build_bidding_str(board_record: BoardRecord) -> str:
         if board_record.bidding_metadata
         else {}
     )
-    bidding_str = ""
+    bidding_parts = []
     for bid_index, bid in enumerate(board_record.bidding_record):
-        translated_bid = _BID_TRANSLATION.get(bid, bid).replace("NT", "N")
-        explanation_str = ""
-        if bid_index in metadata_by_index:
-            bid_metadata = metadata_by_index.get(bid_index)
-            if bid_metadata.alerted:
-                translated_bid += "!"
-            if bid_metadata.explanation is not None:
-                explanation_str = f"an|{bid_metadata.explanation}|"
-        bidding_str += f"mb|{translated_bid}|{explanation_str}"
-    bidding_str += "pg||"
-    return bidding_str
+        translated_bid = _LIN_BIDS.get(bid) or _BID_TRANSLATION.get(bid, bid).replace("NT", "N")
+        bid_metadata = metadata_by_index.get(bid_index)
+        if bid_metadata and bid_metadata.alerted:
+            translated_bid += "!"
+        bidding_parts.append(f"mb|{translated_bid}|")
+        if bid_metadata and bid_metadata.explanation is not None:
+            bidding_parts.append(f"an|{bid_metadata.explanation}|")
+    bidding_parts.append("pg||")
+    return "".join(bidding_parts)
 
 
 def _build_play_str(board_record: BoardRecord) -> str:
@@ -226,17 +333,15 @@ def _build_play_str(board_record: BoardRecord) -> str:
     Construct the play record section of a LIN file. If fewer than 52 cards were played, include a claim node to
     indicate the final result.
     """
-    play_str = ""
-    trick_count = 0
+    play_parts = []
     # Separate each trick with a pg node
-    for card in board_record.play_record:
-        play_str += f"pc|{card}|"
-        trick_count = (trick_count + 1) % 4
-        if trick_count == 0:
-            play_str += "pg||"
+    for play_count, card in enumerate(board_record.play_record, 1):
+        play_parts.append(f"pc|{card}|")
+        if play_count % 4 == 0:
+            play_parts.append("pg||")
     if len(board_record.play_record) < 52:
-        play_str += f"mc|{board_record.tricks}|"
-    return play_str
+        play_parts.append(f"mc|{board_record.tricks}|")
+    return "".join(play_parts)
 
 
 def _build_board_name(board_name: Optional[str]) -> str:
@@ -265,28 +370,31 @@ def _combine_header(file) -> str:
     raise ValueError(f"Invalid multi-lin header in file: {file}")
 
 
-def parse_lin_str(lin_str: str) -> List[DealRecord]:
+def parse_lin_str(lin_str: str, lazy: bool = False, strict: bool = False) -> List[DealRecord]:
     """
     Parse a board-per-lin lin str
     :param lin_str: lin data
+    :param lazy: If True, decode each board's play record, tricks, commentary, and score on first access. See LazyBoardRecord
+    :param strict: If True, raise a ValueError for a board with an illegal or unfinished auction
     :return: Collected list of DealRecords each of which has a BoardRecord for each occurrence of a deal
     """
     # Maintain a mapping from deal to board records to create a single deal record per deal
     records = defaultdict(list)
     for line in lin_str.splitlines():
-        lin_dict = _parse_lin_nodes(line)
+        lin_dict, deferred_nodes = _parse_board_nodes(line, lazy)
         deal = _parse_deal(lin_dict)
-        board_record = _parse_board_record(lin_dict, deal)
+        board_record = _parse_board_record(lin_dict, deal, deferred_nodes, strict)
         records[deal].append(board_record)
     return [DealRecord(deal, board_records) for deal, board_records in records.items()]
 
 
-def parse_handviewer_url(handviewer_url: str) -> DealRecord:
+def parse_handviewer_url(handviewer_url: str, strict: bool = False) -> DealRecord:
     """
     :param handviewer_url: BBo handviewer url like
     https://www.bridgebase.com/tools/handviewer.html?n=SKHAKJ82DAQ96CK52&e=SAQ972H97DJ10CQJ103&s=S8643HQ10DK75CA976&w
     =SJ105H6543D8432C84&d=S&nn=Jeff_Meckstroth&en=Christian_Mari&sn=Eric_Rodwell&wn=Alain_Levy&b=7&v=b&a
     =PP1C1S2SP3HP3SP4DP4HPPP&p=CQC6C8CKH2H7HQH3HTH4H8H9D5D4DADJHAS2S3H5HKS7S4H6D6DTDKD2D7D3DQC3D9S9S6D8HJSQ
+    :param strict: If True, raise a ValueError if the auction is illegal or unfinished
     :return: parsed DealRecord. Since claims are not included in these urls the score/tricks fields are not set
     """
     handiewer_data = handviewer_url.replace("https://www.bridgebase.com/tools/handviewer.html?", "")
@@ -316,7 +424,7 @@ def parse_handviewer_url(handviewer_url: str) -> DealRecord:
         return bidding_record_list
 
     raw_bidding_record = split_bidding_record(handviewer_dict["a"])
-    bidding_record, bidding_metadata, contract = _parse_bidding_record(raw_bidding_record, {})
+    bidding_record, bidding_metadata, contract = _parse_bidding_record(raw_bidding_record, {}, strict)
     raw_play_record = handviewer_dict["p"]
     play_record = [Card.from_str(raw_play_record[i : i + 2]) for i in range(0, len(raw_play_record), 2)]
     declarer = _determine_declarer(play_record, bidding_record, deal)
@@ -341,50 +449,86 @@ def parse_handviewer_url(handviewer_url: str) -> DealRecord:
     return deal_record
 
 
-def parse_single_lin(file_path: Path) -> List[DealRecord]:
+def parse_single_lin(file_path: Path, lazy: bool = False, strict: bool = False) -> List[DealRecord]:
     """
     Parse a board-per-line LIN file
     :param file_path: path to single-board LIN file
+    :param lazy: If True, decode each board's play record, tricks, commentary, and score on first access. See LazyBoardRecord
+    :param strict: If True, raise a ValueError for a board with an illegal or unfinished auction
     :return: A list of parsed DealRecords, one for each line of the LIN file
     """
     with open(file_path) as lin_file:
-        return parse_lin_str(lin_file.read())
+        return parse_lin_str(lin_file.read(), lazy, strict)
+
+
+def _parse_multi_lin_board(board_string: str, parsed_header: Dict, lazy: bool, strict: bool) -> Optional[DealRecord]:
+    """
+    :return: A DealRecord with a single BoardRecord, or None if the board is malformed
+    """
+    try:
+        lin_dict, deferred_nodes = _parse_board_nodes(board_string, lazy)
+        if "pn" in parsed_header:
+            lin_dict["pn"] = parsed_header["pn"]
+        deal = _parse_deal(lin_dict)
+        board_record = _parse_board_record(lin_dict, deal, deferred_nodes, strict)
+        return DealRecord(deal, [board_record])
+    except (ValueError, AssertionError, KeyError) as e:
+        logging.warning(f"Malformed record {board_string}: {e}")
+        return None
+
+
+def iter_lin_records(lin_file: TextIO, lazy: bool = False, strict: bool = False) -> Iterator[DealRecord]:
+    """
+    Lazily parse a multi-board session LIN from a text stream. Only one board is held in memory at a time.
+    Malformed boards are logged and skipped.
+    :param lin_file: text stream positioned at the start of a multi-board LIN
+    :param lazy: If True, decode each board's play record, tricks, commentary, and score on first access. See LazyBoardRecord
+    :param strict: If True, boards with an illegal or unfinished auction are malformed
+    :return: An iterator of DealRecords, one per board in file order. A deal played at several tables is yielded once
+    per table
+    """
+    header = _combine_header(lin_file)
+    parsed_header = _parse_lin_nodes(header)
+    board_lines = []
+    for line in lin_file:
+        if line.isspace() or line == "":
+            continue
+        # Boards are split with a qx node
+        if line.startswith("qx") and board_lines:
+            deal_record = _parse_multi_lin_board("".join(board_lines), parsed_header, lazy, strict)
+            if deal_record:
+                yield deal_record
+            board_lines = []
+        # Create single-line LIN for each record
+        board_lines.append(line.replace("\n", ""))
+    if board_lines:
+        deal_record = _parse_multi_lin_board("".join(board_lines), parsed_header, lazy, strict)
+        if deal_record:
+            yield deal_record
 
 
-def parse_multi_lin(file_path: Path) -> List[DealRecord]:
+def iter_multi_lin(file_path: Path, lazy: bool = False, strict: bool = False) -> Iterator[DealRecord]:
+    """
+    Lazily parse a multi-board session LIN file. See iter_lin_records
+    :param file_path: path to multi-board LIN file
+    """
+    with open(file_path) as lin_file:
+        yield from iter_lin_records(lin_file, lazy, strict)
+
+
+def parse_multi_lin(file_path: Path, lazy: bool = False, strict: bool = False) -> List[DealRecord]:
     """
     Parse a multi-board session LIN file
     :param file_path: path to multi-board LIN file
+    :param lazy: If True, decode each board's play record, tricks, commentary, and score on first access. See LazyBoardRecord
+    :param strict: If True, skip boards with an illegal or unfinished auction. See iter_lin_records
     :return: A list of parsed DealRecords corresponding to the session in the LIN file
     """
-    with open(file_path) as lin_file:
-        header = _combine_header(lin_file)
-        parsed_header = _parse_lin_nodes(header)
-        board_strings = []
-        board_index = -1
-        for line in lin_file:
-            if line.isspace() or line == "":
-                continue
-            # Boards are split with a qx node
-            if line.startswith("qx"):
-                board_index += 1
-                board_strings.append("")
-            board_strings[board_index] += line
-        # Create single-line LIN for each record
-        board_single_strings = [board_string.replace("\n", "") for board_string in board_strings]
-        # Maintain a mapping from deal to board records to create a single deal record per deal
-        records = defaultdict(list)
-        for board_single_string in board_single_strings:
-            try:
-                lin_dict = _parse_lin_nodes(board_single_string)
-                if "pn" in parsed_header:
-                    lin_dict["pn"] = parsed_header["pn"]
-                deal = _parse_deal(lin_dict)
-                board_record = _parse_board_record(lin_dict, deal)
-                records[deal].append(board_record)
-            except (ValueError, AssertionError, KeyError) as e:
-                logging.warning(f"Malformed record {board_single_string}: {e}")
-        return [DealRecord(deal, board_records) for deal, board_records in records.items()]
+    # Maintain a mapping from deal to board records to create a single deal record per deal
+    records = defaultdict(list)
+    for deal_record in iter_multi_lin(file_path, lazy, strict):
+        records[deal_record.deal].extend(deal_record.board_records)
+    return [DealRecord(deal, board_records) for deal, board_records in records.items()]
 
 
 class LinType(Enum):
@@ -392,53 +536,32 @@ class LinType(Enum):
     MULTI = 1
 
 
-def build_lin_str(deal: Deal, board_record: BoardRecord, lin_type: LinType = LinType.SINGLE) -> str:
+def build_lin_str(
+    deal: Deal, board_record: BoardRecord, lin_type: LinType = LinType.SINGLE, include_names: bool = False
+) -> str:
     """
     Convert a Deal and a BoardRecord to a LIN format representation
+    :param include_names: Include a player names node in a MULTI board. SINGLE boards always include player names,
+    unless the BoardRecord has none
     """
     # In LIN format (1=S, 2=W, 3=N, 4=E)
     lin_dealer = (deal.dealer.value + 2) % 4 + 1
-    holding_direction = Direction.SOUTH
-    player_holding_strings = []
-    for i in range(4):
-        player_hand = deal.hands[holding_direction]
-        player_holding_str = ""
-        # Create a string like 3SAJ983H9D98732C75 from the PlayerHolding
-        for suit in reversed(Suit):
-            player_holding_str += suit.abbreviation() + "".join(
-                [rank.abbreviation() for rank in player_hand.suits[suit]]
-            )
-        player_holding_strings.append(player_holding_str)
-        holding_direction = holding_direction.next()
-    if deal.ew_vulnerable and deal.ns_vulnerable:
-        vuln_str = "b"
-    elif deal.ew_vulnerable:
-        vuln_str = "e"
-    elif deal.ns_vulnerable:
-        vuln_str = "n"
-    else:
-        vuln_str = "o"
-
-    bidding_str = _build_bidding_str(board_record)
-    play_str = _build_play_str(board_record)
-    lin_board_name = _build_board_name(board_record.board_name)
+    player_holding_strings = [_lin_holding_str(deal.hands[direction].bits) for direction in _LIN_DIRECTION_ORDER]
+    vuln_str = _LIN_VULNERABILITY_STRS[deal.ns_vulnerable, deal.ew_vulnerable]
     names = board_record.names
 
-    if lin_type == LinType.SINGLE:
-        lin_str = ""
-        lin_str += (
-            f"pn|{names[Direction.SOUTH]},{names[Direction.WEST]},{names[Direction.NORTH]},{names[Direction.EAST]}|"
-        )
-    else:
-        lin_str = "qx"
-        lin_str += f"|{board_record.board_name}|"
-    lin_str += f"st||md|{lin_dealer}{','.join(player_holding_strings)}|"
-    lin_str += lin_board_name
-    lin_str += f"sv|{vuln_str}|"
-    lin_str += bidding_str
-    lin_str += play_str
-    lin_str += "pg||"
-    return lin_str
+    lin_parts = []
+    if lin_type != LinType.SINGLE:
+        lin_parts.append(f"qx|{board_record.board_name}|")
+    if names is not None and (lin_type == LinType.SINGLE or include_names):
+        lin_parts.append(f"pn|{','.join(str(names[direction]) for direction in _LIN_DIRECTION_ORDER)}|")
+    lin_parts.append(f"st||md|{lin_dealer}{','.join(player_holding_strings)}|")
+    lin_parts.append(_build_board_name(board_record.board_name))
+    lin_parts.append(f"sv|{vuln_str}|")
+    lin_parts.append(_build_bidding_str(board_record))
+    lin_parts.append(_build_play_str(board_record))
+    lin_parts.append("pg||")
+    return "".join(lin_parts)
 
 
 def build_lin_url(deal: Deal, board_record: BoardRecord) -> str:
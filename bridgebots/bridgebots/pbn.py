@@ -2,37 +2,50 @@ import dataclasses
 import logging
 import re
 from collections import defaultdict
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
 
 from bridgebots.bids import canonicalize_bid
-from bridgebots.board_record import BidMetadata, BoardRecord, Contract, DealRecord
+from bridgebots.board_record import BidMetadata, BoardRecord, Contract, DealRecord, LazyBoardRecord
 from bridgebots.deal import Card, Deal
 from bridgebots.deal_enums import BiddingSuit, Direction
-from bridgebots.deal_utils import from_pbn_deal
-from bridgebots.play_utils import trick_evaluator
+from bridgebots.deal_utils import from_pbn_deal, to_pbn_deal
+from bridgebots.play_utils import replay_tricks, trick_winner
 
 
-def _split_pbn(file_path: Path) -> List[List[str]]:
+_READ_SIZE = 1 << 16
+# Keyed by (ns_vulnerable, ew_vulnerable)
+_PBN_VULNERABILITY_STRS = {(True, True): "All", (False, True): "EW", (True, False): "NS", (False, False): "None"}
+_PBN_BIDS = {"PASS": "Pass"}
+
+
+def _split_pbn(pbn_file: TextIO) -> Iterator[List[str]]:
     """
-    Read in the entire PBN file. Split on lines consisting of '*\n' into a list of strings per board
-    :param file_path: path to PBN file
-    :return:
+    Split a PBN stream on blank lines into a list of lines per board. The stream is read in fixed size blocks so only
+    the current board is held in memory
+    :param pbn_file: PBN text stream
+    :return: An iterator of the lines of each board record
     """
-    with open(file_path, "r") as pbn_file:
-        records = []
-        current_record = ""
-        while True:
-            line = pbn_file.readline()
-            if line == "":  # EOF
-                if current_record:
-                    records.append(current_record)
-                return records
-            elif line == "\n":  # End of Board Record
-                records.append(current_record.splitlines())
-                current_record = ""
+    record_lines = []
+    partial_line = ""
+    while True:
+        block = pbn_file.read(_READ_SIZE)
+        if block == "":  # EOF
+            break
+        lines = (partial_line + block).split("\n")
+        partial_line = lines.pop()  # The last line continues in the next block
+        for line in lines:
+            if line == "":  # End of Board Record
+                if record_lines:
+                    yield record_lines
+                record_lines = []
             else:
-                current_record += line
+                record_lines.append(line)
+    if partial_line:
+        record_lines.append(partial_line)
+    if record_lines:
+        yield record_lines
 
 
 def _build_record_dict(record_strings: List[str]) -> Dict:
@@ -201,8 +214,7 @@ def _sort_play_record(trick_records: List[List[str]], contract: str) -> List[Car
                     trick_cards.append(card)
             # 4 cards played to trick. Determine the winning index relative to the column on lead
             if len(trick_cards) == 4:
-                evaluator = trick_evaluator(trump_suit, trick_cards[0].suit)
-                winning_index, winning_card = max(enumerate(trick_cards), key=lambda c: evaluator(c[1]))
+                winning_index = trick_winner([card.index for card in trick_cards], trump_suit)
                 start_index = (start_index + winning_index) % 4  # wrap-around to first column if necessary
         return play_record
     except (IndexError, KeyError) as e:
@@ -210,10 +222,15 @@ def _sort_play_record(trick_records: List[List[str]], contract: str) -> List[Car
         return []
 
 
-def _parse_board_record(record_dict: Dict, deal: Deal) -> BoardRecord:
+def _deferred_play_record(trick_records: List[List[str]], contract: str, board_record: BoardRecord) -> List[Card]:
+    return _sort_play_record(trick_records, contract)
+
+
+def _parse_board_record(record_dict: Dict, deal: Deal, lazy: bool = False) -> BoardRecord:
     """
     Convert the record dictionary to a BoardRecord
     :param record_dict: mapping of PBN keys to deal or board information
+    :param lazy: If True, return a LazyBoardRecord which orders the play record on first access
     :return: BoardRecord representing the people and actions at the table
     """
     declarer_str = record_dict["Declarer"]
@@ -221,7 +238,11 @@ def _parse_board_record(record_dict: Dict, deal: Deal) -> BoardRecord:
     raw_bidding_record = record_dict.get("bidding_record") or []
     bidding_record, bidding_metadata = _parse_bidding_record(raw_bidding_record, record_dict)
     play_record_strings = record_dict.get("play_record") or []
-    play_record = _sort_play_record(play_record_strings, record_dict["Contract"])
+    if lazy:
+        loaders = {"play_record": partial(_deferred_play_record, play_record_strings, record_dict["Contract"])}
+        play_record_fields = {"loaders": loaders}
+    else:
+        play_record_fields = {"play_record": _sort_play_record(play_record_strings, record_dict["Contract"])}
 
     result_str = record_dict.get("Result")
     if not result_str:
@@ -242,10 +263,11 @@ def _parse_board_record(record_dict: Dict, deal: Deal) -> BoardRecord:
         Direction.WEST: record_dict.get("West"),
     }
 
-    return BoardRecord(
+    board_record_class = LazyBoardRecord if lazy else BoardRecord
+    return board_record_class(
+        **play_record_fields,
         bidding_record=bidding_record,
         raw_bidding_record=raw_bidding_record,
-        play_record=play_record,
         declarer=declarer,
         contract=Contract.from_str(contract_str),
         declarer_vulnerable=deal.is_vulnerable(declarer),
@@ -260,7 +282,9 @@ def _parse_board_record(record_dict: Dict, deal: Deal) -> BoardRecord:
     )
 
 
-def _parse_single_pbn_record(record_strings: List[str], previous_deal: Optional[Deal]) -> Tuple[Deal, BoardRecord]:
+def _parse_single_pbn_record(
+    record_strings: List[str], previous_deal: Optional[Deal], lazy: bool = False
+) -> Tuple[Deal, BoardRecord]:
     """
     :param record_strings: One string per line of a single PBN deal record
     :return: Deal and BoardRecord corresponding to the PBN record
@@ -273,28 +297,126 @@ def _parse_single_pbn_record(record_strings: List[str], previous_deal: Optional[
             deal = previous_deal
         else:
             raise ValueError("Missing deal fields and no previous_deal provided") from e
-    board_record = _parse_board_record(record_dict, deal)
+    board_record = _parse_board_record(record_dict, deal, lazy)
     return deal, board_record
 
 
-def parse_pbn(file_path: Path) -> List[DealRecord]:
+def _iter_pbn_records(pbn_file: TextIO, lazy: bool) -> Iterator[DealRecord]:
+    # Some PBNs have multiple board records per deal
+    previous_deal = None
+    for record_strings in _split_pbn(pbn_file):
+        try:
+            deal, board_record = _parse_single_pbn_record(record_strings, previous_deal, lazy)
+            previous_deal = deal
+            yield DealRecord(deal, [board_record])
+        except (KeyError, ValueError) as e:
+            logging.warning(f"Malformed record {record_strings}: {e}")
+
+
+def iter_pbn(pbn: Union[Path, str, TextIO], lazy: bool = False) -> Iterator[DealRecord]:
+    """
+    Lazily parse a PBN file or text stream. Only one board is held in memory at a time. Malformed boards are logged and
+    skipped. Only supports PBN v1.0 See https://www.tistis.nl/pbn/pbn_v10.txt
+
+    :param pbn: path to a PBN file, or a PBN text stream
+    :param lazy: If True, order each board's play record on first access. See LazyBoardRecord
+    :return: An iterator of DealRecords, one per board in file order. A deal played at several tables is yielded once
+    per table
+    """
+    if hasattr(pbn, "read"):
+        yield from _iter_pbn_records(pbn, lazy)
+    else:
+        with open(pbn, "r") as pbn_file:
+            yield from _iter_pbn_records(pbn_file, lazy)
+
+
+def parse_pbn(file_path: Path, lazy: bool = False) -> List[DealRecord]:
     """
     Split PBN file into boards then decompose those boards into Deal and BoardRecord objects. Only supports PBN v1.0
     See https://www.tistis.nl/pbn/pbn_v10.txt
 
     :param file_path: path to a PBN file
+    :param lazy: If True, order each board's play record on first access. See LazyBoardRecord
     :return: A list of DealRecords representing all the boards played
     """
-    records_strings = _split_pbn(file_path)
     # Maintain a mapping from deal to board records to create a single deal record per deal
     records = defaultdict(list)
-    # Some PBNs have multiple board records per deal
-    previous_deal = None
-    for record_strings in records_strings:
-        try:
-            deal, board_record = _parse_single_pbn_record(record_strings, previous_deal)
-            records[deal].append(board_record)
-            previous_deal = deal
-        except (KeyError, ValueError) as e:
-            logging.warning(f"Malformed record {record_strings}: {e}")
+    for deal_record in iter_pbn(file_path, lazy):
+        records[deal_record.deal].extend(deal_record.board_records)
     return [DealRecord(deal, board_records) for deal, board_records in records.items()]
+
+
+def _build_auction_lines(board_record: BoardRecord) -> Tuple[List[str], List[str]]:
+    """
+    :return: The lines of the auction section, four bids per line, and the Note tags which hold bid explanations
+    """
+    metadata_by_index = {metadata.bid_index: metadata for metadata in board_record.bidding_metadata or []}
+    bid_strs = []
+    notes = []
+    for bid_index, bid in enumerate(board_record.bidding_record):
+        bid_str = _PBN_BIDS.get(bid, bid)
+        bid_metadata = metadata_by_index.get(bid_index)
+        if bid_metadata and bid_metadata.alerted:
+            bid_str += " !"
+        if bid_metadata and bid_metadata.explanation is not None:
+            notes.append(f'[Note "{len(notes) + 1}:{bid_metadata.explanation.replace(chr(34), chr(39))}"]')
+            bid_str += f" ={len(notes)}="
+        bid_strs.append(bid_str)
+    auction_lines = [" ".join(bid_strs[line_start : line_start + 4]) for line_start in range(0, len(bid_strs), 4)]
+    return auction_lines, notes
+
+
+def _build_play_lines(board_record: BoardRecord, leader: Direction) -> List[str]:
+    """
+    PBN records each trick in columns by direction starting with the opening leader. See _sort_play_record
+    :return: One line per trick. Cards which were not played are recorded as "-"
+    """
+    play_record = board_record.play_record
+    trick_replay = replay_tricks([card.index for card in play_record], board_record.contract.suit, leader)
+    trick_leaders = trick_replay.leaders + trick_replay.winners[-1:] if trick_replay.winners else [leader]
+    play_lines = []
+    for trick_number, trick_start in enumerate(range(0, len(play_record), 4)):
+        trick_columns = ["-"] * 4
+        for position, card in enumerate(play_record[trick_start : trick_start + 4]):
+            trick_columns[(trick_leaders[trick_number].value + position - leader.value) % 4] = str(card)
+        play_lines.append(" ".join(trick_columns))
+    if len(play_record) < 52:
+        play_lines.append("*")
+    return play_lines
+
+
+def build_pbn_str(deal: Deal, board_record: BoardRecord) -> str:
+    """
+    Convert a Deal and a BoardRecord to a PBN board record. Commentary is not included
+    :return: The PBN tags and sections for the board, one per line, without a trailing blank line
+    """
+    names = board_record.names or {}
+    contract = board_record.contract
+    declarer = board_record.declarer
+    pbn_lines = [
+        f'[Event "{board_record.event or ""}"]',
+        '[Site ""]',
+        f'[Date "{board_record.date or ""}"]',
+        f'[Board "{board_record.board_name or ""}"]',
+        f'[West "{names.get(Direction.WEST) or ""}"]',
+        f'[North "{names.get(Direction.NORTH) or ""}"]',
+        f'[East "{names.get(Direction.EAST) or ""}"]',
+        f'[South "{names.get(Direction.SOUTH) or ""}"]',
+        f'[Dealer "{deal.dealer.abbreviation()}"]',
+        f'[Vulnerable "{_PBN_VULNERABILITY_STRS[deal.ns_vulnerable, deal.ew_vulnerable]}"]',
+        f'[Deal "{to_pbn_deal(deal)}"]',
+        f'[Scoring "{board_record.scoring or ""}"]',
+        f'[Declarer "{declarer.abbreviation() if declarer and contract.level > 0 else ""}"]',
+        f'[Contract "{"Pass" if contract.level == 0 else contract}"]',
+        f'[Result "{board_record.tricks}"]',
+    ]
+    if board_record.bidding_record:
+        auction_lines, notes = _build_auction_lines(board_record)
+        pbn_lines.append(f'[Auction "{deal.dealer.abbreviation()}"]')
+        pbn_lines.extend(auction_lines)
+        pbn_lines.extend(notes)
+    if contract.level > 0 and board_record.play_record:
+        leader = declarer.next()
+        pbn_lines.append(f'[Play "{leader.abbreviation()}"]')
+        pbn_lines.extend(_build_play_lines(board_record, leader))
+    return "\n".join(pbn_lines)
@@ -1,8 +1,9 @@
+from dataclasses import dataclass
 from functools import partial
-from typing import Callable, Optional
+from typing import Callable, List, Optional, Sequence
 
 from bridgebots.deal import Card
-from bridgebots.deal_enums import BiddingSuit, Suit
+from bridgebots.deal_enums import BiddingSuit, Direction, Suit
 
 
 def _evaluate_card(trump_suit: BiddingSuit, suit_led: Suit, card: Card) -> int:
@@ -26,6 +27,119 @@ def trick_evaluator(trump_suit: BiddingSuit, suit_led: Suit) -> Callable:
     return partial(_evaluate_card, trump_suit, suit_led)
 
 
+def _build_trick_ranks() -> List[List[bytes]]:
+    """
+    :return: For each trump suit (indexed by BiddingSuit value, 4 for no trump) and led suit, a table mapping card index
+    to its strength within the trick. Trumps beat the led suit and cards of any other suit have strength 0
+    """
+    trick_ranks = []
+    for trump in range(5):
+        trump_ranks = []
+        for suit_led in range(4):
+            ranks = bytearray(52)
+            for index in range(52):
+                suit, rank = divmod(index, 13)
+                if suit == trump:
+                    ranks[index] = 27 + rank
+                elif suit == suit_led:
+                    ranks[index] = 14 + rank
+            trump_ranks.append(bytes(ranks))
+        trick_ranks.append(trump_ranks)
+    return trick_ranks
+
+
+_TRICK_RANKS = _build_trick_ranks()
+_DIRECTIONS = tuple(Direction)
+
+
+def trick_winner(trick: Sequence[int], trump_suit: BiddingSuit) -> int:
+    """
+    :param trick: Card indices in the order they were played to the trick
+    :param trump_suit: Contract strain
+    :return: The position within the trick of the winning card (0 for the lead)
+    """
+    ranks = _TRICK_RANKS[trump_suit.value[0]][trick[0] // 13]
+    winning_position = 0
+    winning_rank = ranks[trick[0]]
+    for position in range(1, len(trick)):
+        rank = ranks[trick[position]]
+        if rank > winning_rank:
+            winning_position = position
+            winning_rank = rank
+    return winning_position
+
+
+@dataclass(frozen=True)
+class TrickReplay:
+    """
+    The outcome of each completed trick of a play record. ns_tricks and ew_tricks hold the running number of tricks taken
+    by each partnership after each trick
+    """
+
+    leaders: List[Direction]
+    winners: List[Direction]
+    ns_tricks: List[int]
+    ew_tricks: List[int]
+
+    def tricks_taken(self, direction: Direction) -> int:
+        """:return: the number of tricks taken by direction's partnership"""
+        running_tricks = self.ew_tricks if direction.value & 1 else self.ns_tricks
+        return running_tricks[-1] if running_tricks else 0
+
+
+def replay_tricks(
+    play_record: Sequence[int], trump_suit: BiddingSuit, leader: Direction, hands: Optional[Sequence[int]] = None
+) -> TrickReplay:
+    """
+    Replay a play record trick by trick. A trailing incomplete trick is checked against hands but has no winner
+    :param play_record: Card indices in played order
+    :param trump_suit: Contract strain
+    :param leader: The Direction on lead to the first trick
+    :param hands: Optional 52 bit holdings indexed by Direction.value (see BitboardDeal.hands). If provided, each card
+    must have been held by the player who played it and may only be played once
+    :return: The leader, winner and running trick counts of each completed trick
+    """
+    trump_ranks = _TRICK_RANKS[trump_suit.value[0]]
+    remaining = list(hands) if hands is not None else None
+    leaders = []
+    winners = []
+    ns_tricks = []
+    ew_tricks = []
+    tricks = [0, 0]
+    lead = leader.value
+    for trick_start in range(0, len(play_record), 4):
+        trick = play_record[trick_start : trick_start + 4]
+        for position, card_index in enumerate(trick):
+            if not 0 <= card_index < 52:
+                raise ValueError(f"Invalid card index {card_index} at play {trick_start + position}")
+            if remaining is not None:
+                player = (lead + position) & 3
+                card_bit = 1 << card_index
+                if not remaining[player] & card_bit:
+                    raise ValueError(
+                        f"{_DIRECTIONS[player].name} played {Card.from_index(card_index)} at play "
+                        f"{trick_start + position} but does not hold it"
+                    )
+                remaining[player] ^= card_bit
+        if len(trick) < 4:
+            break
+        ranks = trump_ranks[trick[0] // 13]
+        winning_position = 0
+        winning_rank = ranks[trick[0]]
+        for position in range(1, 4):
+            rank = ranks[trick[position]]
+            if rank > winning_rank:
+                winning_position = position
+                winning_rank = rank
+        leaders.append(_DIRECTIONS[lead])
+        lead = (lead + winning_position) & 3
+        winners.append(_DIRECTIONS[lead])
+        tricks[lead & 1] += 1
+        ns_tricks.append(tricks[0])
+        ew_tricks.append(tricks[1])
+    return TrickReplay(leaders, winners, ns_tricks, ew_tricks)
+
+
 _FIRST_TRICK_VALUE = {
     BiddingSuit.NO_TRUMP: 40,
     BiddingSuit.SPADES: 30,
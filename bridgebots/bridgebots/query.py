@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import pickle
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from bridgebots import bitboard
+from bridgebots.bids import PASS_CODE, bid_code
+from bridgebots.board_record import BoardRecord, DealRecord
+from bridgebots.deal_enums import BiddingSuit, Direction
+from bridgebots.deal_store import DealStore
+from bridgebots.hand_evaluation import evaluate_hands
+
+"""
+Query a DealStore by hand features, contract and auction metadata without decoding the corpus. CorpusIndex holds one
+row per BoardRecord. Numeric features are stored as byte columns, one byte per board, so a filter is evaluated with
+bytes.translate over whole columns and filters are combined as integer bit masks. Events and dates are held in inverted
+indexes from value to board ids.
+
+Hand feature columns are available for each Direction and for the opener and declarer of each board, prefixed with the
+seat name, e.g. north_hcp, opener_spades or declarer_shape. Shapes are indices into SHAPES. Seats which do not exist,
+such as the opener of a passed out board, hold NONE.
+"""
+
+NONE = 255
+INDEX_FILE = "query_index.pickle"
+_INDEX_VERSION = 1
+SEATS = ("north", "east", "south", "west", "opener", "declarer")
+HAND_FEATURES = ("hcp", "spades", "hearts", "diamonds", "clubs", "shape")
+# Sorted shapes, longest suit first, e.g. (4, 3, 3, 3)
+SHAPES = tuple(
+    sorted(
+        {
+            tuple(sorted((spades, hearts, diamonds, 13 - spades - hearts - diamonds), reverse=True))
+            for spades in range(14)
+            for hearts in range(14 - spades)
+            for diamonds in range(14 - spades - hearts)
+        },
+        reverse=True,
+    )
+)
+_SHAPE_INDICES = {shape: index for index, shape in enumerate(SHAPES)}
+_BOARD_FEATURES = (
+    "dealer",
+    "vulnerability",
+    "declarer",
+    "declarer_vulnerable",
+    "contract",
+    "contract_level",
+    "contract_strain",
+    "doubled",
+    "tricks",
+    "opener",
+    "opening_bid",
+)
+COLUMNS = _BOARD_FEATURES + tuple(f"{seat}_{feature}" for seat in SEATS for feature in HAND_FEATURES)
+_BID_COLUMNS = {"contract", "opening_bid"}
+_VULNERABILITY = {"none": 0, "ew": 1, "ns": 2, "both": 3}
+_BUILD_BATCH_SIZE = 4096
+
+ColumnValue = Union[int, str, bool, Direction, BiddingSuit, Tuple[int, int, int, int], None]
+
+
+def _encode_shape(shape: Union[str, Tuple[int, ...]]) -> int:
+    lengths = tuple(int(length) for length in shape.replace("-", "")) if isinstance(shape, str) else tuple(shape)
+    shape_index = _SHAPE_INDICES.get(tuple(sorted(lengths, reverse=True)))
+    if shape_index is None:
+        raise ValueError(f"Invalid shape {shape}")
+    return shape_index
+
+
+def encode_value(column: str, value: ColumnValue) -> int:
+    """
+    Convert a filter value to the byte stored in a column. Accepts Directions, BiddingSuits, bids such as "1NT" for
+    contract and opening_bid, shapes such as "5-4-3-1" for shape columns, "None"/"NS"/"EW"/"Both" for vulnerability,
+    and None for missing values
+    :raises ValueError: for an unknown column or a value which cannot be stored in it
+    """
+    if column not in COLUMNS:
+        raise ValueError(f"Unknown column {column}. Expected one of {list(COLUMNS)}")
+    if value is None:
+        return NONE
+    if isinstance(value, Direction):
+        return value.value
+    if isinstance(value, BiddingSuit):
+        return value.value[0]
+    if column.endswith("_shape"):
+        return _encode_shape(value)
+    if isinstance(value, str):
+        if column in _BID_COLUMNS and bid_code(value) is not None:
+            return bid_code(value)
+        if column == "vulnerability" and value.lower() in _VULNERABILITY:
+            return _VULNERABILITY[value.lower()]
+        raise ValueError(f"Invalid value {value} for column {column}")
+    if not 0 <= value < NONE:
+        raise ValueError(f"Invalid value {value} for column {column}")
+    return int(value)
+
+
+def _board_row(
+    hcp: bytes, suit_lengths: bytes, sorted_shape: bytes, dealer: int, vulnerability: int, board_record: BoardRecord
+) -> Dict[str, int]:
+    """
+    :param hcp: 4 bytes, the HCP of each Direction
+    :param suit_lengths: 16 bytes, the suit lengths of each Direction in descending suit order
+    :param sorted_shape: 16 bytes, the sorted shape of each Direction
+    """
+    opener = NONE
+    opening_bid = PASS_CODE
+    for position, bid in enumerate(board_record.bidding_record):
+        code = bid_code(bid)
+        if code is not None and code != PASS_CODE:
+            opener = (dealer + position) & 3
+            opening_bid = code
+            break
+    contract = board_record.contract
+    declarer = NONE if board_record.declarer is None or contract.level == 0 else board_record.declarer.value
+    declarer_vulnerable = NONE if declarer == NONE else vulnerability >> (1 - (declarer & 1)) & 1
+    row = {
+        "dealer": dealer,
+        "vulnerability": vulnerability,
+        "declarer": declarer,
+        "declarer_vulnerable": declarer_vulnerable,
+        "contract": (contract.level - 1) * 5 + contract.suit.value[0] + 1 if contract.level else PASS_CODE,
+        "contract_level": contract.level,
+        "contract_strain": NONE if contract.suit is None else contract.suit.value[0],
+        "doubled": contract.doubled,
+        "tricks": board_record.tricks,
+        "opener": opener,
+        "opening_bid": opening_bid,
+    }
+    for seat, direction in zip(SEATS, (0, 1, 2, 3, opener, declarer)):
+        if direction == NONE:
+            row.update((f"{seat}_{feature}", NONE) for feature in HAND_FEATURES)
+            continue
+        spades, hearts, diamonds, clubs = suit_lengths[direction * 4 : direction * 4 + 4]
+        row[f"{seat}_hcp"] = hcp[direction]
+        row[f"{seat}_spades"] = spades
+        row[f"{seat}_hearts"] = hearts
+        row[f"{seat}_diamonds"] = diamonds
+        row[f"{seat}_clubs"] = clubs
+        row[f"{seat}_shape"] = _SHAPE_INDICES[tuple(sorted_shape[direction * 4 : direction * 4 + 4])]
+    return row
+
+
+class BoardFilter:
+    """
+    A predicate over the boards of a CorpusIndex. Combine filters with & (and), | (or) and ~ (not)
+    """
+
+    def __init__(self, evaluate: Callable[[CorpusIndex], int]):
+        """:param evaluate: Returns a mask with the low bit of byte i set if board i matches. See CorpusIndex.mask"""
+        self.evaluate = evaluate
+
+    def __and__(self, other: BoardFilter) -> BoardFilter:
+        return BoardFilter(lambda index: self.evaluate(index) & other.evaluate(index))
+
+    def __or__(self, other: BoardFilter) -> BoardFilter:
+        return BoardFilter(lambda index: self.evaluate(index) | other.evaluate(index))
+
+    def __invert__(self) -> BoardFilter:
+        return BoardFilter(lambda index: index.all_mask ^ self.evaluate(index))
+
+    @staticmethod
+    def equals(column: str, *values: ColumnValue) -> BoardFilter:
+        """Match boards where column holds any of values. See encode_value for the accepted values"""
+        codes = {encode_value(column, value) for value in values}
+        table = bytes(code in codes for code in range(256))
+        return BoardFilter(lambda index: index.column_mask(column, table))
+
+    @staticmethod
+    def between(column: str, low: ColumnValue, high: Optional[ColumnValue] = None) -> BoardFilter:
+        """
+        Match boards where low <= column <= high. Missing values (NONE) never match
+        :param high: Defaults to no upper bound
+        """
+        low_code = encode_value(column, low)
+        high_code = NONE - 1 if high is None else encode_value(column, high)
+        table = bytes(low_code <= code <= high_code and code != NONE for code in range(256))
+        return BoardFilter(lambda index: index.column_mask(column, table))
+
+    @staticmethod
+    def event(*events: str, contains: bool = False) -> BoardFilter:
+        """
+        Match boards from any of events
+        :param contains: Match events containing any of events, ignoring case
+        """
+        return BoardFilter(lambda index: index.posting_mask("event", _matcher(events, contains)))
+
+    @staticmethod
+    def board_ids(board_ids: Iterable[int]) -> BoardFilter:
+        """Match the given boards, e.g. the results of an auction_index.AuctionIndex lookup"""
+        board_ids = array("I", board_ids)
+        return BoardFilter(lambda index: index.ids_mask([board_ids]))
+
+    @staticmethod
+    def date_between(start: Optional[str] = None, end: Optional[str] = None) -> BoardFilter:
+        """
+        Match boards dated start <= date <= end, comparing date strings. Boards without a date never match
+        :param start: Defaults to no lower bound
+        :param end: Defaults to no upper bound
+        """
+        return BoardFilter(lambda index: index.date_range_mask(start, end))
+
+
+def _matcher(values: Iterable[str], contains: bool) -> Callable[[str], bool]:
+    if contains:
+        lowered_values = [value.lower() for value in values]
+        return lambda key: any(value in key.lower() for value in lowered_values)
+    value_set = set(values)
+    return lambda key: key in value_set
+
+
+class CorpusIndex:
+    """
+    Secondary indexes over the BoardRecords of a DealStore. Boards are numbered in store order: every board of deal 0,
+    then every board of deal 1, and so on
+    """
+
+    def __init__(self, columns: Dict[str, bytes], postings: Dict[str, Dict[str, array]], board_starts: array):
+        """
+        :param columns: One byte per board for each name in COLUMNS
+        :param postings: For "event" and "date", the sorted board ids of each value
+        :param board_starts: The id of the first board of each deal, followed by the total board count
+        """
+        self.columns = columns
+        self.postings = postings
+        self.board_starts = board_starts
+        self._board_count = board_starts[-1]
+        self._sorted_dates = sorted(postings["date"])
+        self.all_mask = int.from_bytes(b"\x01" * self._board_count, "little")
+
+    @staticmethod
+    def build(deal_store: DealStore) -> CorpusIndex:
+        columns = {column: bytearray() for column in COLUMNS}
+        postings: Dict[str, Dict[str, array]] = {"event": {}, "date": {}}
+        board_starts = array("I", [0])
+        for start in range(0, len(deal_store), _BUILD_BATCH_SIZE):
+            deal_array = deal_store.deal_array(start, start + _BUILD_BATCH_SIZE)
+            evaluations = evaluate_hands(deal_array)
+            for batch_index in range(len(deal_array)):
+                hcp = evaluations.hcp[batch_index * 4 : batch_index * 4 + 4]
+                suit_lengths = evaluations.suit_lengths[batch_index * 16 : batch_index * 16 + 16]
+                sorted_shape = evaluations.sorted_shape[batch_index * 16 : batch_index * 16 + 16]
+                dealer = deal_array.dealers[batch_index]
+                vulnerability = deal_array.vulnerability[batch_index]
+                board_id = board_starts[-1]
+                for board_record in deal_store.board_records(start + batch_index):
+                    row = _board_row(hcp, suit_lengths, sorted_shape, dealer, vulnerability, board_record)
+                    for column, value in row.items():
+                        columns[column].append(value)
+                    for field, value in (("event", board_record.event), ("date", board_record.date)):
+                        if value is not None:
+                            postings[field].setdefault(value, array("I")).append(board_id)
+                    board_id += 1
+                board_starts.append(board_id)
+        return CorpusIndex({column: bytes(values) for column, values in columns.items()}, postings, board_starts)
+
+    def save(self, index_path: Path, deal_store: Optional[DealStore] = None):
+        """
+        :param deal_store: The store this index was built from. The size and modification time of its files are saved
+        in the index header so that open_corpus_index can detect changes to the store
+        """
+        header = _index_header(self.deal_count, self._board_count, deal_store)
+        with open(index_path, "wb") as index_file:
+            pickle.dump(header, index_file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump((self.columns, self.postings, self.board_starts), index_file, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(index_path: Path) -> CorpusIndex:
+        """
+        :raises ValueError: if the index was saved in an unsupported format or is incomplete
+        """
+        with open(index_path, "rb") as index_file:
+            header = pickle.load(index_file)
+            if not isinstance(header, dict) or header.get("version") != _INDEX_VERSION:
+                raise ValueError(f"Unsupported corpus index format in {index_path}")
+            corpus_index = CorpusIndex(*pickle.load(index_file))
+        if (corpus_index.deal_count, len(corpus_index)) != (header["deals"], header["boards"]):
+            raise ValueError(f"{index_path} does not match its header")
+        return corpus_index
+
+    def __len__(self) -> int:
+        return self._board_count
+
+    @property
+    def deal_count(self) -> int:
+        return len(self.board_starts) - 1
+
+    def locate(self, board_id: int) -> Tuple[int, int]:
+        """:return: The DealStore index of the board's deal and the position of the board in its board records"""
+        if not 0 <= board_id < self._board_count:
+            raise IndexError(f"Board id out of range: {board_id}")
+        deal_index = bisect.bisect_right(self.board_starts, board_id) - 1
+        return deal_index, board_id - self.board_starts[deal_index]
+
+    def column_mask(self, column: str, table: bytes) -> int:
+        """:param table: A bytes.translate table mapping each stored value to 1 if it matches, else 0"""
+        return int.from_bytes(self.columns[column].translate(table), "little")
+
+    def ids_mask(self, board_id_lists: Iterable[array]) -> int:
+        mask = bytearray(self._board_count)
+        for board_ids in board_id_lists:
+            for board_id in board_ids:
+                mask[board_id] = 1
+        return int.from_bytes(mask, "little")
+
+    def posting_mask(self, field: str, matches: Callable[[str], bool]) -> int:
+        return self.ids_mask(board_ids for value, board_ids in self.postings[field].items() if matches(value))
+
+    def date_range_mask(self, start: Optional[str], end: Optional[str]) -> int:
+        low = 0 if start is None else bisect.bisect_left(self._sorted_dates, start)
+        high = len(self._sorted_dates) if end is None else bisect.bisect_right(self._sorted_dates, end)
+        return self.ids_mask(self.postings["date"][date] for date in self._sorted_dates[low:high])
+
+    def mask(self, board_filter: BoardFilter) -> int:
+        return board_filter.evaluate(self)
+
+    def count(self, board_filter: BoardFilter) -> int:
+        return bitboard.popcount(self.mask(board_filter))
+
+    def board_ids(self, board_filter: BoardFilter, limit: Optional[int] = None) -> List[int]:
+        """:return: The ids of matching boards in ascending order, at most limit of them"""
+        mask_bytes = self.mask(board_filter).to_bytes(self._board_count, "little")
+        board_ids = []
+        board_id = mask_bytes.find(1)
+        while board_id != -1 and (limit is None or len(board_ids) < limit):
+            board_ids.append(board_id)
+            board_id = mask_bytes.find(1, board_id + 1)
+        return board_ids
+
+    def deal_records(
+        self, board_filter: BoardFilter, deal_store: DealStore, limit: Optional[int] = None
+    ) -> Iterator[DealRecord]:
+        """
+        :param deal_store: The store this index was built from
+        :return: One DealRecord per matching board, holding only that BoardRecord
+        """
+        for board_id in self.board_ids(board_filter, limit):
+            deal_index, position = self.locate(board_id)
+            yield DealRecord(deal_store.deal(deal_index), [deal_store.board_records(deal_index)[position]])
+
+
+def _index_header(deal_count: int, board_count: int, deal_store: Optional[DealStore]) -> Dict:
+    store_files = deal_store.file_stats() if deal_store is not None else None
+    return {"version": _INDEX_VERSION, "deals": deal_count, "boards": board_count, "store_files": store_files}
+
+
+def _is_current(index_path: Path, deal_store: DealStore) -> bool:
+    """:return: True if the index at index_path was saved from the store in its current state"""
+    try:
+        with open(index_path, "rb") as index_file:
+            header = pickle.load(index_file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return False
+    if not isinstance(header, dict) or "boards" not in header:
+        return False
+    return header == _index_header(len(deal_store), header["boards"], deal_store)
+
+
+def open_corpus_index(deal_store: DealStore) -> CorpusIndex:
+    """
+    Load the index saved in a DealStore directory. The index is built and saved first if it does not exist, or rebuilt
+    if the store's deal count or the size or modification time of any of its files has changed since it was saved
+    """
+    index_path = deal_store.store_path / INDEX_FILE
+    if _is_current(index_path, deal_store):
+        try:
+            return CorpusIndex.load(index_path)
+        except (ValueError, EOFError, pickle.UnpicklingError) as e:
+            logging.warning(f"Rebuilding unreadable corpus index {index_path}: {e!r}")
+    elif index_path.exists():
+        logging.info(f"Rebuilding corpus index {index_path} after the store changed")
+    corpus_index = CorpusIndex.build(deal_store)
+    corpus_index.save(index_path, deal_store)
+    return corpus_index
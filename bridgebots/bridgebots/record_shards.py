@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import json
+import pickle
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List
+
+"""
+A container of picklable records (such as DealRecords) split across several shard files, so that independent readers
+can each process a subset of the shards. A container is a directory containing:
+    shard-00000.bbr, shard-00001.bbr, ...: chunks of records. Each chunk is a little-endian uint32 length followed by a
+    zlib compressed pickled list of records
+    manifest.json: the record count of the container and the offset, length and record count of every chunk
+Chunks are assigned to shards round robin, so chunk i of the container is chunk i // shard_count of shard
+i % shard_count. Reading every shard in that order returns records in the order they were written.
+"""
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+_CHUNK_LENGTH = struct.Struct("<I")
+_DEFAULT_SHARD_COUNT = 8
+_DEFAULT_CHUNK_SIZE = 1024
+_COMPRESS_LEVEL = 6
+
+
+def shard_file_name(shard: int) -> str:
+    return f"shard-{shard:05d}.bbr"
+
+
+class ShardedRecordWriter:
+    """
+    Write records to a new sharded container. The manifest is written on close, so use as a context manager, or call
+    close() when finished. A container without a manifest is rejected by ShardedRecordReader, so if the with block
+    exits with an exception no manifest is written
+    """
+
+    def __init__(
+        self,
+        container_path: Path,
+        shard_count: int = _DEFAULT_SHARD_COUNT,
+        chunk_size: int = _DEFAULT_CHUNK_SIZE,
+        compress_level: int = _COMPRESS_LEVEL,
+    ):
+        """
+        :param container_path: Directory to write. Created if it does not exist
+        :param shard_count: Number of shard files. This is the most readers which can share the work of a container
+        :param chunk_size: Records per compressed chunk
+        :param compress_level: zlib compression level
+        """
+        if shard_count < 1 or chunk_size < 1:
+            raise ValueError(f"Invalid shard count {shard_count} or chunk size {chunk_size}")
+        container_path.mkdir(parents=True, exist_ok=True)
+        # A manifest left by an earlier container would describe the new shards until this one is closed
+        manifest_path = container_path / MANIFEST_FILE
+        if manifest_path.exists():
+            manifest_path.unlink()
+        self.container_path = container_path
+        self.chunk_size = chunk_size
+        self.compress_level = compress_level
+        self._shard_files: List[BinaryIO] = [
+            open(container_path / shard_file_name(shard), "wb") for shard in range(shard_count)
+        ]
+        self._shard_chunks: List[List[Dict[str, int]]] = [[] for _ in range(shard_count)]
+        self._shard_offsets = [0] * shard_count
+        self._chunk_count = 0
+        self._pending_records: List[Any] = []
+        self.count = 0
+
+    def write(self, record: Any):
+        self._pending_records.append(record)
+        self.count += 1
+        if len(self._pending_records) >= self.chunk_size:
+            self._flush_chunk()
+
+    def write_all(self, records: Iterable[Any]):
+        for record in records:
+            self.write(record)
+
+    def _flush_chunk(self):
+        if not self._pending_records:
+            return
+        shard = self._chunk_count % len(self._shard_files)
+        chunk = zlib.compress(pickle.dumps(self._pending_records, pickle.HIGHEST_PROTOCOL), self.compress_level)
+        self._shard_files[shard].write(_CHUNK_LENGTH.pack(len(chunk)) + chunk)
+        self._shard_chunks[shard].append(
+            {"offset": self._shard_offsets[shard], "length": len(chunk), "records": len(self._pending_records)}
+        )
+        self._shard_offsets[shard] += _CHUNK_LENGTH.size + len(chunk)
+        self._chunk_count += 1
+        self._pending_records = []
+
+    def close(self):
+        if self._shard_files[0].closed:
+            return
+        self._flush_chunk()
+        self._close_shard_files()
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "records": self.count,
+            "chunks": self._chunk_count,
+            "shards": [
+                {"file": shard_file_name(shard), "records": sum(chunk["records"] for chunk in chunks), "chunks": chunks}
+                for shard, chunks in enumerate(self._shard_chunks)
+            ],
+        }
+        with open(self.container_path / MANIFEST_FILE, "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+    def _close_shard_files(self):
+        for shard_file in self._shard_files:
+            shard_file.close()
+
+    def abort(self):
+        """
+        Close the shard files without writing the manifest, so the incomplete container cannot be read
+        """
+        self._close_shard_files()
+
+    def __enter__(self) -> ShardedRecordWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ShardedRecordReader:
+    """
+    Read a container written by ShardedRecordWriter. Readers are independent, so separate processes or machines can
+    each read a subset of the shards, e.g. with iter_worker
+    """
+
+    def __init__(self, container_path: Path):
+        """
+        :raises ValueError: if the manifest is missing, has an unknown version or does not match the shard files
+        """
+        self.container_path = container_path
+        try:
+            with open(container_path / MANIFEST_FILE, "r") as manifest_file:
+                self.manifest = json.load(manifest_file)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Invalid record container {container_path}: {e!r}") from e
+        if self.manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported record container version {self.manifest.get('version')} in {container_path}")
+        for shard_manifest in self.manifest["shards"]:
+            shard_size = sum(_CHUNK_LENGTH.size + chunk["length"] for chunk in shard_manifest["chunks"])
+            shard_path = container_path / shard_manifest["file"]
+            if not shard_path.exists() or shard_path.stat().st_size != shard_size:
+                raise ValueError(
+                    f"Invalid record container {container_path}: {shard_path.name} does not match manifest"
+                )
+
+    def __len__(self) -> int:
+        return self.manifest["records"]
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.manifest["shards"])
+
+    def shard_record_count(self, shard: int) -> int:
+        return self.manifest["shards"][shard]["records"]
+
+    def shards_for_worker(self, worker_index: int, worker_count: int) -> List[int]:
+        """:return: The shards read by one of worker_count workers. Every shard is assigned to exactly one worker"""
+        if not 0 <= worker_index < worker_count:
+            raise ValueError(f"Invalid worker {worker_index} of {worker_count}")
+        return list(range(worker_index, self.shard_count, worker_count))
+
+    def _iter_chunks(self, shard: int, shard_file: BinaryIO) -> Iterator[List[Any]]:
+        for chunk in self.manifest["shards"][shard]["chunks"]:
+            shard_file.seek(chunk["offset"] + _CHUNK_LENGTH.size)
+            yield pickle.loads(zlib.decompress(shard_file.read(chunk["length"])))
+
+    def iter_shard(self, shard: int) -> Iterator[Any]:
+        """:return: The records of one shard, in the order they were written"""
+        with open(self.container_path / self.manifest["shards"][shard]["file"], "rb") as shard_file:
+            for records in self._iter_chunks(shard, shard_file):
+                yield from records
+
+    def iter_shards(self, shards: Iterable[int]) -> Iterator[Any]:
+        for shard in shards:
+            yield from self.iter_shard(shard)
+
+    def iter_worker(self, worker_index: int, worker_count: int) -> Iterator[Any]:
+        """:return: The records of the shards assigned to one of worker_count workers. See shards_for_worker"""
+        return self.iter_shards(self.shards_for_worker(worker_index, worker_count))
+
+    def __iter__(self) -> Iterator[Any]:
+        """:return: All records in the order they were written"""
+        shard_files = [open(self.container_path / shard["file"], "rb") for shard in self.manifest["shards"]]
+        try:
+            chunk_iterators = [self._iter_chunks(shard, shard_file) for shard, shard_file in enumerate(shard_files)]
+            for chunk_index in range(self.manifest["chunks"]):
+                yield from next(chunk_iterators[chunk_index % len(chunk_iterators)])
+        finally:
+            for shard_file in shard_files:
+                shard_file.close()
+
+
+def write_records(records: Iterable[Any], container_path: Path, shard_count: int = _DEFAULT_SHARD_COUNT) -> int:
+    """
+    Write records to a new sharded container. See ShardedRecordWriter
+    :return: The number of records written
+    """
+    with ShardedRecordWriter(container_path, shard_count) as writer:
+        writer.write_all(records)
+    return writer.count
+
+
+def read_records(container_path: Path, worker_index: int = 0, worker_count: int = 1) -> Iterator[Any]:
+    """
+    :return: An iterator over the records of a sharded container. With worker_count > 1, only the records of the shards
+    assigned to worker_index. See ShardedRecordReader.shards_for_worker
+    """
+    reader = ShardedRecordReader(container_path)
+    shards = reader.shards_for_worker(worker_index, worker_count)
+    return iter(reader) if worker_count == 1 else reader.iter_shards(shards)
@@ -0,0 +1,66 @@
+import unittest
+
+from bridgebots import LEGAL_BIDS, AuctionState, BiddingSuit, Contract, Direction
+
+
+class TestAuctionState(unittest.TestCase):
+    def test_opening_bids(self):
+        auction_state = AuctionState(Direction.EAST)
+        self.assertEqual(Direction.EAST, auction_state.next_bidder)
+        self.assertEqual(LEGAL_BIDS[:36], auction_state.legal_bids())
+        self.assertEqual((1 << 36) - 1, auction_state.legal_bid_mask)
+        self.assertFalse(auction_state.is_legal("X"))
+        self.assertFalse(auction_state.finished)
+
+    def test_legal_bids_after_contract(self):
+        auction_state = AuctionState.from_bidding_record(Direction.NORTH, ["1NT"])
+        self.assertEqual(["PASS", "2C"], auction_state.legal_bids()[:2])
+        self.assertTrue(auction_state.is_legal("d"))
+        self.assertFalse(auction_state.is_legal("1S"))
+        self.assertFalse(auction_state.is_legal("XX"))
+
+        auction_state.add_bid("X")
+        self.assertTrue(auction_state.is_legal("XX"))
+        self.assertFalse(auction_state.is_legal("X"))
+        auction_state.add_bid("PASS")
+        # Partner of the doubler may not redouble
+        self.assertFalse(auction_state.is_legal("XX"))
+        auction_state.add_bid("PASS")
+        self.assertTrue(auction_state.is_legal("XX"))
+
+    def test_final_contract(self):
+        bidding_record = ["PASS", "1H", "2C", "2H", "PASS", "4H", "X", "XX", "PASS", "PASS", "PASS"]
+        auction_state = AuctionState.from_bidding_record(Direction.WEST, bidding_record)
+        self.assertTrue(auction_state.finished)
+        self.assertEqual(0, auction_state.legal_bid_mask)
+        self.assertEqual(Contract(4, BiddingSuit.HEARTS, 2), auction_state.contract)
+        self.assertEqual(Direction.NORTH, auction_state.declarer)
+        self.assertEqual(11, len(auction_state))
+
+    def test_declarer_first_to_bid_strain(self):
+        bidding_record = ["1C", "PASS", "1NT", "PASS", "3NT", "PASS", "PASS", "PASS"]
+        auction_state = AuctionState.from_bidding_record(Direction.SOUTH, bidding_record)
+        self.assertEqual(Contract(3, BiddingSuit.NO_TRUMP, 0), auction_state.contract)
+        self.assertEqual(Direction.NORTH, auction_state.declarer)
+
+    def test_passed_out(self):
+        auction_state = AuctionState.from_bidding_record(Direction.SOUTH, ["PASS"] * 3)
+        self.assertFalse(auction_state.finished)
+        auction_state.add_bid("p")
+        self.assertTrue(auction_state.finished)
+        self.assertEqual(Contract(0, None, 0), auction_state.contract)
+        self.assertIsNone(auction_state.declarer)
+
+    def test_illegal_bids(self):
+        auction_state = AuctionState.from_bidding_record(Direction.NORTH, ["2S", "PASS"])
+        with self.assertRaises(ValueError):
+            auction_state.add_bid("2H")
+        with self.assertRaises(ValueError):
+            auction_state.add_bid("X")
+        with self.assertRaises(ValueError):
+            auction_state.add_bid("9C")
+        with self.assertRaises(ValueError):
+            auction_state.add_bid_code(38)
+        self.assertEqual(2, len(auction_state))
+        auction_state.add_bid_code(LEGAL_BIDS.index("3C"))
+        self.assertEqual(Contract(3, BiddingSuit.CLUBS, 0), auction_state.contract)
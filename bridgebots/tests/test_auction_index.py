@@ -0,0 +1,125 @@
+import pickle
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+from bridgebots import (
+    AuctionIndex,
+    BoardFilter,
+    CorpusIndex,
+    DealStore,
+    DealStoreWriter,
+    canonicalize_bid,
+    open_auction_index,
+    parse_multi_lin,
+    parse_pbn,
+)
+from bridgebots.auction_index import INDEX_FILE, parse_auction_prefix
+
+_RESOURCES = Path(__file__).parent / "resources"
+
+
+class TestAuctionIndex(unittest.TestCase):
+    deal_records = parse_multi_lin(_RESOURCES / "usbf_sf_14502.lin") + parse_pbn(_RESOURCES / "sample.pbn")
+    board_records = [board_record for deal_record in deal_records for board_record in deal_record.board_records]
+    auctions = [[canonicalize_bid(bid) for bid in board_record.bidding_record] for board_record in board_records]
+    auction_index = AuctionIndex.from_board_records(board_records)
+
+    def _expected_ids(self, prefix, auctions=None):
+        auctions = auctions or self.auctions
+        return [board_id for board_id, auction in enumerate(auctions) if auction[: len(prefix)] == prefix]
+
+    def test_prefix_lookup(self):
+        prefixes = {tuple(auction[:length]) for auction in self.auctions for length in range(len(auction) + 1)}
+        for prefix in map(list, prefixes):
+            expected = self._expected_ids(prefix)
+            self.assertEqual(expected, self.auction_index.board_ids(prefix))
+            self.assertEqual(len(expected), self.auction_index.count(prefix))
+        self.assertEqual([], self.auction_index.board_ids(["7NT"]))
+        self.assertEqual(len(self.board_records), self.auction_index.count([]))
+        self.assertEqual(self._expected_ids(["PASS"])[:2], self.auction_index.board_ids(["PASS"], limit=2))
+
+    def test_node(self):
+        for prefix in [[], ["PASS"], ["1S"], self.auctions[0][:3], self.auctions[0]]:
+            node = self.auction_index.node(prefix)
+            matching = [auction for auction in self.auctions if auction[: len(prefix)] == prefix]
+            continuations = Counter(auction[len(prefix)] for auction in matching if len(auction) > len(prefix))
+            self.assertEqual(prefix, node.prefix)
+            self.assertEqual(len(matching), node.count)
+            self.assertEqual(len(matching) - sum(continuations.values()), node.completed)
+            self.assertEqual(dict(continuations), node.continuations)
+            if continuations:
+                self.assertAlmostEqual(1.0, sum(node.frequencies().values()))
+        self.assertEqual(1, self.auction_index.node(self.auctions[0]).completed)
+        self.assertEqual({}, self.auction_index.node(self.auctions[0]).frequencies())
+
+    def test_from_opening_bid(self):
+        auction_index = AuctionIndex.from_board_records(self.board_records, from_opening_bid=True)
+        stripped_auctions = []
+        for auction in self.auctions:
+            opening = next((position for position, bid in enumerate(auction) if bid != "PASS"), len(auction))
+            stripped_auctions.append(auction[opening:])
+        for prefix in [["1S"], ["1NT"], ["1C", "PASS"], stripped_auctions[1][:2]]:
+            self.assertEqual(self._expected_ids(prefix, stripped_auctions), auction_index.board_ids(prefix))
+
+    def test_parse_auction_prefix(self):
+        self.assertEqual(parse_auction_prefix(["1NT", "2H", "X"]), parse_auction_prefix("1NT-(2H)-X"))
+        self.assertEqual(parse_auction_prefix(["PASS", "1N"]), parse_auction_prefix("p-1n"))
+        self.assertEqual(b"", parse_auction_prefix(""))
+        with self.assertRaises(ValueError):
+            parse_auction_prefix("1NT-(2Z)")
+
+    def test_store_and_board_filter(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = Path(temp_dir) / "store"
+            with DealStoreWriter(store_path) as writer:
+                writer.write_all(self.deal_records)
+            with DealStore(store_path) as deal_store:
+                auction_index = AuctionIndex.build(deal_store)
+                index_path = Path(temp_dir) / "auction_index.pickle"
+                auction_index.save(index_path, deal_store)
+                loaded_index = AuctionIndex.load(index_path)
+                self.assertEqual(self.auction_index.board_ids(["PASS"]), loaded_index.board_ids(["PASS"]))
+
+                corpus_index = CorpusIndex.build(deal_store)
+                board_filter = BoardFilter.board_ids(loaded_index.board_ids("PASS")) & BoardFilter.between(
+                    "north_hcp", 10
+                )
+                expected = [
+                    board_id
+                    for board_id in self._expected_ids(["PASS"])
+                    if corpus_index.columns["north_hcp"][board_id] >= 10
+                ]
+                self.assertEqual(expected, corpus_index.board_ids(board_filter))
+
+    def test_open_rebuilds_stale_index(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = Path(temp_dir) / "store"
+            with DealStoreWriter(store_path) as writer:
+                writer.write_all(self.deal_records)
+            with DealStore(store_path) as deal_store:
+                self.assertEqual(self._expected_ids(["PASS"]), open_auction_index(deal_store).board_ids("PASS"))
+                self.assertEqual(1, len(list(store_path.glob("auction_index*.pickle"))))
+
+            with DealStoreWriter(store_path) as writer:
+                writer.write_all(self.deal_records[1:])
+            auctions = self.auctions[len(self.deal_records[0].board_records) :]
+            with DealStore(store_path) as deal_store:
+                auction_index = open_auction_index(deal_store)
+                self.assertEqual(self._expected_ids(["PASS"], auctions), auction_index.board_ids("PASS"))
+                self.assertEqual(auction_index.board_ids("1NT"), open_auction_index(deal_store).board_ids("1NT"))
+
+                # Indexes pickled without a header are not loaded
+                index_path = store_path / INDEX_FILE
+                with open(index_path, "wb") as index_file:
+                    index_data = (
+                        self.auction_index.auctions,
+                        self.auction_index.offsets,
+                        self.auction_index.board_id_array,
+                        False,
+                    )
+                    pickle.dump(index_data, index_file)
+                with self.assertRaises(ValueError):
+                    AuctionIndex.load(index_path)
+                self.assertEqual(auction_index.board_ids("PASS"), open_auction_index(deal_store).board_ids("PASS"))
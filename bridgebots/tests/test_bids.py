@@ -0,0 +1,41 @@
+import unittest
+
+from bridgebots import LEGAL_BIDS, bid_code, canonicalize_bid, decode_auction, encode_auction
+
+
+class TestBids(unittest.TestCase):
+    def test_canonicalize_bid(self):
+        self.assertEqual("PASS", canonicalize_bid("p"))
+        self.assertEqual("PASS", canonicalize_bid("Pass"))
+        self.assertEqual("1NT", canonicalize_bid("1n"))
+        self.assertEqual("3NT", canonicalize_bid("3Nt!"))
+        self.assertEqual("2S", canonicalize_bid("2s!!"))
+        self.assertEqual("X", canonicalize_bid("d"))
+        self.assertEqual("X", canonicalize_bid("Dbl"))
+        self.assertEqual("XX", canonicalize_bid("r"))
+        self.assertEqual("XX", canonicalize_bid("REDBL"))
+        self.assertIsNone(canonicalize_bid("8C"))
+        self.assertIsNone(canonicalize_bid(""))
+
+    def test_bid_code(self):
+        for code, bid in enumerate(LEGAL_BIDS):
+            self.assertEqual(code, bid_code(bid))
+            self.assertEqual(code, bid_code(bid.lower() + "!"))
+        self.assertEqual(37, bid_code("xx"))
+        self.assertIsNone(bid_code("1Z"))
+
+    def test_encode_decode_auction(self):
+        raw_auction = ["p", "1c!", "d", "1n", "r", "P", "P", "P"]
+        codes = encode_auction(raw_auction)
+        self.assertEqual(bytes([0, 1, 36, 5, 37, 0, 0, 0]), codes)
+        self.assertEqual(["PASS", "1C", "X", "1NT", "XX", "PASS", "PASS", "PASS"], decode_auction(codes))
+        self.assertEqual(["7NT", "PASS"], decode_auction([35, 0]))
+        self.assertEqual(b"", encode_auction([]))
+
+    def test_invalid_auction(self):
+        with self.assertRaises(ValueError):
+            encode_auction(["1C", "1Z"])
+        with self.assertRaises(ValueError):
+            decode_auction(bytes([0, 38]))
+        with self.assertRaises(ValueError):
+            decode_auction([-1])
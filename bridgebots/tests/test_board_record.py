@@ -1,6 +1,8 @@
+import pickle
 import unittest
+from functools import partial
 
-from bridgebots import BiddingSuit, Contract
+from bridgebots import BiddingSuit, BoardRecord, Card, Contract, Direction, LazyBoardRecord
 
 
 class TestContract(unittest.TestCase):
@@ -23,3 +25,49 @@ class TestContract(unittest.TestCase):
             Contract.from_str("3")
         with self.assertRaises(ValueError):
             Contract.from_str("3Z")
+
+
+def _load_play_record(card_strs, board_record):
+    return [Card.from_str(card_str) for card_str in card_strs]
+
+
+class TestLazyBoardRecord(unittest.TestCase):
+    record_fields = dict(
+        bidding_record=["1NT", "PASS", "PASS", "PASS"],
+        raw_bidding_record=["1N", "p", "p", "p"],
+        declarer=Direction.NORTH,
+        contract=Contract.from_str("1NT"),
+        scoring=None,
+        names=None,
+        date=None,
+        event=None,
+        bidding_metadata=[],
+        commentary=None,
+    )
+
+    def test_deferred_fields(self):
+        loaders = {"play_record": partial(_load_play_record, ["HA", "H2"]), "tricks": lambda record: 8}
+        lazy_record = LazyBoardRecord(loaders, declarer_vulnerable=True, **self.record_fields)
+        self.assertNotIn("play_record", lazy_record.__dict__)
+        self.assertEqual(120, lazy_record.score)
+        self.assertIn("tricks", lazy_record.__dict__)
+        eager_record = BoardRecord(
+            play_record=[Card.from_str("HA"), Card.from_str("H2")],
+            tricks=8,
+            declarer_vulnerable=True,
+            **self.record_fields,
+        )
+        self.assertEqual(eager_record, lazy_record)
+        self.assertEqual(lazy_record, eager_record)
+        self.assertEqual(hash(eager_record), hash(lazy_record))
+
+    def test_pickle_keeps_fields_deferred(self):
+        loaders = {"play_record": partial(_load_play_record, ["HA"])}
+        lazy_record = LazyBoardRecord(loaders, tricks=7, score=90, **self.record_fields)
+        unpickled_record = pickle.loads(pickle.dumps(lazy_record))
+        self.assertNotIn("play_record", unpickled_record.__dict__)
+        self.assertEqual([Card.from_str("HA")], unpickled_record.play_record)
+
+    def test_missing_fields(self):
+        with self.assertRaises(TypeError):
+            LazyBoardRecord({}, tricks=7, score=90, **self.record_fields)
@@ -0,0 +1,85 @@
+import tempfile
+import dataclasses
+import unittest
+from pathlib import Path
+
+from bridgebots import (
+    BiddingSuit,
+    ColumnarReader,
+    ColumnarWriter,
+    Contract,
+    Deal,
+    DealRecord,
+    Direction,
+    bid_code,
+    parse_multi_lin,
+    parse_pbn,
+    read_columnar,
+    write_columnar,
+)
+from bridgebots.columnar import COLUMNS
+
+_RESOURCES = Path(__file__).parent / "resources"
+
+
+class TestColumnar(unittest.TestCase):
+    deal_records = parse_multi_lin(_RESOURCES / "usbf_sf_14502.lin") + parse_pbn(_RESOURCES / "sample.pbn")
+    board_count = sum(len(deal_record.board_records) for deal_record in deal_records)
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = Path(self.temp_dir.name) / "deals.bbc"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        write_columnar(self.deal_records, self.file_path, row_group_size=7)
+        self.assertEqual(self.deal_records, read_columnar(self.file_path))
+
+    def test_round_trip_without_names(self):
+        deal_record = self.deal_records[0]
+        board_records = [
+            dataclasses.replace(deal_record.board_records[0], names=None),
+            dataclasses.replace(deal_record.board_records[0], names={direction: None for direction in Direction}),
+        ]
+        deal_records = [DealRecord(deal_record.deal, board_records)]
+        write_columnar(deal_records, self.file_path)
+        round_tripped = read_columnar(self.file_path)
+        self.assertEqual(deal_records, round_tripped)
+        self.assertIsNone(round_tripped[0].board_records[0].names)
+        self.assertEqual({direction: None for direction in Direction}, round_tripped[0].board_records[1].names)
+
+    def test_row_groups(self):
+        with ColumnarWriter(self.file_path, row_group_size=10) as writer:
+            writer.write_all(self.deal_records)
+        with ColumnarReader(self.file_path) as reader:
+            self.assertEqual(self.board_count, len(reader))
+            self.assertEqual((self.board_count + 9) // 10, reader.row_group_count)
+            self.assertEqual(COLUMNS, list(reader.read_row_group(0)))
+            self.assertEqual(10, len(reader.read_row_group(0, ["deal"])["deal"]))
+
+    def test_projection(self):
+        write_columnar(self.deal_records, self.file_path, row_group_size=4)
+        with ColumnarReader(self.file_path) as reader:
+            columns = reader.read_columns(["deal", "contract", "doubled", "declarer", "south_name"])
+        self.assertEqual(["deal", "contract", "doubled", "declarer", "south_name"], list(columns))
+        first_board = self.deal_records[0].board_records[0]
+        self.assertIsInstance(columns["deal"][0], Deal)
+        self.assertEqual(self.deal_records[0].deal, columns["deal"][0])
+        self.assertEqual(Contract(4, BiddingSuit.HEARTS, 0), first_board.contract)
+        self.assertEqual(bid_code("4H"), columns["contract"][0])
+        self.assertEqual(first_board.declarer, Direction(columns["declarer"][0]))
+        self.assertEqual(first_board.names[Direction.SOUTH], columns["south_name"][0])
+        self.assertEqual(self.board_count, len(columns["doubled"]))
+
+    def test_invalid_column(self):
+        write_columnar(self.deal_records, self.file_path)
+        with ColumnarReader(self.file_path) as reader:
+            with self.assertRaises(KeyError):
+                reader.read_columns(["hcp"])
+
+    def test_invalid_file(self):
+        self.file_path.write_bytes(b"not a columnar file")
+        with self.assertRaises(ValueError):
+            ColumnarReader(self.file_path)
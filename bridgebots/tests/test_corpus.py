@@ -0,0 +1,40 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from bridgebots import parse_corpus, parse_multi_lin
+
+_RESOURCES = Path(__file__).parent / "resources"
+
+
+class TestParseCorpus(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.invalid_path = Path(self.temp_dir.name) / "invalid.lin"
+        self.invalid_path.write_bytes(b"\xff\xfe\x00invalid")
+        self.paths = [_RESOURCES / "usbf_sf_14502.lin", self.invalid_path, _RESOURCES / "usbf_sf_14502.lin"]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_results(self, results):
+        self.assertEqual(self.paths, [result.path for result in results])
+        self.assertIsNone(results[0].error)
+        self.assertEqual(parse_multi_lin(self.paths[0]), results[0].deal_records)
+        self.assertIn("UnicodeDecodeError", results[1].error)
+        self.assertEqual([], results[1].deal_records)
+        self.assertEqual(results[0].deal_records, results[2].deal_records)
+
+    def test_in_process(self):
+        self.check_results(list(parse_corpus(self.paths, "lin", workers=1)))
+
+    def test_process_pool(self):
+        self.check_results(list(parse_corpus(self.paths, "lin", workers=2)))
+
+    def test_pbn(self):
+        results = list(parse_corpus([_RESOURCES / "shared_deals.pbn"], "pbn", workers=1))
+        self.assertEqual(4, sum(len(deal_record.board_records) for deal_record in results[0].deal_records))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            list(parse_corpus(self.paths, "xml"))
@@ -1,6 +1,9 @@
+import copyreg
+import pickle
 import unittest
 
-from bridgebots import Card, PlayerHand, Rank, Suit
+from bridgebots import BitboardDeal, Card, Deal, Direction, PlayerHand, Rank, Suit, bitboard
+from bridgebots.deal_utils import count_hcp, from_lin_deal, serialize_deal
 
 
 class TestDeal(unittest.TestCase):
@@ -13,3 +16,139 @@ class TestDeal(unittest.TestCase):
         self.assertEqual(
             [Card(Suit.SPADES, Rank.JACK), Card(Suit.SPADES, Rank.NINE), Card(Suit.SPADES, Rank.EIGHT)], ph.cards[0:3]
         )
+
+
+class TestCard(unittest.TestCase):
+    def test_cards_are_interned(self):
+        card = Card(Suit.HEARTS, Rank.TEN)
+        self.assertIs(card, Card.from_str("HT"))
+        self.assertIs(card, Card.from_str("ht"))
+        self.assertIs(card, Card.from_index(card.index))
+        self.assertIs(card, pickle.loads(pickle.dumps(card)))
+
+    def test_legacy_pickle(self):
+        class LegacyCard:
+            # Pickles like a Card written before Cards were interned
+            def __reduce_ex__(self, protocol):
+                return copyreg._reconstructor, (Card, object, None), {"suit": Suit.HEARTS, "rank": Rank.TEN}
+
+        card = pickle.loads(pickle.dumps(LegacyCard()))
+        interned_card = Card(Suit.HEARTS, Rank.TEN)
+        self.assertIsNot(interned_card, card)
+        self.assertEqual(interned_card, card)
+        self.assertEqual(hash(interned_card), hash(card))
+        self.assertEqual("HT", str(card))
+        self.assertIs(interned_card, pickle.loads(pickle.dumps(card)))
+
+    def test_index_ordering(self):
+        self.assertEqual(0, Card.from_str("C2").index)
+        self.assertEqual(51, Card.from_str("SA").index)
+        cards = [Card(suit, rank) for suit in Suit for rank in Rank]
+        self.assertEqual(sorted(cards), sorted(cards, key=lambda c: (c.suit, c.rank)))
+
+    def test_invalid_card_str(self):
+        with self.assertRaises(KeyError):
+            Card.from_str("Z2")
+
+
+class TestBitboard(unittest.TestCase):
+    hands = {
+        Direction.NORTH: PlayerHand.from_string_lists(
+            ["7", "3"], ["A", "K"], ["K", "Q", "7", "6", "3"], ["9", "8", "6", "4"]
+        ),
+        Direction.SOUTH: PlayerHand.from_string_lists(
+            ["K", "8", "4"], ["J", "5", "2"], ["A", "9", "4"], ["A", "K", "Q", "5"]
+        ),
+        Direction.EAST: PlayerHand.from_string_lists(
+            ["A", "10"], ["Q", "8", "7", "4", "3"], ["J", "10", "8", "5", "2"], ["2"]
+        ),
+        Direction.WEST: PlayerHand.from_string_lists(
+            ["Q", "J", "9", "6", "5", "2"], ["10", "9", "6"], [], ["J", "10", "7", "3"]
+        ),
+    }
+    deal = Deal(Direction.EAST, True, False, hands)
+
+    def test_hand_round_trip(self):
+        south = self.hands[Direction.SOUTH]
+        bitboard_hand = south.to_bitboard()
+        self.assertEqual(13, len(bitboard_hand))
+        self.assertEqual(south.cards, bitboard_hand.cards)
+        self.assertEqual(south, bitboard_hand.to_player_hand())
+
+    def test_hand_evaluation(self):
+        south = self.hands[Direction.SOUTH].to_bitboard()
+        self.assertEqual(count_hcp(self.hands[Direction.SOUTH].cards), south.count_hcp())
+        self.assertEqual((3, 3, 3, 4), south.calculate_shape())
+        self.assertEqual((4, 3, 3, 3), south.calculate_shape(sort=True))
+        self.assertEqual((6, 3, 0, 4), self.hands[Direction.WEST].to_bitboard().calculate_shape())
+
+    def test_membership(self):
+        north = self.hands[Direction.NORTH].to_bitboard()
+        self.assertIn(Card(Suit.DIAMONDS, Rank.KING), north)
+        self.assertNotIn(Card(Suit.SPADES, Rank.KING), north)
+
+    def test_deal_round_trip(self):
+        bitboard_deal = self.deal.to_bitboard()
+        self.assertEqual(bitboard.FULL_DECK, sum(bitboard_deal.hands))
+        self.assertEqual(self.deal, bitboard_deal.to_deal())
+        self.assertEqual(BitboardDeal.from_deal(self.deal), bitboard_deal)
+
+
+class TestLazyPlayerHand(unittest.TestCase):
+    south = TestBitboard.hands[Direction.SOUTH]
+
+    def test_from_bitboard_is_lazy(self):
+        hand = PlayerHand.from_bitboard(self.south.bits)
+        self.assertIsNone(hand._suits)
+        self.assertIsNone(hand._cards)
+        self.assertEqual(self.south, hand)
+        self.assertIsNone(hand._suits)
+        self.assertEqual(self.south.suits, hand.suits)
+        self.assertEqual(self.south.cards, hand.cards)
+
+    def test_player_cards_built_on_access(self):
+        deal = TestBitboard.deal.to_bitboard().to_deal()
+        self.assertIsNone(deal._player_cards)
+        self.assertEqual(TestBitboard.deal.player_cards, deal.player_cards)
+
+    def test_pickle(self):
+        deal = pickle.loads(pickle.dumps(TestBitboard.deal))
+        self.assertEqual(TestBitboard.deal, deal)
+        self.assertEqual(TestBitboard.deal.player_cards, deal.player_cards)
+
+    def test_legacy_pickle_state(self):
+        hand = PlayerHand.__new__(PlayerHand)
+        hand.__setstate__({"suits": self.south.suits, "cards": self.south.cards})
+        self.assertEqual(self.south, hand)
+        deal = Deal.__new__(Deal)
+        legacy_state = dict(TestBitboard.deal.__dict__, player_cards={})
+        del legacy_state["_player_cards"]
+        deal.__setstate__(legacy_state)
+        self.assertEqual(TestBitboard.deal.player_cards, deal.player_cards)
+
+
+class TestFingerprint(unittest.TestCase):
+    deal = TestBitboard.deal
+
+    def test_serialize(self):
+        self.assertEqual(serialize_deal(self.deal), self.deal.to_bitboard().serialize())
+
+    def test_stable(self):
+        deal = from_lin_deal("3", "o", "SQ982HQ82DKQ763CT,SJ643HKJ7653DCAQ4,SK5HADAJT52CJ9762,")
+        self.assertEqual("b31481c2023bd58b021ce9d374c486b8", deal.fingerprint().hex())
+        self.assertEqual(deal.fingerprint(), pickle.loads(pickle.dumps(deal)).fingerprint())
+
+    def test_canonical(self):
+        rotated = self.deal.to_bitboard().rotate(1).to_deal()
+        self.assertEqual(Direction.SOUTH, rotated.dealer)
+        self.assertEqual((False, True), (rotated.ns_vulnerable, rotated.ew_vulnerable))
+        self.assertEqual(self.deal.hands[Direction.NORTH], rotated.hands[Direction.EAST])
+        self.assertNotEqual(self.deal.fingerprint(), rotated.fingerprint())
+        self.assertEqual(self.deal.fingerprint(canonical=True), rotated.fingerprint(canonical=True))
+
+    def test_ignore_dealer_vulnerability(self):
+        other = Deal(Direction.NORTH, False, True, self.deal.hands)
+        self.assertNotEqual(self.deal.fingerprint(), other.fingerprint())
+        self.assertEqual(
+            self.deal.fingerprint(ignore_dealer_vulnerability=True), other.fingerprint(ignore_dealer_vulnerability=True)
+        )
@@ -0,0 +1,40 @@
+import unittest
+from pathlib import Path
+
+from bridgebots import DealArray, Direction, parse_multi_lin, serialize_deal
+
+
+class TestDealArray(unittest.TestCase):
+    deals = [
+        deal_record.deal for deal_record in parse_multi_lin(Path(__file__).parent / "resources" / "usbf_sf_14502.lin")
+    ]
+
+    def test_from_deals_to_deals(self):
+        deal_array = DealArray.from_deals(self.deals)
+        self.assertEqual(len(self.deals), len(deal_array))
+        self.assertEqual(52 * len(self.deals), len(deal_array.owners))
+        self.assertEqual(self.deals, deal_array.to_deals())
+
+    def test_serialized_round_trip(self):
+        serialized = b"".join(serialize_deal(deal) for deal in self.deals)
+        deal_array = DealArray.from_serialized(serialized)
+        self.assertEqual(self.deals, deal_array.to_deals())
+        self.assertEqual(serialized, deal_array.to_serialized())
+        self.assertEqual(serialized, DealArray.from_deals(self.deals).to_serialized())
+
+    def test_slicing(self):
+        deal_array = DealArray.from_deals(self.deals)
+        sliced = deal_array[2:5]
+        self.assertIsInstance(sliced.owners, memoryview)
+        self.assertEqual(self.deals[2:5], sliced.to_deals())
+        self.assertEqual(self.deals[1:7:2], deal_array[1:7:2].to_deals())
+        self.assertEqual(self.deals[-1], deal_array[-1])
+        with self.assertRaises(IndexError):
+            deal_array[len(self.deals)]
+
+    def test_one_hot(self):
+        deal_array = DealArray.from_deals(self.deals)
+        one_hot = deal_array.one_hot(0, Direction.NORTH)
+        self.assertEqual(13, sum(one_hot))
+        held_indices = [index for index, held in enumerate(one_hot) if held]
+        self.assertEqual(sorted(card.index for card in self.deals[0].player_cards[Direction.NORTH]), held_indices)
@@ -0,0 +1,27 @@
+import unittest
+
+from bridgebots import BiddingSuit, Direction, Rank, Suit
+
+
+class TestDirection(unittest.TestCase):
+    def test_rotations(self):
+        self.assertEqual(Direction.NORTH, Direction.WEST.next())
+        self.assertEqual(Direction.NORTH, Direction.SOUTH.partner())
+        self.assertEqual(Direction.WEST, Direction.NORTH.previous())
+        self.assertEqual(Direction.EAST, Direction.WEST.offset(6))
+        self.assertEqual(Direction.SOUTH, Direction.EAST.offset(-3))
+
+
+class TestFromStr(unittest.TestCase):
+    def test_case_insensitive(self):
+        self.assertEqual(Direction.NORTH, Direction.from_str("n"))
+        self.assertEqual(Suit.HEARTS, Suit.from_str("H"))
+        self.assertEqual(BiddingSuit.NO_TRUMP, BiddingSuit.from_str("Nt"))
+        self.assertEqual(Rank.TEN, Rank.from_str("10"))
+        self.assertEqual(Rank.TEN, Rank.from_str("t"))
+
+    def test_invalid(self):
+        with self.assertRaises(KeyError):
+            Suit.from_str("X")
+        with self.assertRaises(KeyError):
+            Rank.from_str("1")
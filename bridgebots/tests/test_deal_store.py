@@ -0,0 +1,46 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from bridgebots import DealStore, DealStoreWriter, parse_multi_lin
+
+
+class TestDealStore(unittest.TestCase):
+    deal_records = parse_multi_lin(Path(__file__).parent / "resources" / "usbf_sf_14502.lin")
+
+    def test_write_then_read(self):
+        with tempfile.TemporaryDirectory() as store_dir:
+            store_path = Path(store_dir) / "store"
+            with DealStoreWriter(store_path) as writer:
+                writer.write_all(self.deal_records)
+            with DealStore(store_path) as store:
+                self.assertEqual(len(self.deal_records), len(store))
+                self.assertEqual(self.deal_records, list(store))
+                self.assertEqual(self.deal_records[3], store[3])
+                self.assertEqual(self.deal_records[-1].deal, store.deal(-1))
+                self.assertEqual(self.deal_records[2:6], list(store.iter_range(2, 6)))
+                self.assertEqual([dr.deal for dr in self.deal_records[5:]], store.deal_array(5).to_deals())
+                with self.assertRaises(IndexError):
+                    store.board_records(len(self.deal_records))
+
+    def test_empty_store(self):
+        with tempfile.TemporaryDirectory() as store_dir:
+            store_path = Path(store_dir)
+            DealStoreWriter(store_path).close()
+            with DealStore(store_path) as store:
+                self.assertEqual(0, len(store))
+                self.assertEqual([], list(store))
+
+    def test_iter_range_batches(self):
+        with tempfile.TemporaryDirectory() as store_dir:
+            store_path = Path(store_dir)
+            with DealStoreWriter(store_path) as writer:
+                writer.write_all(self.deal_records * 10)
+            with DealStore(store_path) as store, mock.patch("bridgebots.deal_store._READ_BATCH_SIZE", 4):
+                with mock.patch.object(store, "deal_array", wraps=store.deal_array) as deal_array:
+                    records = store.iter_range(1)
+                    self.assertEqual(self.deal_records[1], next(records))
+                    deal_array.assert_called_once_with(1, 5)
+                    self.assertEqual((self.deal_records * 10)[2:], list(records))
+                    self.assertEqual(len(range(1, len(store), 4)), deal_array.call_count)
@@ -1,7 +1,17 @@
 import json
 import unittest
 
-from bridgebots import Deal, Direction, PlayerHand, Suit, deal_utils, from_acbl_dict
+from bridgebots import (
+    Deal,
+    Direction,
+    PlayerHand,
+    Suit,
+    deal_utils,
+    from_acbl_dict,
+    from_lin_deal,
+    from_pbn_deal,
+    to_pbn_deal,
+)
 from bridgebots.deal_utils import calculate_shape, count_hcp, parse_lin_holding
 
 
@@ -68,6 +78,22 @@ class TestBinaryDeal(unittest.TestCase):
         out_deal = deal_utils.deserialize_deal(binary_deal)
         self.assertEqual(TestBinaryDeal.test_deal, out_deal)
 
+    def test_serialized_format(self):
+        deal = from_lin_deal("3", "o", "SQ982HQ82DKQ763CT,SJ643HKJ7653DCAQ4,SK5HADAJT52CJ9762,")
+        self.assertEqual("01d048dc929428b7f97b2f369e10", deal_utils.serialize_deal(deal).hex())
+
+    def test_bulk_serialize_then_deserialize(self):
+        deals = [
+            TestBinaryDeal.test_deal,
+            from_lin_deal("1", "b", "SQ982HQ82DKQ763CT,SJ643HKJ7653DCAQ4,SK5HADAJT52CJ9762,"),
+        ]
+        binary_deals = deal_utils.serialize_deals(deals)
+        self.assertEqual(b"".join(deal_utils.serialize_deal(deal) for deal in deals), binary_deals)
+        self.assertEqual(deals, deal_utils.deserialize_deals(binary_deals))
+        self.assertEqual([], deal_utils.deserialize_deals(b""))
+        with self.assertRaises(ValueError):
+            deal_utils.deserialize_deals(binary_deals[:-1])
+
 
 class TestLinDeal(unittest.TestCase):
     def test_parse_lin_holding_normal(self):
@@ -100,6 +126,13 @@ class TestLinDeal(unittest.TestCase):
         )
 
 
+class TestPbnDeal(unittest.TestCase):
+    def test_to_pbn_deal(self):
+        deal = from_pbn_deal("S", "None", "W:63.K3.K9532.J963 T82.62.T764.KQ42 KQJ7.QJ754.AJ.AT A954.AT98.Q8.875")
+        self.assertEqual("S:A954.AT98.Q8.875 63.K3.K9532.J963 T82.62.T764.KQ42 KQJ7.QJ754.AJ.AT", to_pbn_deal(deal))
+        self.assertEqual(deal, from_pbn_deal("S", "None", to_pbn_deal(deal)))
+
+
 class TestHelpers(unittest.TestCase):
     hand = PlayerHand.from_string_lists(["K", "8", "4"], ["J", "5", "2"], ["A", "9", "4"], ["A", "K", "Q", "5"])
 
@@ -0,0 +1,66 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from bridgebots import DealRecord, dedup_deal_records, external_dedup, merge_deal_records, parse_multi_lin, parse_pbn
+
+_RESOURCES = Path(__file__).parent / "resources"
+
+
+class TestDedup(unittest.TestCase):
+    deal_records = parse_multi_lin(_RESOURCES / "usbf_sf_14502.lin") + parse_pbn(_RESOURCES / "sample.pbn")
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_merge_duplicates(self):
+        # Split every record into one DealRecord per board, duplicate some boards, and interleave the copies
+        split_records = [
+            DealRecord(deal_record.deal, [board_record])
+            for deal_record in self.deal_records
+            for board_record in deal_record.board_records
+        ]
+        duplicated_records = split_records + split_records[::3]
+        deduped = list(dedup_deal_records(reversed(duplicated_records), self.work_dir, bucket_count=4))
+
+        expected = {}
+        for deal_record in self.deal_records:
+            expected.setdefault(deal_record.deal.fingerprint(), set()).update(deal_record.board_records)
+        self.assertEqual(len(expected), len(deduped))
+        for deal_record in deduped:
+            self.assertEqual(len(deal_record.board_records), len(set(deal_record.board_records)))
+            self.assertEqual(expected[deal_record.deal.fingerprint()], set(deal_record.board_records))
+        self.assertEqual([], list(self.work_dir.iterdir()))
+
+    def test_deterministic_order(self):
+        first = list(dedup_deal_records(self.deal_records, self.work_dir, bucket_count=8))
+        second = list(dedup_deal_records(self.deal_records, self.work_dir, bucket_count=8))
+        self.assertEqual(first, second)
+
+    def test_merge_deal_records(self):
+        deal_record = self.deal_records[0]
+        board_record = deal_record.board_records[0]
+        merged = merge_deal_records(DealRecord(deal_record.deal, [board_record]), deal_record)
+        self.assertEqual(deal_record.deal, merged.deal)
+        self.assertEqual(
+            [board_record] + [b for b in deal_record.board_records if b != board_record], merged.board_records
+        )
+
+    def test_external_dedup(self):
+        words = ["north", "east", "south", "west", "East", "NORTH", "north"]
+        deduped = external_dedup(words, lambda word: word.lower().encode(), lambda a, b: a + b, self.work_dir, 3)
+        self.assertEqual(["eastEast", "northNORTHnorth", "south", "west"], sorted(deduped))
+        self.assertEqual([], list(external_dedup([], lambda word: word.encode(), work_dir=self.work_dir)))
+
+    def test_invalid_bucket_count(self):
+        with self.assertRaises(ValueError):
+            external_dedup([], lambda word: word.encode(), bucket_count=0)
+        with mock.patch("resource.getrlimit", return_value=(256, 1024)):
+            with self.assertRaises(ValueError):
+                dedup_deal_records(self.deal_records, self.work_dir, bucket_count=256)
+            self.assertEqual(len(self.deal_records), len(list(dedup_deal_records(self.deal_records, self.work_dir))))
@@ -0,0 +1,95 @@
+import dataclasses
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+
+from bridgebots import DealRecord, DealRecordExporter, export_deal_records, iter_lin_records, parse_multi_lin, parse_pbn
+
+_LIN_PATH = Path(__file__).parent / "resources" / "usbf_sf_14502.lin"
+
+
+class TestExport(unittest.TestCase):
+    deal_records = parse_multi_lin(_LIN_PATH)
+    board_count = sum(len(deal_record.board_records) for deal_record in deal_records)
+
+    def assert_boards_equal(self, expected_deal_records, exported_deal_records):
+        """Commentary is not exported and the LIN board name is normalized, so compare the remaining fields"""
+        self.assertEqual(len(expected_deal_records), len(exported_deal_records))
+        for expected_deal_record, exported_deal_record in zip(expected_deal_records, exported_deal_records):
+            self.assertEqual(expected_deal_record.deal, exported_deal_record.deal)
+            for expected, exported in zip(expected_deal_record.board_records, exported_deal_record.board_records):
+                self.assertEqual(expected.bidding_record, exported.bidding_record)
+                self.assertEqual(expected.bidding_metadata, exported.bidding_metadata)
+                self.assertEqual(expected.play_record, exported.play_record)
+                self.assertEqual(expected.contract, exported.contract)
+                self.assertEqual(expected.tricks, exported.tricks)
+                self.assertEqual(expected.names, exported.names)
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_export_lin(self):
+        output_path = self.output_dir / "boards.lin"
+        self.assertEqual([output_path], export_deal_records(self.deal_records, output_path))
+        self.assert_boards_equal(self.deal_records, parse_multi_lin(output_path))
+
+    def test_export_pbn(self):
+        output_path = self.output_dir / "boards.pbn"
+        export_deal_records(self.deal_records, output_path, "pbn")
+        self.assert_boards_equal(self.deal_records, parse_pbn(output_path))
+
+    def test_export_sharded_gzip(self):
+        paths = export_deal_records(
+            self.deal_records, self.output_dir / "boards.lin.gz", compress=True, boards_per_shard=5
+        )
+        self.assertEqual(self.output_dir / "boards-00000.lin.gz", paths[0])
+        self.assertEqual((self.board_count + 4) // 5, len(paths))
+        shard_counts = []
+        exported_deals = set()
+        for path in paths:
+            with gzip.open(path, "rt") as lin_file:
+                shard_records = list(iter_lin_records(lin_file))
+            shard_counts.append(len(shard_records))
+            exported_deals.update(deal_record.deal for deal_record in shard_records)
+        self.assertEqual(5, shard_counts[0])
+        self.assertEqual(self.board_count, sum(shard_counts))
+        self.assertEqual({deal_record.deal for deal_record in self.deal_records}, exported_deals)
+
+    def test_append(self):
+        output_path = self.output_dir / "boards.lin"
+        for deal_record in self.deal_records[:2]:
+            with DealRecordExporter(output_path, append=True) as exporter:
+                exporter.write(deal_record)
+        self.assert_boards_equal(self.deal_records[:2], parse_multi_lin(output_path))
+
+    def test_export_without_names(self):
+        deal_records = [
+            DealRecord(
+                deal_record.deal,
+                [dataclasses.replace(board_record, names=None) for board_record in deal_record.board_records],
+            )
+            for deal_record in self.deal_records
+        ]
+        for output_format, parse in [("lin", parse_multi_lin), ("pbn", parse_pbn)]:
+            output_path = self.output_dir / f"boards.{output_format}"
+            export_deal_records(deal_records, output_path, output_format)
+            exported_deal_records = parse(output_path)
+            self.assertEqual(len(deal_records), len(exported_deal_records))
+            for deal_record, exported_deal_record in zip(deal_records, exported_deal_records):
+                self.assertEqual(deal_record.deal, exported_deal_record.deal)
+                self.assertEqual(
+                    [board_record.bidding_record for board_record in deal_record.board_records],
+                    [board_record.bidding_record for board_record in exported_deal_record.board_records],
+                )
+        self.assertNotIn("pn|", (self.output_dir / "boards.lin").read_text())
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            DealRecordExporter(self.output_dir / "boards.csv", "csv")
+        with self.assertRaises(ValueError):
+            DealRecordExporter(self.output_dir / "boards.lin", boards_per_shard=10, append=True)
@@ -0,0 +1,40 @@
+import unittest
+from pathlib import Path
+
+from bridgebots import DealArray, Direction, PlayerHand, parse_multi_lin
+from bridgebots.deal_utils import calculate_shape, count_hcp
+from bridgebots.hand_evaluation import evaluate_hand, evaluate_hands
+
+
+class TestHandEvaluation(unittest.TestCase):
+    def test_evaluate_hand(self):
+        # AKx, AQxx, Kx, xxxx
+        hand = PlayerHand.from_string_lists(["A", "K", "4"], ["A", "Q", "7", "3"], ["K", "5"], ["9", "8", "6", "2"])
+        evaluation = evaluate_hand(hand.to_bitboard().bits)
+        self.assertEqual(16, evaluation.hcp)
+        self.assertEqual(6, evaluation.controls)
+        self.assertEqual(1 + 1 + 1 + 3, evaluation.losers)
+        self.assertEqual(4 + 3 + 1, evaluation.quick_tricks)
+        self.assertEqual((3, 4, 2, 4), evaluation.suit_lengths)
+        self.assertEqual((4, 4, 3, 2), evaluation.sorted_shape)
+        self.assertEqual((5, 6, 3, 4), evaluation.suit_quality)
+
+    def test_losers_short_suits(self):
+        # Kx, singleton A, void, QJT9xxxx
+        hand = PlayerHand.from_string_lists(["K", "2"], ["A"], [], ["Q", "J", "10", "9", "8", "7", "6", "5", "4", "3"])
+        evaluation = evaluate_hand(hand.to_bitboard().bits)
+        self.assertEqual(1 + 0 + 0 + 2, evaluation.losers)
+
+    def test_evaluate_hands(self):
+        deal_records = parse_multi_lin(Path(__file__).parent / "resources" / "usbf_sf_14502.lin")
+        deals = [deal_record.deal for deal_record in deal_records]
+        evaluations = evaluate_hands(DealArray.from_deals(deals))
+        self.assertEqual(len(deals), len(evaluations))
+        for deal_index, deal in enumerate(deals):
+            for direction in Direction:
+                cards = deal.player_cards[direction]
+                evaluation = evaluations.hand(deal_index, direction)
+                self.assertEqual(count_hcp(cards), evaluation.hcp)
+                self.assertEqual(calculate_shape(cards), evaluation.suit_lengths)
+                self.assertEqual(calculate_shape(cards, sort=True), evaluation.sorted_shape)
+                self.assertEqual(evaluate_hand(deal.hands[direction].to_bitboard().bits), evaluation)
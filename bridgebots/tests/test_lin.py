@@ -1,4 +1,5 @@
 import dataclasses
+import io
 import unittest
 from pathlib import Path
 
@@ -14,10 +15,13 @@ from bridgebots import (
     Suit,
     build_lin_str,
     build_lin_url,
+    iter_lin_records,
+    iter_multi_lin,
     parse_multi_lin,
     parse_single_lin,
 )
 from bridgebots.lin import (
+    LinType,
     _build_board_name,
     _determine_declarer,
     _parse_bidding_record,
@@ -74,6 +78,12 @@ class TestParseLin(unittest.TestCase):
         self.assertEqual([(2, "Unusual No Trump: 2 5card minors")], lin_dict["an"])
         self.assertEqual(self.expected_play_record, lin_dict["pc"])
 
+    def test_parse_lin_nodes_commentary(self):
+        lin_dict = _parse_lin_nodes("mb|1C|nt|hello|mb|p|pc|SA|nt|lead|\n")
+        self.assertEqual([Commentary(0, None, "hello"), Commentary(None, 0, "lead")], lin_dict["nt"])
+        with self.assertRaises(ValueError):
+            _parse_lin_nodes("mb|1C|pc|SA")
+
     def test_parse_deal_three_hands(self):
         deal = _parse_deal({"md": ["1SQ982HQ82DKQ763CT,SJ643HKJ7653DCAQ4,SK5HADAJT52CJ9762,"], "sv": ["e"]})
         self.assertEqual(Direction.SOUTH, deal.dealer)
@@ -118,6 +128,26 @@ class TestParseLin(unittest.TestCase):
         self.assertEqual([], bidding_metadata)
         self.assertEqual("5CXX", contract)
 
+    def test_parse_illegal_auction(self):
+        with self.assertRaises(ValueError):
+            _parse_bidding_record(["1S", "1H", "p", "p", "p"], {}, strict=True)
+        with self.assertRaises(ValueError):
+            _parse_bidding_record(["1S", "p", "2S", "p", "p"], {}, strict=True)
+        _, _, contract = _parse_bidding_record(["1S", "1H", "p", "p", "p"], {})
+        self.assertEqual("1H", contract)
+        _, _, contract = _parse_bidding_record(["1S", "p", "2S", "p", "p"], {})
+        self.assertEqual("2S", contract)
+
+    def test_parse_truncated_auction(self):
+        truncated_lin = self.sample_lin.replace("mb|p|mb|p|mb|p|pg||", "mb|p|mb|p|pg||")
+        parsed_lin = parse_lin_str(truncated_lin)
+        board_record = parsed_lin[0].board_records[0]
+        self.assertEqual(["PASS", "1H", "2NT", "PASS", "3NT", "PASS", "PASS"], board_record.bidding_record)
+        self.assertEqual(Contract.from_str("3NT"), board_record.contract)
+        self.assertEqual(self.expected_play_record, [str(card) for card in board_record.play_record])
+        with self.assertRaises(ValueError):
+            parse_lin_str(truncated_lin, strict=True)
+
     def test_determine_declarer(self):
         deal = _parse_deal({"md": ["1SQ982HQ82DKQ763CT,SJ643HKJ7653DCAQ4,SK5HADAJT52CJ9762,"], "sv": ["e"]})
         bidding_record = ["PASS", "PASS", "1D", "PASS", "1S", "2H", "3C", "PASS", "3D", "PASS", "PASS", "PASS"]
@@ -227,6 +257,25 @@ class TestParseLin(unittest.TestCase):
         )
         self.assertEqual(Contract(4, BiddingSuit.SPADES, 1), deal_records[7].board_records[0].contract)
 
+    def test_iter_multi(self):
+        lin_path = Path(__file__).parent / "resources" / "usbf_sf_14502.lin"
+        deal_records = list(iter_multi_lin(lin_path))
+        self.assertEqual(30, len(deal_records))
+        self.assertTrue(all(len(deal_record.board_records) == 1 for deal_record in deal_records))
+        grouped = parse_multi_lin(lin_path)
+        self.assertEqual(grouped[0].board_records[0], deal_records[0].board_records[0])
+        with open(lin_path) as lin_file:
+            stream = io.StringIO(lin_file.read())
+        self.assertEqual(deal_records, list(iter_lin_records(stream)))
+
+    def test_parse_multi_lazy(self):
+        lin_path = Path(__file__).parent / "resources" / "usbf_sf_14502.lin"
+        lazy_records = parse_multi_lin(lin_path, lazy=True)
+        board_record = lazy_records[0].board_records[0]
+        self.assertNotIn("play_record", board_record.__dict__)
+        self.assertNotIn("commentary", board_record.__dict__)
+        self.assertEqual(parse_multi_lin(lin_path), lazy_records)
+
 
 class TestBuildLin(unittest.TestCase):
     deal_records = parse_single_lin(Path(__file__).parent / "resources" / "sample.lin")
@@ -250,6 +299,12 @@ class TestBuildLin(unittest.TestCase):
             expected_lin_str, build_lin_str(self.deal_records[0].deal, self.deal_records[0].board_records[0])
         )
 
+    def test_build_multi_lin_str_with_names(self):
+        deal, board_record = self.deal_records[0].deal, self.deal_records[0].board_records[0]
+        lin_str = build_lin_str(deal, board_record, LinType.MULTI, include_names=True)
+        self.assertTrue(lin_str.startswith("qx|Board 15|pn|PrinceBen,Forrest_,smalark,granola357|st||md|1SQ982"))
+        self.assertNotIn("pn|", build_lin_str(deal, board_record, LinType.MULTI))
+
     def test_build_lin_url(self):
         deal = self.deal_records[0].deal
         board_record = self.deal_records[0].board_records[0]
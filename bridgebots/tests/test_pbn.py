@@ -1,7 +1,21 @@
+import io
 import unittest
 from pathlib import Path
+from unittest import mock
 
-from bridgebots import BidMetadata, BiddingSuit, Card, Contract, Direction, Rank, Suit, parse_pbn
+from bridgebots import (
+    BidMetadata,
+    BiddingSuit,
+    Card,
+    Contract,
+    Direction,
+    Rank,
+    Suit,
+    build_pbn_str,
+    iter_pbn,
+    parse_multi_lin,
+    parse_pbn,
+)
 from bridgebots.pbn import _build_record_dict, _parse_bidding_record, _sort_play_record
 
 
@@ -98,6 +112,21 @@ class TestParsePbnFile(unittest.TestCase):
         self.assertEqual(Card.from_str("SA"), records[0].board_records[0].play_record[0])
         self.assertEqual(Card.from_str("HA"), records[0].board_records[1].play_record[0])
 
+    def test_iter_pbn(self):
+        sample_pbn_path = Path(__file__).parent / "resources" / "shared_deals.pbn"
+        deal_records = list(iter_pbn(sample_pbn_path))
+        self.assertEqual(4, len(deal_records))
+        self.assertEqual(deal_records[0].deal, deal_records[1].deal)
+        # Split the stream into blocks which end mid-line
+        with mock.patch("bridgebots.pbn._READ_SIZE", 7), open(sample_pbn_path) as pbn_file:
+            self.assertEqual(deal_records, list(iter_pbn(io.StringIO(pbn_file.read()))))
+
+    def test_parse_lazy(self):
+        sample_pbn_path = Path(__file__).parent / "resources" / "sample.pbn"
+        lazy_records = parse_pbn(sample_pbn_path, lazy=True)
+        self.assertNotIn("play_record", lazy_records[0].board_records[0].__dict__)
+        self.assertEqual(parse_pbn(sample_pbn_path), lazy_records)
+
 
 class TestPbnRecordDict(unittest.TestCase):
     def test_ignore_non_key_lines(self):
@@ -261,3 +290,27 @@ class TestPbnBiddingRecord(unittest.TestCase):
         bidding_record, bidding_metadata = _parse_bidding_record(raw_auction, {})
         self.assertEqual(["1C", "1S", "PASS", "PASS", "PASS"], bidding_record)
         self.assertEqual([], bidding_metadata)
+
+
+class TestBuildPbn(unittest.TestCase):
+    def test_build_pbn_str(self):
+        deal_record = parse_pbn(Path(__file__).parent / "resources" / "sample.pbn")[0]
+        pbn_str = build_pbn_str(deal_record.deal, deal_record.board_records[0])
+        self.assertIn('[Deal "E:KQJ7.QJ754.AJ.AT A954.AT98.Q8.875 63.K3.K9532.J963 T82.62.T764.KQ42"]', pbn_str)
+        self.assertIn('[Auction "E"]\n1H Pass 1S =1= Pass\n2C ! Pass 2H =2= Pass\n', pbn_str)
+        self.assertIn('[Play "N"]\nCQ CA C8 C3\nH6 H4 HT HK\n', pbn_str)
+        self.assertTrue(pbn_str.endswith("- - - S6\n*"))
+
+    def test_round_trip(self):
+        for deal_record in parse_multi_lin(Path(__file__).parent / "resources" / "usbf_sf_14502.lin"):
+            for board_record in deal_record.board_records:
+                pbn_str = build_pbn_str(deal_record.deal, board_record)
+                parsed_record = next(iter_pbn(io.StringIO(pbn_str)))
+                parsed_board_record = parsed_record.board_records[0]
+                self.assertEqual(deal_record.deal, parsed_record.deal)
+                self.assertEqual(board_record.bidding_record, parsed_board_record.bidding_record)
+                self.assertEqual(board_record.bidding_metadata, parsed_board_record.bidding_metadata)
+                self.assertEqual(board_record.play_record, parsed_board_record.play_record)
+                self.assertEqual(board_record.contract, parsed_board_record.contract)
+                self.assertEqual(board_record.tricks, parsed_board_record.tricks)
+                self.assertEqual(board_record.names, parsed_board_record.names)
@@ -1,6 +1,14 @@
 import unittest
 
-from bridgebots import BiddingSuit, calculate_score
+from bridgebots import (
+    BiddingSuit,
+    Card,
+    Direction,
+    calculate_score,
+    from_lin_deal,
+    replay_tricks,
+    trick_winner,
+)
 
 
 class TestScoring(unittest.TestCase):
@@ -98,3 +106,62 @@ class TestScoring(unittest.TestCase):
         self.assertEqual(-400, calculate_score(7, BiddingSuit.DIAMONDS, 0, 9, True))
         self.assertEqual(-1100, calculate_score(7, BiddingSuit.DIAMONDS, 1, 9, True))
         self.assertEqual(-2200, calculate_score(7, BiddingSuit.DIAMONDS, 2, 9, True))
+
+
+class TestTrickReplay(unittest.TestCase):
+    # fmt: off
+    play_record = [
+        "H4", "H2", "HJ", "HA",
+        "DA", "D4", "D3", "S3",
+        "DJ", "D8", "D6", "S4",
+        "DT", "D9", "D7", "S6",
+        "D2", "C3", "DK", "SJ",
+        "DQ", "C4", "D5", "S7",
+        "S2", "H3", "SK", "SA",
+        "HT", "HQ", "HK", "C2",
+        "H5", "S5", "H9", "H8",
+        "C5", "CT", "CA", "C6",
+        "H7", "C7", "ST", "S8",
+        "H6", "C9", "C8", "S9",
+        "CQ", "CJ", "CK", "SQ",
+    ]
+    # fmt: on
+    deal = from_lin_deal("1", "n", "SQ982HQ82DKQ763CT,SJ643HKJ7653DCAQ4,SK5HADAJT52CJ9762,")
+
+    def _play_indices(self):
+        return [Card.from_str(card_str).index for card_str in self.play_record]
+
+    def test_trick_winner(self):
+        trick = [Card.from_str(card_str).index for card_str in ["H4", "H2", "HJ", "S2"]]
+        self.assertEqual(2, trick_winner(trick, BiddingSuit.NO_TRUMP))
+        self.assertEqual(2, trick_winner(trick, BiddingSuit.CLUBS))
+        self.assertEqual(3, trick_winner(trick, BiddingSuit.SPADES))
+
+    def test_replay_no_trump(self):
+        replay = replay_tricks(
+            self._play_indices(), BiddingSuit.NO_TRUMP, Direction.EAST, self.deal.to_bitboard().hands
+        )
+        self.assertEqual(13, len(replay.winners))
+        self.assertEqual(Direction.EAST, replay.leaders[0])
+        self.assertEqual(Direction.NORTH, replay.winners[0])
+        self.assertEqual(replay.winners[:-1], replay.leaders[1:])
+        self.assertEqual([1, 2, 3, 4, 5, 6, 6, 6, 6, 6, 6, 6, 6], replay.ns_tricks)
+        self.assertEqual(6, replay.tricks_taken(Direction.SOUTH))
+        self.assertEqual(7, replay.tricks_taken(Direction.WEST))
+
+    def test_replay_trump(self):
+        replay = replay_tricks(self._play_indices(), BiddingSuit.CLUBS, Direction.EAST)
+        self.assertEqual(10, replay.tricks_taken(Direction.NORTH))
+        self.assertEqual(3, replay.tricks_taken(Direction.EAST))
+
+    def test_replay_incomplete_trick(self):
+        replay = replay_tricks(self._play_indices()[:6], BiddingSuit.NO_TRUMP, Direction.EAST)
+        self.assertEqual([Direction.NORTH], replay.winners)
+        self.assertEqual([1], replay.ns_tricks)
+        self.assertEqual(0, replay_tricks([], BiddingSuit.NO_TRUMP, Direction.EAST).tricks_taken(Direction.EAST))
+
+    def test_replay_card_not_held(self):
+        with self.assertRaises(ValueError):
+            replay_tricks(self._play_indices(), BiddingSuit.NO_TRUMP, Direction.NORTH, self.deal.to_bitboard().hands)
+        with self.assertRaises(ValueError):
+            replay_tricks([52], BiddingSuit.NO_TRUMP, Direction.NORTH)
@@ -0,0 +1,186 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from bridgebots import (
+    BiddingSuit,
+    BoardFilter,
+    CorpusIndex,
+    DealStore,
+    DealStoreWriter,
+    Direction,
+    canonicalize_bid,
+    open_corpus_index,
+    parse_multi_lin,
+    parse_pbn,
+)
+from bridgebots.deal_store import BOARDS_FILE
+from bridgebots.hand_evaluation import evaluate_hand
+from bridgebots.query import SHAPES, encode_value
+
+_RESOURCES = Path(__file__).parent / "resources"
+
+
+class TestCorpusIndex(unittest.TestCase):
+    deal_records = parse_multi_lin(_RESOURCES / "usbf_sf_14502.lin") + parse_pbn(_RESOURCES / "sample.pbn")
+    boards = [
+        (deal_record.deal, board_record) for deal_record in deal_records for board_record in deal_record.board_records
+    ]
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store_path = Path(self.temp_dir.name) / "store"
+        with DealStoreWriter(self.store_path) as writer:
+            writer.write_all(self.deal_records)
+        self.deal_store = DealStore(self.store_path)
+        self.corpus_index = CorpusIndex.build(self.deal_store)
+
+    def tearDown(self):
+        self.deal_store.close()
+        self.temp_dir.cleanup()
+
+    def _expected_ids(self, predicate):
+        return [board_id for board_id, (deal, board_record) in enumerate(self.boards) if predicate(deal, board_record)]
+
+    @staticmethod
+    def _opener(deal, board_record):
+        for position, bid in enumerate(board_record.bidding_record):
+            if canonicalize_bid(bid) != "PASS":
+                return deal.dealer.offset(position)
+        return None
+
+    def test_locate(self):
+        self.assertEqual(len(self.boards), len(self.corpus_index))
+        self.assertEqual(len(self.deal_records), self.corpus_index.deal_count)
+        board_id = 0
+        for deal_index, deal_record in enumerate(self.deal_records):
+            for position in range(len(deal_record.board_records)):
+                self.assertEqual((deal_index, position), self.corpus_index.locate(board_id))
+                board_id += 1
+        with self.assertRaises(IndexError):
+            self.corpus_index.locate(board_id)
+
+    def test_opener_hcp_and_majors(self):
+        def predicate(deal, board_record):
+            opener = self._opener(deal, board_record)
+            if opener is None:
+                return False
+            evaluation = evaluate_hand(deal.to_bitboard().hands[opener.value])
+            spades, hearts = evaluation.suit_lengths[0:2]
+            return 11 <= evaluation.hcp <= 13 and (spades >= 5 and hearts >= 4 or hearts >= 5 and spades >= 4)
+
+        five_four_majors = (BoardFilter.between("opener_spades", 5) & BoardFilter.between("opener_hearts", 4)) | (
+            BoardFilter.between("opener_hearts", 5) & BoardFilter.between("opener_spades", 4)
+        )
+        board_filter = BoardFilter.between("opener_hcp", 11, 13) & five_four_majors
+        self.assertEqual(self._expected_ids(predicate), self.corpus_index.board_ids(board_filter))
+
+    def test_seat_hcp_and_shape(self):
+        for direction in Direction:
+            seat = direction.name.lower()
+            for shape in [(4, 3, 3, 3), (5, 3, 3, 2)]:
+
+                def predicate(deal, board_record):
+                    evaluation = evaluate_hand(deal.to_bitboard().hands[direction.value])
+                    return evaluation.sorted_shape == shape and evaluation.hcp >= 10
+
+                board_filter = BoardFilter.equals(f"{seat}_shape", shape) & BoardFilter.between(f"{seat}_hcp", 10)
+                self.assertEqual(self._expected_ids(predicate), self.corpus_index.board_ids(board_filter))
+
+    def test_contract_and_declarer(self):
+        def predicate(deal, board_record):
+            return board_record.contract.suit == BiddingSuit.NO_TRUMP and board_record.declarer in [
+                Direction.NORTH,
+                Direction.SOUTH,
+            ]
+
+        board_filter = BoardFilter.equals("contract_strain", BiddingSuit.NO_TRUMP) & BoardFilter.equals(
+            "declarer", Direction.NORTH, Direction.SOUTH
+        )
+        expected = self._expected_ids(predicate)
+        self.assertEqual(expected, self.corpus_index.board_ids(board_filter))
+        self.assertEqual(len(expected), self.corpus_index.count(board_filter))
+        self.assertEqual(
+            self._expected_ids(lambda deal, board_record: str(board_record.contract).startswith("3N")),
+            self.corpus_index.board_ids(BoardFilter.equals("contract", "3NT")),
+        )
+
+    def test_opening_bid_and_vulnerability(self):
+        def predicate(deal, board_record):
+            bids = [canonicalize_bid(bid) for bid in board_record.bidding_record]
+            opening_bid = next((bid for bid in bids if bid != "PASS"), None)
+            return deal.ns_vulnerable and not deal.ew_vulnerable and opening_bid == "1NT"
+
+        board_filter = BoardFilter.equals("vulnerability", "NS") & BoardFilter.equals("opening_bid", "1N")
+        self.assertEqual(self._expected_ids(predicate), self.corpus_index.board_ids(board_filter))
+        self.assertEqual(
+            self._expected_ids(lambda deal, board_record: self._opener(deal, board_record) is None),
+            self.corpus_index.board_ids(BoardFilter.equals("opener", None)),
+        )
+
+    def test_event_and_date(self):
+        self.assertEqual(
+            self._expected_ids(lambda deal, board_record: board_record.event == "Bermuda Bowl 2015"),
+            self.corpus_index.board_ids(BoardFilter.event("Bermuda Bowl 2015")),
+        )
+        self.assertEqual(
+            self._expected_ids(lambda deal, board_record: "bowl" in (board_record.event or "").lower()),
+            self.corpus_index.board_ids(BoardFilter.event("BOWL", contains=True)),
+        )
+        self.assertEqual(
+            self._expected_ids(lambda deal, board_record: "2001" <= (board_record.date or "") <= "2005"),
+            self.corpus_index.board_ids(BoardFilter.date_between("2001", "2005")),
+        )
+
+    def test_invert_and_limit(self):
+        board_filter = BoardFilter.between("north_hcp", 12)
+        matching = self.corpus_index.board_ids(board_filter)
+        not_matching = self.corpus_index.board_ids(~board_filter)
+        self.assertEqual(list(range(len(self.boards))), sorted(matching + not_matching))
+        self.assertEqual(matching[:2], self.corpus_index.board_ids(board_filter, limit=2))
+
+    def test_deal_records(self):
+        board_filter = BoardFilter.equals("declarer", Direction.WEST)
+        deal_records = list(self.corpus_index.deal_records(board_filter, self.deal_store))
+        expected = [
+            (deal, board_record) for deal, board_record in self.boards if board_record.declarer == Direction.WEST
+        ]
+        self.assertEqual(expected, [(deal_record.deal, deal_record.board_records[0]) for deal_record in deal_records])
+
+    def test_save_and_open(self):
+        corpus_index = open_corpus_index(self.deal_store)
+        reopened_index = open_corpus_index(self.deal_store)
+        board_filter = BoardFilter.between("south_hcp", 0, 9)
+        self.assertEqual(corpus_index.board_ids(board_filter), reopened_index.board_ids(board_filter))
+        self.assertEqual(self.corpus_index.columns, reopened_index.columns)
+
+    def test_open_rebuilds_stale_index(self):
+        open_corpus_index(self.deal_store)
+        self.deal_store.close()
+        with DealStoreWriter(self.store_path) as writer:
+            writer.write_all(self.deal_records[1:])
+        self.deal_store = DealStore(self.store_path)
+        corpus_index = open_corpus_index(self.deal_store)
+        self.assertEqual(len(self.deal_records) - 1, corpus_index.deal_count)
+        self.assertEqual(len(self.boards) - len(self.deal_records[0].board_records), len(corpus_index))
+
+        # Touching a store file invalidates the index even though the deal count is unchanged
+        boards_path = self.store_path / BOARDS_FILE
+        boards_mtime_ns = boards_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(boards_path, ns=(boards_mtime_ns, boards_mtime_ns))
+        with mock.patch.object(CorpusIndex, "build", wraps=CorpusIndex.build) as build:
+            open_corpus_index(self.deal_store)
+            open_corpus_index(self.deal_store)
+        build.assert_called_once_with(self.deal_store)
+
+    def test_encode_value(self):
+        self.assertEqual(SHAPES.index((5, 4, 3, 1)), encode_value("west_shape", "4-5-1-3"))
+        self.assertEqual(2, encode_value("dealer", Direction.SOUTH))
+        with self.assertRaises(ValueError):
+            encode_value("north_hcp", 255)
+        with self.assertRaises(ValueError):
+            encode_value("unknown", 1)
+        with self.assertRaises(ValueError):
+            encode_value("contract", "8NT")
@@ -0,0 +1,76 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from bridgebots import ShardedRecordReader, ShardedRecordWriter, parse_multi_lin, read_records, write_records
+from bridgebots.record_shards import MANIFEST_FILE
+
+_RESOURCES = Path(__file__).parent / "resources"
+
+
+class TestRecordShards(unittest.TestCase):
+    deal_records = parse_multi_lin(_RESOURCES / "usbf_sf_14502.lin")
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.container_path = Path(self.temp_dir.name) / "deals"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.deal_records), write_records(self.deal_records, self.container_path, shard_count=3))
+        self.assertEqual(self.deal_records, list(read_records(self.container_path)))
+
+    def test_chunks_and_shards(self):
+        with ShardedRecordWriter(self.container_path, shard_count=3, chunk_size=2) as writer:
+            writer.write_all(range(11))
+        reader = ShardedRecordReader(self.container_path)
+        self.assertEqual(11, len(reader))
+        self.assertEqual(3, reader.shard_count)
+        # Chunks of two records are dealt to shards round robin
+        self.assertEqual([0, 1, 6, 7], list(reader.iter_shard(0)))
+        self.assertEqual([2, 3, 8, 9], list(reader.iter_shard(1)))
+        self.assertEqual([4, 5, 10], list(reader.iter_shard(2)))
+        self.assertEqual([4, 4, 3], [reader.shard_record_count(shard) for shard in range(3)])
+        self.assertEqual(list(range(11)), list(reader))
+
+    def test_workers(self):
+        write_records(range(5000), self.container_path, shard_count=5)
+        worker_records = [list(read_records(self.container_path, worker, 2)) for worker in range(2)]
+        self.assertEqual(list(range(5000)), sorted(worker_records[0] + worker_records[1]))
+        self.assertEqual(
+            [[0, 2, 4], [1, 3]], [ShardedRecordReader(self.container_path).shards_for_worker(w, 2) for w in range(2)]
+        )
+        with self.assertRaises(ValueError):
+            read_records(self.container_path, 2, 2)
+
+    def test_empty(self):
+        write_records([], self.container_path)
+        self.assertEqual([], list(read_records(self.container_path)))
+
+    def test_invalid_container(self):
+        with self.assertRaises(ValueError):
+            ShardedRecordReader(self.container_path)
+        write_records(range(10), self.container_path, shard_count=2)
+        with open(self.container_path / "shard-00001.bbr", "ab") as shard_file:
+            shard_file.write(b"extra")
+        with self.assertRaises(ValueError):
+            ShardedRecordReader(self.container_path)
+        manifest = json.loads((self.container_path / MANIFEST_FILE).read_text())
+        manifest["version"] = 99
+        (self.container_path / MANIFEST_FILE).write_text(json.dumps(manifest))
+        with self.assertRaises(ValueError):
+            ShardedRecordReader(self.container_path)
+
+    def test_no_manifest_after_exception(self):
+        write_records(range(10), self.container_path)
+        with self.assertRaises(RuntimeError):
+            with ShardedRecordWriter(self.container_path, chunk_size=2) as writer:
+                writer.write_all(range(5))
+                raise RuntimeError("interrupted")
+        self.assertTrue(all(shard_file.closed for shard_file in writer._shard_files))
+        self.assertFalse((self.container_path / MANIFEST_FILE).exists())
+        with self.assertRaises(ValueError):
+            ShardedRecordReader(self.container_path)
@@ -1,36 +1,52 @@
+import argparse
 import logging
 import pickle
-from collections import defaultdict
 from pathlib import Path
+from typing import Iterator
 
-from bridgebots import DealRecord, parse_multi_lin
+from bridgebots import DealRecord, DealStore, DealStoreWriter, dedup_deal_records, parse_corpus
 
 """Consume all downloaded LIN files from the vugraph project (https://www.sarantakos.com/bridge/vugraph.html) and write 
-them to a pickle file"""
+them to a DealStore"""
 logging.basicConfig(level=logging.DEBUG)
 
-all_results = []
-for results_path in Path("/Users/frice/bridge/vugraph_project/").rglob("*.lin"):
-    logging.debug(f"results_path: {str(results_path)}")
-    try:
-        file_results = parse_multi_lin(results_path)
-        all_results.extend(file_results)
-        logging.debug(f"extracted {len(file_results)} results from {results_path}")
-    except UnicodeError as e:
-        logging.error(e)
-
-logging.info(f"{len(all_results)} total results")
-
-# Deduplicate deals, collecting all boards to a set
-deal_dict = defaultdict(set)
-for deal_record in all_results:
-    deal_dict[deal_record.deal] |= set(deal_record.board_records)
-
-deduped_results = [DealRecord(deal, list(board_records)) for deal, board_records in deal_dict.items()]
-
-pickle_file_path = "/Users/frice/bridge/vugraph_project/all_deals.pickle"
-with open(pickle_file_path, "wb") as pickle_file:
-    pickle.dump(deduped_results, pickle_file)
-
-board_record_count = sum(len(deal_record.board_records) for deal_record in deduped_results)
-logging.info(f"wrote {len(deduped_results)} deals with {board_record_count} board records to {pickle_file_path}")
+arg_parser = argparse.ArgumentParser()
+arg_parser.add_argument(
+    "--legacy-pickle",
+    action="store_true",
+    help="Also write all_deals.pickle for scripts which load the whole corpus at once. Memory grows with the corpus",
+)
+args = arg_parser.parse_args()
+
+vugraph_path = Path("/Users/frice/bridge/vugraph_project/")
+board_count = 0
+
+
+def parsed_deal_records() -> Iterator[DealRecord]:
+    global board_count
+    lin_paths = sorted(vugraph_path.rglob("*.lin"))
+    for file_result in parse_corpus(lin_paths, "lin"):
+        for deal_record in file_result.deal_records:
+            board_count += len(deal_record.board_records)
+            yield deal_record
+        logging.debug(f"extracted {len(file_result.deal_records)} results from {file_result.path}")
+
+
+# Parse files in parallel and merge the boards of each deal by fingerprint. Deduplication spills to bucket files on disk
+# so memory does not grow with the size of the corpus
+store_path = vugraph_path / "all_deals_store"
+board_record_count = 0
+with DealStoreWriter(store_path) as store_writer:
+    for deal_record in dedup_deal_records(parsed_deal_records(), work_dir=vugraph_path):
+        board_record_count += len(deal_record.board_records)
+        store_writer.write(deal_record)
+logging.info(f"{board_count} total results")
+logging.info(f"wrote {store_writer.count} deals with {board_record_count} board records to {store_path}")
+
+# The store supports random access via bridgebots.DealStore without unpickling the whole corpus. The pickle loads the
+# whole corpus into memory, so it is only written on request
+if args.legacy_pickle:
+    pickle_file_path = vugraph_path / "all_deals.pickle"
+    with open(pickle_file_path, "wb") as pickle_file, DealStore(store_path) as deal_store:
+        pickle.dump(list(deal_store), pickle_file)
+    logging.info(f"wrote {store_writer.count} deals to {pickle_file_path}")
@@ -1,19 +1,21 @@
 import json
 import logging
 import os
-import pickle
+from pathlib import Path
+from typing import Iterator
 
+from bridgebots import ShardedRecordWriter, external_dedup
 from bridgebots.double_dummy import DoubleDummyDeal
 
 logging.basicConfig(level=logging.INFO)
 
 HAND_RECORD_KEY = "handrecord"
-processed_deals = set()
+deal_count = 0
 error_count = 0
-duplicate_count = 0
 
 
-with open("./results/double_dummy/all_deals.pickle", "wb") as dd_pickle_file:
+def session_deals() -> Iterator[DoubleDummyDeal]:
+    global deal_count, error_count
     for dir_path, dir_names, file_names in os.walk("./results/acbl"):
         for file_name in file_names:
             if file_name.startswith("session"):
@@ -21,22 +23,25 @@ with open("./results/double_dummy/all_deals.pickle", "wb") as dd_pickle_file:
                     session_json = json.load(session_file)
                     if HAND_RECORD_KEY in session_json:
                         logging.info("processing file %s", session_file.name)
-                        hand_records = session_json[HAND_RECORD_KEY]
-                        for hand_record in hand_records:
-                            if len(processed_deals) % 100 == 0:
-                                logging.info("processed %s deals", len(processed_deals))
+                        for hand_record in session_json[HAND_RECORD_KEY]:
                             try:
                                 ddd = DoubleDummyDeal.from_acbl_dict(hand_record)
-                                binary_deal = ddd.deal.serialize()
-                                if binary_deal in processed_deals:
-                                    duplicate_count += 1
-                                else:
-                                    processed_deals.add(binary_deal)
-                                    pickle.dump(ddd, dd_pickle_file)
                             except Exception as e:
                                 error_count += 1
                                 logging.error(e)
+                                continue
+                            deal_count += 1
+                            yield ddd
+
+
+# Deduplicate by deal fingerprint through bucket files on disk, keeping the first double dummy result for each deal
+# The sharded container lets the training data preparation split work across processes. See ShardedRecordReader
+with ShardedRecordWriter(Path("./results/double_dummy/all_deals")) as dd_writer:
+    dd_writer.write_all(
+        external_dedup(session_deals(), lambda ddd: ddd.deal.fingerprint(), work_dir=Path("./results/double_dummy"))
+    )
+unique_count = dd_writer.count
 
 logging.info("Error count: %s", error_count)
-logging.info("Duplicated deals: %s", duplicate_count)
-logging.info("Unique Deals: %s", len(processed_deals))
+logging.info("Duplicated deals: %s", deal_count - unique_count)
+logging.info("Unique Deals: %s", unique_count)
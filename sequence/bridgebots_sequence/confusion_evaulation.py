@@ -1,4 +1,3 @@
-import pickle
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
@@ -6,14 +5,17 @@ from typing import List
 
 import tensorflow as tf
 
-from bridgebots import DealRecord
+from bridgebots import DealRecord, read_records
 from bridgebots_sequence.feature_utils import TARGET_BIDDING_VOCAB
 from bridgebots_sequence.inference import BiddingInferenceEngine
 
 
-def load_deals(source_pickle: Path, allow_duplicate_deals=True):
-    with open(source_pickle, "rb") as pickle_file:
-        deal_records: List[DealRecord] = pickle.load(pickle_file)
+def load_deals(source_path: Path, allow_duplicate_deals=True, worker_index: int = 0, worker_count: int = 1):
+    """
+    Load a split written by create_data_splits. With worker_count > 1, only the shards assigned to worker_index are
+    loaded, so evaluation can be spread across processes or machines
+    """
+    deal_records: List[DealRecord] = list(read_records(source_path, worker_index, worker_count))
     if not allow_duplicate_deals:
         deal_records = [DealRecord(deal_record.deal, deal_record.board_records[0:1]) for deal_record in deal_records]
     return deal_records
@@ -122,8 +124,6 @@ def confusion_evaluation(deal_records: List[DealRecord], engine: BiddingInferenc
 
 if __name__ == "__main__":
     tf.config.run_functions_eagerly(True)
-    deal_records = load_deals(
-        Path("/Users/frice/bridge/bid_learn/deals/validation.pickle"), allow_duplicate_deals=False
-    )
+    deal_records = load_deals(Path("/Users/frice/bridge/bid_learn/deals/validation"), allow_duplicate_deals=False)
     engine = BiddingInferenceEngine(model_path=Path("/Users/frice/Downloads/run_6"))
     confusion_evaluation(deal_records, engine)
@@ -1,59 +1,98 @@
 import logging
-import pickle
 import random
+from contextlib import ExitStack
+from hashlib import blake2b
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple, TypeVar
 
-from bridgebots import DealRecord
+from bridgebots import Deal, DealStore, ShardedRecordWriter
+
+T = TypeVar("T")
+
+
+def assign_split(deal: Deal, splits: Tuple[Tuple[str, float], ...], salt: str = "") -> str:
+    """
+    Deterministically choose a split for a deal by hashing its canonical fingerprint. The assignment does not depend on
+    the order or size of the corpus, and rotations of the same deal always share a split
+    :param deal: The deal to assign
+    :param splits: A tuple of name,weight pairs
+    :param salt: Changing the salt produces a different (but still reproducible) assignment
+    :return: The name of the chosen split
+    """
+    digest = blake2b(salt.encode() + deal.fingerprint(canonical=True), digest_size=8).digest()
+    point = int.from_bytes(digest, "big") / (1 << 64) * sum(weight for _, weight in splits)
+    for split_name, weight in splits:
+        if point < weight:
+            return split_name
+        point -= weight
+    return splits[-1][0]
+
+
+def shuffle_buffer(items: Iterable[T], buffer_size: int, rng: random.Random) -> Iterator[T]:
+    """
+    Approximately shuffle a stream while holding at most buffer_size items in memory. Once the buffer is full each new
+    item replaces a randomly chosen buffered item, which is yielded
+    """
+    buffer: List[T] = []
+    for item in items:
+        if len(buffer) < buffer_size:
+            buffer.append(item)
+            continue
+        index = rng.randrange(buffer_size)
+        yield buffer[index]
+        buffer[index] = item
+    rng.shuffle(buffer)
+    yield from buffer
 
 
 def create_data_splits(
-    source_pickle: Path,
+    source_store: Path,
     save_dir: Path,
-    splits: Tuple[Tuple[str, float]] = (("train", 0.8), ("validation", 0.1), ("test", 0.1)),
+    splits: Tuple[Tuple[str, float], ...] = (("train", 0.8), ("validation", 0.1), ("test", 0.1)),
     shuffle: bool = True,
-    max_records: int = None,
+    max_records: Optional[int] = None,
+    salt: str = "",
+    shuffle_buffer_size: int = 10_000,
+    seed: int = 0,
+    shard_count: int = 8,
 ):
     """
-    Splits DealRecord data for model training and evaluation
-    :param source_pickle: DealRecord pickle file
-    :param save_dir: Write splits to this directory
+    Splits DealRecord data for model training and evaluation. Deals are streamed from the source in batches and each
+    split is written incrementally, so memory use is bounded by the shuffle buffer rather than the size of the corpus.
+    Reruns with the same arguments produce the same splits
+    :param source_store: DealStore directory, e.g. written by parse_vugraph_project
+    :param save_dir: Write a sharded record container per split to this directory
     :param splits: A tuple of name,weight pairs for splitting (e.g. train/validation/test)
-    :param shuffle: Shuffle all data before writing
+    :param shuffle: Shuffle the output order of each split with a bounded shuffle buffer
+    :param max_records: Stop after this many DealRecords
+    :param salt: Salt for the split assignment hash. See assign_split
+    :param shuffle_buffer_size: Number of DealRecords buffered for shuffling
+    :param seed: Seed for the shuffle order
+    :param shard_count: Shards per split. Jobs reading a split can run in parallel with up to this many workers
     """
-    with open(source_pickle, "rb") as pickle_file:
-        deal_records: List[DealRecord] = pickle.load(pickle_file)
-
-    logging.info(f"Loaded {len(deal_records)} DealRecord")
-
-    if shuffle:
-        random.shuffle(deal_records)
-
-    weights = []
-    split_records = []
-    for split, weight in splits:
-        split_records.append((split, []))
-        weights.append(weight)
-
-    for i, deal_record in enumerate(deal_records):
-        split_name, split_record_list = random.choices(split_records, weights)[0]
-        split_record_list.append(deal_record)
-        if max_records and i > max_records:
-            break
+    save_dir.mkdir(parents=True, exist_ok=True)
+    # If splitting fails, the writers are closed without manifests so that no partial split can be read
+    with ExitStack() as exit_stack:
+        writers = {
+            split_name: exit_stack.enter_context(ShardedRecordWriter(save_dir / split_name, shard_count))
+            for split_name, _ in splits
+        }
+        deal_store = exit_stack.enter_context(DealStore(source_store))
+        logging.info(f"Splitting {len(deal_store)} DealRecords from {source_store}")
+        deal_records = deal_store.iter_range(0, max_records)
+        if shuffle:
+            deal_records = shuffle_buffer(deal_records, shuffle_buffer_size, random.Random(seed))
+        for deal_record in deal_records:
+            writers[assign_split(deal_record.deal, splits, salt)].write(deal_record)
 
-    for split_name, split_record_list in split_records:
-        # Chunk writes to make pickle happy with large batches of records
-        split_path = save_dir / (split_name + ".pickle")
-        save_dir.mkdir(parents=True, exist_ok=True)
-        with open(split_path, "wb") as split_file:
-            pickle.dump(split_record_list, split_file)
-            logging.info(f"Wrote {len(split_record_list)} records to {split_file.name}")
+    for writer in writers.values():
+        logging.info(f"Wrote {writer.count} records to {writer.container_path}")
 
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
     create_data_splits(
-        Path("/Users/frice/bridge/vugraph_project/all_deals.pickle"),
+        Path("/Users/frice/bridge/vugraph_project/all_deals_store"),
         Path("/Users/frice/bridge/bid_learn/deals/toy/"),
         max_records=100,
     )
@@ -1,14 +1,18 @@
 import logging
-import pickle
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 import tensorflow as tf
 from tensorflow.python.lib.io.tf_record import TFRecordCompressionType
 
-from bridgebots import DealRecord
-from bridgebots_sequence.bidding_context_features import BiddingContextExampleData, ContextFeature, TargetHcp, \
-    TargetShape, Vulnerability
+from bridgebots import DealRecord, read_records
+from bridgebots_sequence.bidding_context_features import (
+    BiddingContextExampleData,
+    ContextFeature,
+    TargetHcp,
+    TargetShape,
+    Vulnerability,
+)
 from bridgebots_sequence.bidding_sequence_features import (
     BidAlertedSequenceFeature,
     BidExplainedSequenceFeature,
@@ -25,7 +29,7 @@ from bridgebots_sequence.feature_utils import holding_from_deal
 class OneHandSequenceExampleGenerator:
     def __init__(
         self,
-        deal_records: List[DealRecord],
+        deal_records: Iterable[DealRecord],
         context_features: List[ContextFeature],
         sequence_features: List[SequenceFeature],
     ):
@@ -60,19 +64,23 @@ class OneHandSequenceExampleGenerator:
 
 
 def create_examples(
-    source_pickle: Path,
+    source_path: Path,
     save_path: Path,
     context_features: List[ContextFeature],
     sequence_features: List[SequenceFeature],
     compression_type: TFRecordCompressionType = TFRecordCompressionType.NONE,
     max_records: int = None,
-    allow_duplicate_deals = True
+    allow_duplicate_deals=True,
+    worker_index: int = 0,
+    worker_count: int = 1,
 ):
-
-    with open(source_pickle, "rb") as pickle_file:
-        deal_records: List[DealRecord] = pickle.load(pickle_file)
+    """
+    Convert a split written by create_data_splits to a TFRecord file of SequenceExamples. With worker_count > 1, only
+    the shards assigned to worker_index are converted, so workers can each write their own save_path in parallel
+    """
+    deal_records: Iterable[DealRecord] = read_records(source_path, worker_index, worker_count)
     if not allow_duplicate_deals:
-        deal_records = [DealRecord(deal_record.deal, deal_record.board_records[0:1]) for deal_record in deal_records]
+        deal_records = (DealRecord(deal_record.deal, deal_record.board_records[0:1]) for deal_record in deal_records)
     example_gen = iter(OneHandSequenceExampleGenerator(deal_records, context_features, sequence_features))
     with tf.io.TFRecordWriter(str(save_path), compression_type) as file_writer:
         for i, example in enumerate(example_gen):
@@ -96,7 +104,7 @@ if __name__ == "__main__":
     context_features = [TargetHcp(), Vulnerability(), TargetShape()]
     # TODO train/test/validation loop
     create_examples(
-        Path("/Users/frice/bridge/bid_learn/deals/train.pickle"),
+        Path("/Users/frice/bridge/bid_learn/deals/train"),
         Path("/Users/frice/bridge/bid_learn/deals/no_duplicates_train.tfrecord"),
         context_features,
         sequence_features,
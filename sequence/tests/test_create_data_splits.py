@@ -0,0 +1,76 @@
+import random
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+from bridgebots import BitboardDeal, DealRecord, DealStoreWriter, Direction, read_records
+from bridgebots.record_shards import MANIFEST_FILE
+from bridgebots_sequence.create_data_splits import assign_split, create_data_splits, shuffle_buffer
+
+SPLITS = (("train", 0.8), ("validation", 0.1), ("test", 0.1))
+
+
+def random_deals(count: int, seed: int):
+    rng = random.Random(seed)
+    deals = []
+    for _ in range(count):
+        card_indices = list(range(52))
+        rng.shuffle(card_indices)
+        hands = tuple(sum(1 << card_index for card_index in card_indices[seat::4]) for seat in range(4))
+        deals.append(BitboardDeal(rng.choice(list(Direction)), rng.random() < 0.5, rng.random() < 0.5, hands).to_deal())
+    return deals
+
+
+class TestCreateDataSplits(unittest.TestCase):
+    deals = random_deals(2000, seed=7)
+
+    def test_assign_split_is_deterministic(self):
+        for deal in self.deals[:100]:
+            split = assign_split(deal, SPLITS, "salt")
+            self.assertEqual(split, assign_split(deal, SPLITS, "salt"))
+            # Rotations of a deal share a fingerprint, so they share a split
+            rotated = BitboardDeal.from_deal(deal).rotate(1).to_deal()
+            self.assertEqual(split, assign_split(rotated, SPLITS, "salt"))
+        salted = [assign_split(deal, SPLITS, "other") for deal in self.deals[:100]]
+        self.assertNotEqual([assign_split(deal, SPLITS, "salt") for deal in self.deals[:100]], salted)
+
+    def test_split_proportions(self):
+        counts = Counter(assign_split(deal, SPLITS) for deal in self.deals)
+        for split_name, weight in SPLITS:
+            self.assertAlmostEqual(weight, counts[split_name] / len(self.deals), delta=0.03)
+
+    def test_shuffle_buffer(self):
+        shuffled = list(shuffle_buffer(range(1000), 50, random.Random(3)))
+        self.assertEqual(list(range(1000)), sorted(shuffled))
+        self.assertNotEqual(list(range(1000)), shuffled)
+        self.assertEqual(shuffled, list(shuffle_buffer(range(1000), 50, random.Random(3))))
+        self.assertEqual([0, 1, 2], sorted(shuffle_buffer(range(3), 10, random.Random(3))))
+
+    def _split_deals(self, deals, work_dir: Path, name: str):
+        store_path = work_dir / f"{name}_store"
+        with DealStoreWriter(store_path) as writer:
+            writer.write_all(DealRecord(deal, []) for deal in deals)
+        create_data_splits(store_path, work_dir / name, SPLITS, shuffle_buffer_size=100, shard_count=2)
+        return {
+            deal_record.deal.fingerprint(): split_name
+            for split_name, _ in SPLITS
+            for deal_record in read_records(work_dir / name / split_name)
+        }
+
+    def test_splits_stable_across_reruns_and_growth(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work_dir = Path(temp_dir)
+            original = self._split_deals(self.deals[:500], work_dir, "original")
+            self.assertEqual(500, len(original))
+            self.assertEqual(original, self._split_deals(self.deals[:500], work_dir, "rerun"))
+            grown = self._split_deals(self.deals[500:1000] + self.deals[:500], work_dir, "grown")
+            self.assertEqual(original, {fingerprint: grown[fingerprint] for fingerprint in original})
+
+    def test_failed_split_has_no_manifest(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_dir = Path(temp_dir) / "splits"
+            with self.assertRaises(OSError):
+                create_data_splits(Path(temp_dir) / "missing_store", save_dir, SPLITS)
+            for split_name, _ in SPLITS:
+                self.assertFalse((save_dir / split_name / MANIFEST_FILE).exists())
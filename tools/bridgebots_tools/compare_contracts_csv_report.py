@@ -2,13 +2,13 @@ import dataclasses
 import logging
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import click
 
 from bridgebots import BoardRecord, Deal, Direction
 from bridgebots_tools.csv_utilities import _write_results
-from bridgebots_tools.data_extractors import _extract_board_data, _generate_input_file_paths, _parse_results_file
+from bridgebots_tools.data_extractors import _extract_board_data, _generate_input_file_paths, _parse_results_files
 from bridgebots_tools.tools_logging import configure_logging
 
 
@@ -69,6 +69,12 @@ def _build_comparisons(
     default="same_direction",
 )
 @click.option("--lax_doubles/--strict_doubles", default=True)
+@click.option("--workers", type=int, default=1, help="Number of processes used to parse input files")
+@click.option(
+    "--cache_dir",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    help="Directory for cached parse results. Unchanged input files are not re-parsed",
+)
 @click.option("--verbose", "log_level", "-v", flag_value="verbose")
 @click.option("--info", "log_level", flag_value="info", default=True)
 @click.option("--quiet", "log_level", "-q", flag_value="quiet")
@@ -82,6 +88,8 @@ def report(
     deal_comparison_type: str,
     direction_comparison_type: str,
     lax_doubles: bool,
+    workers: int,
+    cache_dir: Optional[Path],
     log_level: str,
     contract_sets: List[str],
     input_path: Path,
@@ -91,11 +99,10 @@ def report(
     results_file_paths = _generate_input_file_paths(input_format, input_path)
     left_contracts, right_contracts = [contract_set_str.split(",") for contract_set_str in contract_sets]
     left_boards, right_boards = defaultdict(lambda: defaultdict(list)), defaultdict(lambda: defaultdict(list))
-    for results_file_path in results_file_paths:
-        deal_records = _parse_results_file(results_file_path, input_format)
+    for results_file_path, deal_records in _parse_results_files(results_file_paths, input_format, workers, cache_dir):
         for deal_record in deal_records:
             for board_record in deal_record.board_records:
-                deal_hash = hash(deal_record.deal)
+                deal_hash = deal_record.deal.fingerprint()
                 direction_key = _get_direction_key(direction_comparison_type, board_record)
                 record = TraceableRecord(deal_record.deal, board_record, results_file_path)
                 contract_str = str(board_record.contract).strip("X") if lax_doubles else str(board_record.contract)
@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import click
 
@@ -9,7 +9,7 @@ from bridgebots_tools.csv_utilities import _get_headers, _write_results
 from bridgebots_tools.data_extractors import (
     _extract_board_data,
     _generate_input_file_paths,
-    _parse_results_file,
+    _parse_results_files,
 )
 from bridgebots_tools.tools_logging import configure_logging
 
@@ -31,6 +31,12 @@ def _extract_team_dicts(deal_record: DealRecord, results_path: Path) -> Tuple[Di
 @click.command()
 @click.option("--input_format", type=click.Choice(["lin", "pbn"], case_sensitive=False), default="lin")
 @click.option("--output_format", type=click.Choice(["team", "individual"], case_sensitive=False), default="team")
+@click.option("--workers", type=int, default=1, help="Number of processes used to parse input files")
+@click.option(
+    "--cache_dir",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    help="Directory for cached parse results. Unchanged input files are not re-parsed",
+)
 @click.option("--verbose", "log_level", "-v", flag_value="verbose")
 @click.option("--info", "log_level", flag_value="info", default=True)
 @click.option("--quiet", "log_level", "-q", flag_value="quiet")
@@ -38,12 +44,19 @@ def _extract_team_dicts(deal_record: DealRecord, results_path: Path) -> Tuple[Di
 @click.argument(
     "output_path", type=click.Path(exists=False, file_okay=True, dir_okay=False, path_type=Path), required=False
 )
-def report(input_format: str, output_format: str, log_level: str, input_path: Path, output_path: Path):
+def report(
+    input_format: str,
+    output_format: str,
+    workers: int,
+    cache_dir: Optional[Path],
+    log_level: str,
+    input_path: Path,
+    output_path: Path,
+):
     configure_logging(log_level)
     results_file_paths = _generate_input_file_paths(input_format, input_path)
     csv_dicts = []
-    for results_file_path in results_file_paths:
-        deal_records = _parse_results_file(results_file_path, input_format)
+    for results_file_path, deal_records in _parse_results_files(results_file_paths, input_format, workers, cache_dir):
         for deal_record in deal_records:
             try:
                 if output_format == "team":
@@ -1,53 +1,58 @@
 import logging
 from pathlib import Path
-from typing import Dict, Generator, List, Optional, Tuple
+from typing import Dict, Generator, Iterable, Iterator, List, Optional, Tuple
 
 from bridgebots import (
     BiddingSuit,
+    BitboardDeal,
+    BitboardHand,
     BoardRecord,
-    Card,
     Deal,
     DealRecord,
     Direction,
     build_lin_url,
+    parse_corpus,
     parse_multi_lin,
     parse_pbn,
 )
-from bridgebots.deal_utils import calculate_shape, count_hcp
+from bridgebots.bitboard import SUIT_BITS, SUIT_MASK
+from bridgebots_tools.parse_cache import ParseCache
 
 
-def _calculate_trump_data(deal: Deal, board_record: BoardRecord) -> Tuple[Optional[int], Optional[int]]:
+def _calculate_trump_data(
+    bitboard_deal: BitboardDeal, board_record: BoardRecord
+) -> Tuple[Optional[int], Optional[int]]:
     if board_record.contract.suit == BiddingSuit.NO_TRUMP:
         return None, None
     trump_suit = board_record.contract.suit.to_suit()
-    offense_trumps = []
-    offense_trumps.extend(deal.player_cards[board_record.declarer])
-    offense_trumps.extend(deal.player_cards[board_record.declarer.partner()])
-    offense_trumps = [c for c in offense_trumps if c.suit == trump_suit]
-    return len(offense_trumps), count_hcp(offense_trumps)
+    declarer = board_record.declarer
+    offense = bitboard_deal.hands[declarer.value] | bitboard_deal.hands[declarer.partner().value]
+    offense_trumps = BitboardHand(offense & (SUIT_MASK << (trump_suit.value * SUIT_BITS)))
+    return len(offense_trumps), offense_trumps.count_hcp()
 
 
 def _extract_board_data(deal: Deal, board_record: BoardRecord, results_path: Path) -> Dict:
     """
     :return: A dictionary of csv keys to data values for use in a csv.DictWriter
     """
+    bitboard_deal = deal.to_bitboard()
     board_dict = {}
     board_dict["board_id"] = board_record.board_name
     board_dict["file"] = results_path.name
-    board_dict["deal_hash"] = hash(deal)
+    board_dict["deal_hash"] = deal.fingerprint().hex()
     board_dict.update({direction.name.lower(): board_record.names[direction] for direction in Direction})
     board_dict["dealer"] = deal.dealer.name.lower()
     board_dict["vulnerable"] = _calculate_vulnerable(deal)
     board_dict["bidding"] = _create_bidding_entry(board_record)
 
-    opener_seat, opening_bid, opener_hcp, opener_shape_str = _calculate_opener_data(deal, board_record)
+    opener_seat, opening_bid, opener_hcp, opener_shape_str = _calculate_opener_data(bitboard_deal, board_record)
     board_dict["opener"] = opener_seat
     board_dict["opening"] = opening_bid
     board_dict["opener_hcp"] = opener_hcp
     board_dict["opener_shape"] = opener_shape_str
 
     overcall_type, overcall, overcaller_hcp, overcaller_shape_str, contested, competitive = _calculate_overcaller_data(
-        deal, board_record
+        bitboard_deal, board_record
     )
     board_dict["overcall_type"] = overcall_type
     board_dict["overcall"] = overcall
@@ -65,30 +70,35 @@ def _extract_board_data(deal: Deal, board_record: BoardRecord, results_path: Pat
     board_dict["score_declarer"], board_dict["score_defender"] = board_record.score, board_record.score * -1
     board_dict["link"] = build_lin_url(deal, board_record)
 
-    board_dict["declarer_shape"] = _calculate_shape_str(deal.player_cards[board_record.declarer])
-    board_dict["dummy_shape"] = _calculate_shape_str(deal.player_cards[board_record.declarer.partner()])
-    board_dict["lho_shape"] = _calculate_shape_str(deal.player_cards[board_record.declarer.offset(1)])
-    board_dict["rho_shape"] = _calculate_shape_str(deal.player_cards[board_record.declarer.offset(3)])
+    declarer_hand = bitboard_deal.hand(board_record.declarer)
+    dummy_hand = bitboard_deal.hand(board_record.declarer.partner())
+    lho_hand = bitboard_deal.hand(board_record.declarer.offset(1))
+    rho_hand = bitboard_deal.hand(board_record.declarer.offset(3))
 
-    board_dict["declarer_hcp"] = count_hcp(deal.player_cards[board_record.declarer])
-    board_dict["dummy_hcp"] = count_hcp(deal.player_cards[board_record.declarer.partner()])
-    board_dict["lho_hcp"] = count_hcp(deal.player_cards[board_record.declarer.offset(1)])
-    board_dict["rho_hcp"] = count_hcp(deal.player_cards[board_record.declarer.offset(3)])
+    board_dict["declarer_shape"] = _calculate_shape_str(declarer_hand)
+    board_dict["dummy_shape"] = _calculate_shape_str(dummy_hand)
+    board_dict["lho_shape"] = _calculate_shape_str(lho_hand)
+    board_dict["rho_shape"] = _calculate_shape_str(rho_hand)
 
-    trump_fit, trump_hcp = _calculate_trump_data(deal, board_record)
+    board_dict["declarer_hcp"] = declarer_hand.count_hcp()
+    board_dict["dummy_hcp"] = dummy_hand.count_hcp()
+    board_dict["lho_hcp"] = lho_hand.count_hcp()
+    board_dict["rho_hcp"] = rho_hand.count_hcp()
+
+    trump_fit, trump_hcp = _calculate_trump_data(bitboard_deal, board_record)
     board_dict["trump_fit"] = trump_fit
     board_dict["trump_hcp"] = trump_hcp
 
     return board_dict
 
 
-def _calculate_shape_str(cards: List[Card]) -> str:
+def _calculate_shape_str(hand: BitboardHand) -> str:
     """Calculate a shape tuple like (5,3,3,2) and convert it to a shape_str like 5332"""
-    return "".join(str(s) for s in calculate_shape(cards))
+    return "".join(str(s) for s in hand.calculate_shape())
 
 
 def _calculate_opener_data(
-    deal: Deal, board_record: BoardRecord
+    bitboard_deal: BitboardDeal, board_record: BoardRecord
 ) -> Tuple[Optional[int], Optional[str], Optional[int], Optional[str]]:
     """
     :return: the seat which opened, the opening bid, opener's high card points, and opener's shape
@@ -98,20 +108,20 @@ def _calculate_opener_data(
     opening_bid = None
     for i in range(4):
         if board_record.bidding_record[i] != "PASS":
-            opener = deal.dealer.offset(i)
+            opener = bitboard_deal.dealer.offset(i)
             seat = i + 1
             opening_bid = board_record.bidding_record[i]
             break
     if opener is None:
         return None, None, None, None
-    opener_cards = deal.player_cards[opener]
-    opener_hcp = count_hcp(opener_cards)
-    opener_shape_str = _calculate_shape_str(opener_cards)
+    opener_hand = bitboard_deal.hand(opener)
+    opener_hcp = opener_hand.count_hcp()
+    opener_shape_str = _calculate_shape_str(opener_hand)
     return seat, opening_bid, opener_hcp, opener_shape_str
 
 
 def _calculate_overcaller_data(
-    deal, board_record
+    bitboard_deal, board_record
 ) -> Tuple[Optional[str], Optional[str], Optional[int], Optional[str], Optional[bool], Optional[bool]]:
     """
     :return: the overcall type (direct, balance, or sandwich) the overcall bid, overcallers's high card points,
@@ -122,7 +132,7 @@ def _calculate_overcaller_data(
     open_index = None
     for i in range(4):
         if board_record.bidding_record[i] != "PASS":
-            opener = deal.dealer.offset(i)
+            opener = bitboard_deal.dealer.offset(i)
             open_index = i
             break
     if opener is None:
@@ -145,9 +155,9 @@ def _calculate_overcaller_data(
     overcaller_hcp = None
     overcaller_shape_str = None
     if overcaller:
-        overcaller_cards = deal.player_cards[overcaller]
-        overcaller_hcp = count_hcp(overcaller_cards)
-        overcaller_shape_str = _calculate_shape_str(overcaller_cards)
+        overcaller_hand = bitboard_deal.hand(overcaller)
+        overcaller_hcp = overcaller_hand.count_hcp()
+        overcaller_shape_str = _calculate_shape_str(overcaller_hand)
 
     contested = False
     for i, bid in enumerate(board_record.bidding_record[open_index:]):
@@ -225,11 +235,46 @@ def _generate_input_file_paths(input_format: str, input_path: Path) -> Generator
     yield from results_file_paths
 
 
-def _parse_results_file(results_file_path: Path, input_format: str) -> List[DealRecord]:
+def _parse_results_file(
+    results_file_path: Path, input_format: str, cache_dir: Optional[Path] = None
+) -> List[DealRecord]:
     logging.debug(f"Processing {results_file_path}")
-    if input_format == "lin":
-        deal_records = parse_multi_lin(results_file_path)
-    else:
-        deal_records = parse_pbn(results_file_path)
+    parse_cache = ParseCache(cache_dir) if cache_dir else None
+    deal_records = parse_cache.get(results_file_path, input_format) if parse_cache else None
+    if deal_records is None:
+        if input_format == "lin":
+            deal_records = parse_multi_lin(results_file_path)
+        else:
+            deal_records = parse_pbn(results_file_path)
+        if parse_cache:
+            parse_cache.put(results_file_path, input_format, deal_records)
     logging.debug(f"Found {len(deal_records)} deals in {results_file_path}")
     return deal_records
+
+
+def _parse_results_files(
+    results_file_paths: Iterable[Path], input_format: str, workers: int = 1, cache_dir: Optional[Path] = None
+) -> Iterator[Tuple[Path, List[DealRecord]]]:
+    """
+    Parse results files in parallel with parse_corpus. Files which fail to parse are logged and skipped. If cache_dir
+    is provided, unchanged files are read from the cache and only the remaining files are parsed
+    :return: An iterator of (path, deal records) pairs in the same order as results_file_paths
+    """
+    results_file_paths = list(results_file_paths)
+    parse_cache = ParseCache(cache_dir) if cache_dir else None
+    cached_paths = set()
+    if parse_cache:
+        cached_paths = {path for path in results_file_paths if parse_cache.contains(path, input_format)}
+        logging.info(f"Found {len(cached_paths)} of {len(results_file_paths)} files in the parse cache")
+    uncached_paths = [path for path in results_file_paths if path not in cached_paths]
+    file_results = parse_corpus(uncached_paths, input_format, workers)
+    for results_file_path in results_file_paths:
+        if results_file_path in cached_paths:
+            yield results_file_path, _parse_results_file(results_file_path, input_format, cache_dir)
+            continue
+        file_result = next(file_results)
+        if file_result.error is None:
+            logging.debug(f"Found {len(file_result.deal_records)} deals in {file_result.path}")
+            if parse_cache:
+                parse_cache.put(file_result.path, input_format, file_result.deal_records)
+            yield file_result.path, file_result.deal_records
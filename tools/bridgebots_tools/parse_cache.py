@@ -0,0 +1,87 @@
+import hashlib
+import logging
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import List, Optional
+
+from bridgebots import DealRecord, deserialize_deals, serialize_deals
+from bridgebots.deal_store import decode_board_records, encode_board_records
+
+"""
+An on-disk cache of parsed results files. Each cached file is stored as a header recording the size and modification
+time of the source file, the deals as fixed width serialize_deal records, and the pickled board records. A cache entry is
+only used when the source file's size and modification time still match.
+"""
+
+_MAGIC = b"BBPCACHE"
+_VERSION = 1
+# magic, version, source size, source mtime in nanoseconds, deal count
+_HEADER = struct.Struct("<8sIQqI")
+_SERIALIZED_DEAL_SIZE = 14
+
+
+class ParseCache:
+    def __init__(self, cache_dir: Path):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir = cache_dir
+
+    def _entry_path(self, results_file_path: Path, input_format: str) -> Path:
+        key = f"{input_format}:{results_file_path.resolve()}".encode("utf-8")
+        return self.cache_dir / f"{hashlib.blake2b(key, digest_size=16).hexdigest()}.bin"
+
+    def _read_header(self, results_file_path: Path, entry_file) -> Optional[int]:
+        """:return: The number of cached deals if the entry is for the current version of results_file_path"""
+        header = entry_file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        magic, version, size, mtime_ns, deal_count = _HEADER.unpack(header)
+        source_stat = results_file_path.stat()
+        if (magic, version, size, mtime_ns) != (_MAGIC, _VERSION, source_stat.st_size, source_stat.st_mtime_ns):
+            return None
+        return deal_count
+
+    def contains(self, results_file_path: Path, input_format: str) -> bool:
+        """:return: True if results_file_path is cached and unchanged. Only the entry header is read"""
+        try:
+            with open(self._entry_path(results_file_path, input_format), "rb") as entry_file:
+                return self._read_header(results_file_path, entry_file) is not None
+        except OSError:
+            return False
+
+    def get(self, results_file_path: Path, input_format: str) -> Optional[List[DealRecord]]:
+        """
+        :return: The cached DealRecords for results_file_path, or None if it is not cached or has changed since it was
+        cached
+        """
+        entry_path = self._entry_path(results_file_path, input_format)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                deal_count = self._read_header(results_file_path, entry_file)
+                if deal_count is None:
+                    return None
+                entry = entry_file.read()
+        except OSError:
+            return None
+        boards_start = deal_count * _SERIALIZED_DEAL_SIZE
+        try:
+            deals = deserialize_deals(memoryview(entry)[:boards_start])
+            board_records = decode_board_records(entry[boards_start:])
+        except (ValueError, EOFError, pickle.UnpicklingError) as e:
+            logging.warning(f"Ignoring corrupt cache entry {entry_path}: {e}")
+            return None
+        logging.debug(f"Using cached results for {results_file_path}")
+        return [DealRecord(deal, deal_board_records) for deal, deal_board_records in zip(deals, board_records)]
+
+    def put(self, results_file_path: Path, input_format: str, deal_records: List[DealRecord]):
+        source_stat = results_file_path.stat()
+        header = _HEADER.pack(_MAGIC, _VERSION, source_stat.st_size, source_stat.st_mtime_ns, len(deal_records))
+        serialized_deals = serialize_deals(deal_record.deal for deal_record in deal_records)
+        encoded_board_records = encode_board_records([deal_record.board_records for deal_record in deal_records])
+        # Write to a temporary file and rename so readers never see a partially written entry
+        entry_path = self._entry_path(results_file_path, input_format)
+        temp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "wb") as temp_file:
+            temp_file.write(header + serialized_deals + encoded_board_records)
+        os.replace(temp_path, entry_path)
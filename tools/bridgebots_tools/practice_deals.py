@@ -1,9 +1,11 @@
 import sys
 from pathlib import Path
+from typing import Optional
 
 import click
 
-from bridgebots import build_lin_str
+from bridgebots import DealRecord, DealRecordExporter, build_lin_str
+from bridgebots.lin import LinType
 from bridgebots_tools.csv_report import _extract_team_dicts
 from bridgebots_tools.csv_utilities import _get_headers, _write_results
 from bridgebots_tools.data_extractors import _parse_results_file
@@ -14,6 +16,11 @@ _LINKS_CSV_HEADERS = ("board_id", "file", "o_link", "c_link")
 
 @click.command()
 @click.option("--input_format", type=click.Choice(["lin", "pbn"], case_sensitive=False), default="lin")
+@click.option(
+    "--cache_dir",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    help="Directory for cached parse results. Unchanged input files are not re-parsed",
+)
 @click.option("--verbose", "log_level", "-v", flag_value="verbose")
 @click.option("--info", "log_level", flag_value="info", default=True)
 @click.option("--quiet", "log_level", "-q", flag_value="quiet")
@@ -28,6 +35,7 @@ _LINKS_CSV_HEADERS = ("board_id", "file", "o_link", "c_link")
 )
 def report(
     input_format: str,
+    cache_dir: Optional[Path],
     log_level: str,
     input_dir: Path,
     file_name: str,
@@ -38,24 +46,27 @@ def report(
     configure_logging(log_level)
     input_path = next(input_dir.rglob(file_name))
 
-    deal_records = _parse_results_file(input_path, input_format)
+    deal_records = _parse_results_file(input_path, input_format, cache_dir)
     csv_dicts = []
-    for deal_record in deal_records:
-        if "o" + board in [board_record.board_name for board_record in deal_record.board_records]:
-            # Write one instance of the board to the LIN file (or stdout)
-            board_record = deal_record.board_records[0]
-            lin_output = build_lin_str(deal_record.deal, board_record, lin_type="multi")
-            output_handle = open(output_lin, "a") if output_lin else sys.stdout
-            try:
-                output_handle.write(lin_output + "\n")
-            finally:
-                if output_lin:
-                    output_handle.close()
-            # Now collect CSV information from the open and closed rooms
-            open_dict, closed_dict = _extract_team_dicts(deal_record, input_path)
-            prefix_dict = {f"o_{key}": value for key, value in open_dict.items()}
-            prefix_dict.update({f"c_{key}": value for key, value in closed_dict.items()})
-            csv_dicts.append(prefix_dict)
+    # Practice sets are built up over several runs, so boards are appended to an existing LIN file
+    lin_exporter = DealRecordExporter(output_lin, append=True, include_names=False) if output_lin else None
+    try:
+        for deal_record in deal_records:
+            if "o" + board in [board_record.board_name for board_record in deal_record.board_records]:
+                # Write one instance of the board to the LIN file (or stdout)
+                board_record = deal_record.board_records[0]
+                if lin_exporter:
+                    lin_exporter.write(DealRecord(deal_record.deal, [board_record]))
+                else:
+                    sys.stdout.write(build_lin_str(deal_record.deal, board_record, lin_type=LinType.MULTI) + "\n")
+                # Now collect CSV information from the open and closed rooms
+                open_dict, closed_dict = _extract_team_dicts(deal_record, input_path)
+                prefix_dict = {f"o_{key}": value for key, value in open_dict.items()}
+                prefix_dict.update({f"c_{key}": value for key, value in closed_dict.items()})
+                csv_dicts.append(prefix_dict)
+    finally:
+        if lin_exporter:
+            lin_exporter.close()
 
     # Write CSV to file (or stdout)
     _write_results(output_csv, csv_dicts, _get_headers(output_format="team"))
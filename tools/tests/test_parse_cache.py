@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from bridgebots import parse_multi_lin
+from bridgebots_tools.parse_cache import ParseCache
+
+_LIN_PATH = Path(__file__).parents[2] / "bridgebots" / "tests" / "resources" / "usbf_sf_14502.lin"
+
+
+class TestParseCache(unittest.TestCase):
+    deal_records = parse_multi_lin(_LIN_PATH)
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        work_dir = Path(self.temp_dir.name)
+        self.results_path = work_dir / "results.lin"
+        shutil.copy(_LIN_PATH, self.results_path)
+        self.cache = ParseCache(work_dir / "cache")
+        self.cache.put(self.results_path, "lin", self.deal_records)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _entry_path(self) -> Path:
+        (entry_path,) = self.cache.cache_dir.glob("*.bin")
+        return entry_path
+
+    def test_hit(self):
+        self.assertTrue(self.cache.contains(self.results_path, "lin"))
+        self.assertEqual(self.deal_records, self.cache.get(self.results_path, "lin"))
+        self.assertFalse(self.cache.contains(self.results_path, "pbn"))
+        self.assertIsNone(self.cache.get(self.results_path, "pbn"))
+
+    def test_invalidated_by_size(self):
+        with open(self.results_path, "a") as results_file:
+            results_file.write("\n")
+        self.assertFalse(self.cache.contains(self.results_path, "lin"))
+        self.assertIsNone(self.cache.get(self.results_path, "lin"))
+
+    def test_invalidated_by_mtime(self):
+        mtime_ns = self.results_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(self.results_path, ns=(mtime_ns, mtime_ns))
+        self.assertFalse(self.cache.contains(self.results_path, "lin"))
+        self.assertIsNone(self.cache.get(self.results_path, "lin"))
+        self.cache.put(self.results_path, "lin", self.deal_records)
+        self.assertEqual(self.deal_records, self.cache.get(self.results_path, "lin"))
+
+    def test_truncated_entry(self):
+        entry_path = self._entry_path()
+        entry = entry_path.read_bytes()
+        for length in (10, len(entry) // 2, len(entry) - 1):
+            entry_path.write_bytes(entry[:length])
+            self.assertIsNone(self.cache.get(self.results_path, "lin"))
+
+    def test_corrupt_entry(self):
+        entry_path = self._entry_path()
+        entry = bytearray(entry_path.read_bytes())
+        entry[-200:] = bytes(200)
+        entry_path.write_bytes(bytes(entry))
+        self.assertIsNone(self.cache.get(self.results_path, "lin"))
+        # A corrupt entry is replaced by the next put
+        self.cache.put(self.results_path, "lin", self.deal_records)
+        self.assertEqual(self.deal_records, self.cache.get(self.results_path, "lin"))
@@ -1,8 +1,9 @@
 import logging
-import pickle
 import random
+from pathlib import Path
 from typing import Dict
 
+from bridgebots import read_records
 from bridgebots.deal import Card
 from bridgebots.deal_enums import BiddingSuit, Direction, Rank, Suit
 from train.streaming_csv_writer import StreamingCsvWriter
@@ -25,12 +26,7 @@ split_weights = [0.8, 0.1, 0.1]
 
 
 def generate_deals():
-    with open("../results/double_dummy/all_deals.pickle", "rb") as dd_pickle_file:
-        while True:
-            try:
-                yield pickle.load(dd_pickle_file)
-            except EOFError:
-                break
+    yield from read_records(Path("../results/double_dummy/all_deals"))
 
 
 deal_count = 0
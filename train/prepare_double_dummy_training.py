@@ -1,9 +1,11 @@
 import logging
-import pickle
 import random
+from pathlib import Path
 from typing import Dict
 
+from bridgebots import read_records
 from bridgebots.deal import Card
+from bridgebots.deal_array import DealArray
 from bridgebots.deal_enums import BiddingSuit, Direction, Rank, Suit
 from train.streaming_csv_writer import StreamingCsvWriter
 
@@ -30,46 +32,44 @@ for file_path in file_paths:
 
 
 def generate_deals():
-    with open("../results/double_dummy/all_deals.pickle", "rb") as dd_pickle_file:
-        while True:
-            try:
-                yield pickle.load(dd_pickle_file)
-            except EOFError:
-                break
+    yield from read_records(Path("../results/double_dummy/all_deals"))
+
+
+def generate_batches(batch_size=1000):
+    batch = []
+    for ddd in generate_deals():
+        batch.append(ddd)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 deal_count = 0
-for ddd in generate_deals():
-
-    training_writer = random.choices(training_writers, split_weights)[0]
-    deal_data = []
-    for direction in Direction:
-        direction_data = []
-        player_cards = sorted(ddd.deal.hands[direction].cards)
-        player_card_index = 0
-        for card in sorted_cards:
-            if player_card_index < len(player_cards) and card == player_cards[player_card_index]:
-                player_card_index += 1
-                direction_data.append(1)
-            else:
-                direction_data.append(0)
-        assert 13 == sum(direction_data)
-        deal_data.extend(direction_data)
-
-    # Write 4 rows, one for the double dummy score of each direction
-    for direction in Direction:
-        row_data = deal_data.copy()
-        row_data.append(direction.value)
-        scores: Dict[BiddingSuit, int] = ddd.dd_score.scores[direction]
-        for bidding_suit in BiddingSuit:
-            row_data.append(scores[bidding_suit])
-
-        assert 214 == len(row_data)
-        training_writer.write_row(row_data)
-
-    deal_count += 1
-    if deal_count % 1000 == 0:
-        logging.info("processed %s deals", deal_count)
+for ddd_batch in generate_batches():
+    deal_array = DealArray.from_deals(ddd.deal for ddd in ddd_batch)
+    for deal_index, ddd in enumerate(ddd_batch):
+        training_writer = random.choices(training_writers, split_weights)[0]
+        # One-hot holdings are in sorted card order, which is the Card.index order used by DealArray
+        deal_data = []
+        for direction in Direction:
+            deal_data.extend(deal_array.one_hot(deal_index, direction))
+
+        # Write 4 rows, one for the double dummy score of each direction
+        for direction in Direction:
+            row_data = deal_data.copy()
+            row_data.append(direction.value)
+            scores: Dict[BiddingSuit, int] = ddd.dd_score.scores[direction]
+            for bidding_suit in BiddingSuit:
+                row_data.append(scores[bidding_suit])
+
+            assert 214 == len(row_data)
+            training_writer.write_row(row_data)
+
+        deal_count += 1
+        if deal_count % 1000 == 0:
+            logging.info("processed %s deals", deal_count)
 
 for training_writer in training_writers:
     training_writer.close()